@@ -1,32 +1,46 @@
 import streamlit as st
 import sys
+import time
+import uuid
 import logging
 from pathlib import Path
 
 sys.path.append(str(Path(__file__).parent))
 
-from modules.pdf_extractor import PDFExtractor
-from modules.docx_extractor import DOCXExtractor
-from modules.nlp_pipeline import NLPPipeline
-from modules.summarizer import Summarizer
-from modules.keyword_extractor import KeywordExtractor
-from modules.sentiment_analyzer import SentimentAnalyzer
-from modules.risk_detector import RiskDetector
+from modules.document_analyzer import DocumentAnalyzer
+from modules.execution_engine import ExecutionEngine
 from modules.export_pdf import PDFExporter
 from modules.export_word import WordExporter
+from modules.model_registry import model_registry
+from modules.job_queue import JobQueue, QueueFull
 from utils.file_utils import FileUtils
+from utils.result_cache import ResultCache
+from utils.highlight_utils import HighlightUtils
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-class CorporateDocumentAnalyzer:
+POLL_INTERVAL_SECONDS = 0.5
+PREVIEW_PAGE_CHARS = 5000
+MAX_LISTED_CHANGES = 50
+MODE_SECTIONS = {
+    "Summary": 'summary',
+    "Key Points": 'key_points',
+    "Risk Analysis": 'risks',
+    "Sentiment": 'sentiment'
+}
+
+class CorporateDocumentAnalyzer(DocumentAnalyzer):
     def __init__(self):
+        job_queue = JobQueue()
+        # Concurrent jobs split the CDA_PARALLELISM budget: two models per job share the inference threads, and
+        # page extraction runs before the analysis pools are busy
+        engine = ExecutionEngine(concurrent_models=2 * job_queue.workers)
+        super().__init__(pdf_workers=max(1, engine.budget // job_queue.workers), engine=engine)
         self.file_utils = FileUtils()
-        self.nlp_pipeline = NLPPipeline()
-        self.summarizer = Summarizer()
-        self.keyword_extractor = KeywordExtractor()
-        self.sentiment_analyzer = SentimentAnalyzer()
-        self.risk_detector = RiskDetector()
+        self.highlighter = HighlightUtils()
+        self.job_queue = job_queue
+        self.warm_up_job_id = None
         
     def setup_ui(self):
         st.set_page_config(page_title="Corporate Document Analyzer", page_icon="📊", layout="wide")
@@ -39,41 +53,121 @@ class CorporateDocumentAnalyzer:
         analysis_mode = st.sidebar.selectbox("Analysis Mode", ["Summary", "Key Points", "Risk Analysis", "Opportunities", "Sentiment", "Full Report"])
         export_format = st.sidebar.selectbox("Export Format", ["PDF", "Word"])
         export_btn = st.sidebar.button("Export Results")
+        st.sidebar.checkbox("Incremental re-analysis", key='incremental', help="Treat re-uploads of the same file name in this session as revisions: only changed paragraphs are re-analyzed and a change report is shown")
+        self.model_status()
         return uploaded_file, analysis_mode, export_format, export_btn
     
-    def extract_text(self, file_path, file_type):
+    def model_status(self):
+        with st.sidebar.expander("Model Status"):
+            for name, info in model_registry.stats().items():
+                state = "loaded" if info['available'] else ("unavailable" if info['loaded'] else "not loaded")
+                st.write(f"- {name}: {state}, {info['memory_bytes'] / 1e6:.0f} MB, {info['load_seconds']:.1f}s")
+            st.write(f"Total: {model_registry.total_memory_bytes() / 1e6:.0f} MB")
+            for model, counts in self.chunk_memo.stats().items():
+                st.write(f"- Chunk memo {model}: {counts['hit_rate']:.0%} hits ({counts['hits']}/{counts['hits'] + counts['misses']})")
+            st.write(f"Chunk memo on disk: {self.chunk_memo.disk_usage() / 1e6:.1f} MB")
+    
+    def warm_up_models(self):
+        if model_registry.is_warm() or self.warm_up_job_id is not None:
+            return
+        try:
+            self.warm_up_job_id = self.job_queue.submit(lambda job: model_registry.warm_up(), description="model warm-up")
+        except QueueFull as e:
+            logger.warning(f"Model warm-up deferred: {str(e)}")
+    
+    def get_document_text(self, uploaded_file, doc_hash, progress=None, document_id=None, owner=""):
+        # Extracted text is never written to the shared result cache; the session keeps its own copy (see session_text)
+        file_type = uploaded_file.type.split('/')[-1]
+        file_path = self.file_utils.save_uploaded_file(uploaded_file)
         try:
-            if file_type == "pdf":
-                extractor = PDFExtractor()
-                text = extractor.extract_text(file_path)
-            elif file_type == "docx":
-                extractor = DOCXExtractor()
-                text = extractor.extract_text(file_path)
+            return self.extract_text(file_path, file_type, progress, doc_hash, document_id, owner)
+        finally:
+            self.file_utils.cleanup_file(file_path)
+    
+    def analysis_job(self, job, uploaded_file, mode, doc_hash, incremental=False, owner="", previous_text=None, text=None):
+        document_id = uploaded_file.name if incremental else None
+        if text is None:
+            text = self.get_document_text(uploaded_file, doc_hash, progress=job.report, document_id=document_id, owner=owner)
+        if not text:
+            raise ValueError("Failed to extract text from the document.")
+        job.publish('document', {'document_text': text})
+        if not incremental:
+            return self.analyze_document(text, mode, doc_hash, progress=job.report, on_section=job.publish)
+        # Re-uploads under the same file name in this session are revisions: only changed paragraphs are re-analyzed
+        return self.analyze_document(text, mode, doc_hash, progress=job.report, on_section=job.publish, document_id=document_id, owner=owner, previous_text=previous_text)
+    
+    def session_owner(self):
+        # Version history is scoped to the browser session, so uploads with the same name never see each other
+        if 'owner_id' not in st.session_state:
+            st.session_state['owner_id'] = uuid.uuid4().hex
+        return st.session_state['owner_id']
+    
+    def previous_text(self, file_name, doc_hash):
+        # The previous revision's text stays in this session only; the shared cache holds fingerprints
+        for revision_hash, text in reversed(st.session_state.get('revisions', {}).get(file_name, [])):
+            if revision_hash != doc_hash:
+                return text
+        return None
+    
+    def session_text(self, file_name, doc_hash):
+        # Re-running another mode on the same upload reuses this session's extraction instead of a shared text cache
+        for revision_hash, text in st.session_state.get('revisions', {}).get(file_name, []):
+            if revision_hash == doc_hash:
+                return text
+        return None
+    
+    def remember_revision(self, file_name, doc_hash, text):
+        revisions = st.session_state.setdefault('revisions', {}).setdefault(file_name, [])
+        if revisions and revisions[-1][0] == doc_hash:
+            return
+        revisions.append((doc_hash, text))
+        del revisions[:-2]
+    
+    def current_job(self, uploaded_file, mode, doc_hash):
+        incremental = st.session_state.get('incremental', False)
+        job_key = f"{doc_hash}:{mode}:{incremental}"
+        state = st.session_state.get('analysis_job')
+        if state and state['key'] != job_key:
+            self.job_queue.cancel(state['job_id'])
+            state = None
+        job = self.job_queue.get(state['job_id']) if state else None
+        if job is None:
+            job_id = self.job_queue.submit(self.analysis_job, uploaded_file, mode, doc_hash, incremental, self.session_owner(), self.previous_text(uploaded_file.name, doc_hash), self.session_text(uploaded_file.name, doc_hash), description=f"{uploaded_file.name} ({mode})")
+            st.session_state['analysis_job'] = {'key': job_key, 'job_id': job_id}
+            job = self.job_queue.get(job_id)
+        return job
+    
+    def job_progress(self, job):
+        snapshot = job.snapshot()
+        if snapshot['status'] == "queued":
+            st.info(f"Analysis queued ({self.job_queue.pending_count()} job(s) waiting)...")
+            return
+        for stage, (done, total) in snapshot['progress'].items():
+            if total:
+                st.progress(min(done / total, 1.0), text=f"{stage.capitalize()}: {done}/{total}")
             else:
-                return None
-            return text if text and text.strip() else None
-        except Exception as e:
-            logger.error(f"Text extraction failed: {str(e)}")
-            return None
-    
-    def analyze_document(self, text, mode):
-        results = {}
-        if mode in ["Summary", "Full Report"]:
-            results['summary'] = self.summarizer.summarize(text)
-        if mode in ["Key Points", "Full Report"]:
-            results['keywords'] = self.keyword_extractor.extract_keywords(text)
-            results['action_items'] = self.keyword_extractor.extract_action_items(text)
-            results['decisions'] = self.keyword_extractor.extract_decisions(text)
-        if mode in ["Risk Analysis", "Full Report"]:
-            results['risks'] = self.risk_detector.detect_risks(text)
-            results['opportunities'] = self.risk_detector.detect_opportunities(text)
-        if mode in ["Sentiment", "Full Report"]:
-            results['sentiment'] = self.sentiment_analyzer.analyze_sentiment(text)
-        if mode == "Full Report":
-            results['statistics'] = self.nlp_pipeline.get_statistics(text)
-        return results
-    
-    def display_results(self, results, mode, original_text):
+                st.caption(f"{stage.capitalize()}: {done}")
+        ready = [f"{section} ({snapshot['section_times'][section]:.1f}s)" for section in snapshot['sections'] if section != 'document']
+        st.caption(f"Running for {snapshot['elapsed']:.0f}s, sections ready: {', '.join(ready) or 'none'}")
+        if st.sidebar.button("Cancel Analysis"):
+            self.job_queue.cancel(job.job_id)
+    
+    def job_outcome(self, job):
+        if job.status == "failed":
+            st.error(job.error or "Analysis failed.")
+        elif job.status == "cancelled":
+            st.warning("Analysis cancelled.")
+        else:
+            return
+        if st.button("Restart Analysis"):
+            st.session_state.pop('analysis_job', None)
+            st.rerun()
+    
+    def display_results(self, results, mode, original_text, ready_sections=None):
+        if results.get('changes'):
+            self.display_changes(results['changes'])
+        if mode != "Full Report" and self.section_pending(MODE_SECTIONS.get(mode), ready_sections):
+            return
         if mode == "Summary":
             self.display_summary(results)
         elif mode == "Key Points":
@@ -85,7 +179,40 @@ class CorporateDocumentAnalyzer:
         elif mode == "Sentiment":
             self.display_sentiment(results)
         elif mode == "Full Report":
-            self.display_full_report(results, original_text)
+            self.display_full_report(results, original_text, ready_sections)
+    
+    def display_changes(self, changes):
+        counts = changes['paragraphs']
+        with st.expander(f"🔁 Changes since previous version: {counts['modified']} modified, {counts['added']} added, {counts['removed']} removed paragraphs"):
+            for name, label in (('risks', "risk"), ('opportunities', "opportunity"), ('action_items', "action item"), ('decisions', "decision")):
+                for item in changes.get(f"{name}_added", []):
+                    st.write(f"- **New {label}:** {item}")
+                for item in changes.get(f"{name}_removed", []):
+                    st.write(f"- **Removed {label}:** ~~{item}~~")
+                unlisted = changes.get(f"{name}_removed_count", 0) - len(changes.get(f"{name}_removed", []))
+                if unlisted > 0:
+                    st.write(f"- **Removed {label}s:** {unlisted} not listed")
+            for change in changes['changes'][:MAX_LISTED_CHANGES]:
+                if change['type'] == "modified":
+                    st.markdown(f"**Paragraph {change['new_index'] + 1} modified**")
+                    if change['old_text']:
+                        st.caption(f"Before: {change['old_text']}")
+                    st.write(change['new_text'])
+                elif change['type'] == "added":
+                    st.markdown(f"**Paragraph {change['new_index'] + 1} added**")
+                    st.write(change['new_text'])
+                else:
+                    st.markdown(f"**Paragraph {change['old_index'] + 1} removed**")
+                    if change['old_text']:
+                        st.caption(change['old_text'])
+            if len(changes['changes']) > MAX_LISTED_CHANGES:
+                st.caption(f"... and {len(changes['changes']) - MAX_LISTED_CHANGES} more changes")
+    
+    def section_pending(self, section, ready_sections):
+        if ready_sections is None or section is None or section in ready_sections:
+            return False
+        st.info("⏳ Still analyzing, this section will appear as soon as it is ready.")
+        return True
     
     def display_summary(self, results):
         st.header("Executive Summary")
@@ -108,13 +235,15 @@ class CorporateDocumentAnalyzer:
     
     def display_risk_analysis(self, results):
         st.header("🔴 Risk Analysis")
-        for risk in results.get('risks', [])[:15]:
-            st.write(f"- {risk}")
+        self.display_ranked_items(results.get('risk_items', [])[:15])
     
     def display_opportunities(self, results):
         st.header("🟢 Opportunities")
-        for opportunity in results.get('opportunities', [])[:15]:
-            st.write(f"- {opportunity}")
+        self.display_ranked_items(results.get('opportunity_items', [])[:15])
+    
+    def display_ranked_items(self, items):
+        for item in items:
+            st.write(f"- **[{item['severity']}]** {item['text']}")
     
     def display_sentiment(self, results):
         st.header("😊 Sentiment Analysis")
@@ -126,71 +255,112 @@ class CorporateDocumentAnalyzer:
             st.metric("Sentiment", sentiment.get('label', 'Neutral'))
         with col3:
             st.metric("Confidence", f"{sentiment.get('confidence', 0):.2f}")
+        if len(sentiment.get('section_scores', [])) > 1:
+            st.subheader("Sentiment by Section")
+            st.line_chart(sentiment['section_scores'])
     
-    def display_full_report(self, results, original_text):
+    def display_full_report(self, results, original_text, ready_sections=None):
         st.header("📊 Full Analysis Report")
-        tabs = st.tabs(["Summary", "Key Insights", "Risks & Opportunities", "Statistics", "Document Preview"])
+        tab_sections = ['summary', 'key_points', 'risks', 'statistics', None]
+        tab_labels = ["Summary", "Key Insights", "Risks & Opportunities", "Statistics", "Document Preview"]
+        if ready_sections is not None:
+            tab_labels = [label if section is None or section in ready_sections else f"{label} ⏳" for label, section in zip(tab_labels, tab_sections)]
+        tabs = st.tabs(tab_labels)
         with tabs[0]:
             st.subheader("Executive Summary")
-            st.write(results.get('summary', 'No summary available'))
+            if not self.section_pending('summary', ready_sections):
+                st.write(results.get('summary', 'No summary available'))
         with tabs[1]:
-            col1, col2 = st.columns(2)
-            with col1:
-                st.subheader("✅ Action Items")
-                for action in results.get('action_items', []):
-                    st.write(f"- {action}")
-            with col2:
-                st.subheader("📋 Decisions")
-                for decision in results.get('decisions', []):
-                    st.write(f"- {decision}")
-                st.subheader("🔑 Keywords")
-                for keyword in results.get('keywords', [])[:15]:
-                    st.write(f"- {keyword}")
+            if not self.section_pending('key_points', ready_sections):
+                col1, col2 = st.columns(2)
+                with col1:
+                    st.subheader("✅ Action Items")
+                    for action in results.get('action_items', []):
+                        st.write(f"- {action}")
+                with col2:
+                    st.subheader("📋 Decisions")
+                    for decision in results.get('decisions', []):
+                        st.write(f"- {decision}")
+                    st.subheader("🔑 Keywords")
+                    for keyword in results.get('keywords', [])[:15]:
+                        st.write(f"- {keyword}")
         with tabs[2]:
-            col1, col2 = st.columns(2)
-            with col1:
-                st.subheader("🔴 Risks")
-                for risk in results.get('risks', []):
-                    st.write(f"- {risk}")
-            with col2:
-                st.subheader("🟢 Opportunities")
-                for opportunity in results.get('opportunities', []):
-                    st.write(f"- {opportunity}")
+            if not self.section_pending('risks', ready_sections):
+                col1, col2 = st.columns(2)
+                with col1:
+                    st.subheader("🔴 Risks")
+                    self.display_ranked_items(results.get('risk_items', []))
+                with col2:
+                    st.subheader("🟢 Opportunities")
+                    self.display_ranked_items(results.get('opportunity_items', []))
         with tabs[3]:
             st.subheader("Document Statistics")
-            stats = results.get('statistics', {})
-            col1, col2, col3, col4 = st.columns(4)
-            st.metric("Words", stats.get('word_count', 0))
-            st.metric("Sentences", stats.get('sentence_count', 0))
-            st.metric("Paragraphs", stats.get('paragraph_count', 0))
-            st.metric("Reading Time", f"{stats.get('reading_time_minutes', 0)} min")
+            if not self.section_pending('statistics', ready_sections):
+                stats = results.get('statistics', {})
+                col1, col2, col3, col4 = st.columns(4)
+                st.metric("Words", stats.get('word_count', 0))
+                st.metric("Sentences", stats.get('sentence_count', 0))
+                st.metric("Paragraphs", stats.get('paragraph_count', 0))
+                st.metric("Reading Time", f"{stats.get('reading_time_minutes', 0)} min")
         with tabs[4]:
-            preview_text = original_text[:5000] + "..." if len(original_text) > 5000 else original_text
-            st.subheader("Document Preview")
-            st.text_area("Extracted Text", preview_text, height=300)
+            self.display_document_preview(results, original_text)
+    
+    def display_document_preview(self, results, original_text):
+        st.subheader("Document Preview")
+        pages, spans = highlight_layout(original_text, self.highlighter.extract_highlight_patterns(results))
+        if not pages:
+            return
+        # Only the selected page is rendered, so long documents never ship as one huge HTML blob
+        page = st.number_input(f"Page (of {len(pages)})", min_value=1, max_value=len(pages), value=1, step=1, key=f"preview_page_{hash(original_text)}")
+        start, end = pages[page - 1]
+        legend = " ".join(f'<span style="background-color: {color}; padding: 2px 6px; border-radius: 2px;">{category.replace("_", " ")}</span>' for category, color in self.highlighter.highlight_colors.items())
+        st.markdown(legend, unsafe_allow_html=True)
+        page_html = self.highlighter.render(original_text, spans, start, end).replace("\n", "<br>").replace("$", "&#36;")
+        st.markdown(f'<div style="max-height: 600px; overflow-y: auto; border: 1px solid #ddd; padding: 12px;">{page_html}</div>', unsafe_allow_html=True)
     
     def run(self):
         self.setup_ui()
+        self.warm_up_models()
         uploaded_file, analysis_mode, export_format, export_btn = self.sidebar_controls()
         if uploaded_file:
-            file_path = self.file_utils.save_uploaded_file(uploaded_file)
-            file_type = uploaded_file.type.split('/')[-1]
-            extracted_text = self.extract_text(file_path, file_type)
+            doc_hash = ResultCache.hash_bytes(uploaded_file.getvalue())
+            try:
+                job = self.current_job(uploaded_file, analysis_mode, doc_hash)
+            except QueueFull as e:
+                st.warning(f"{str(e)}. Retrying shortly...")
+                time.sleep(POLL_INTERVAL_SECONDS * 4)
+                st.rerun()
+            if not job.done:
+                self.job_progress(job)
+            self.job_outcome(job)
+            results = job.results()
+            extracted_text = results.pop('document_text', None)
+            if extracted_text and job.status == "completed":
+                self.remember_revision(uploaded_file.name, doc_hash, extracted_text)
             if extracted_text:
-                results = self.analyze_document(extracted_text, analysis_mode)
-                self.display_results(results, analysis_mode, extracted_text)
-                if export_btn:
-                    if export_format == "PDF":
-                        exporter = PDFExporter()
-                    else:
-                        exporter = WordExporter()
-                    export_file = exporter.export(results, analysis_mode)
-                    st.download_button(label=f"Download {export_format} Report", data=export_file, file_name=f"document_analysis_report.{export_format.lower()}", mime=f"application/{export_format.lower()}")
-            else:
-                st.error("Failed to extract text from the document.")
+                self.display_results(results, analysis_mode, extracted_text, None if job.done else set(job.snapshot()['sections']))
+            if job.status == "completed" and export_btn:
+                if export_format == "PDF":
+                    exporter = PDFExporter()
+                else:
+                    exporter = WordExporter()
+                export_file = exporter.export(results, analysis_mode)
+                st.download_button(label=f"Download {export_format} Report", data=export_file, file_name=f"document_analysis_report.{export_format.lower()}", mime=f"application/{export_format.lower()}")
+            if not job.done:
+                time.sleep(POLL_INTERVAL_SECONDS)
+                st.rerun()
         else:
             st.info("Please upload a PDF or Word document to begin analysis.")
 
+@st.cache_data(show_spinner=False, max_entries=8)
+def highlight_layout(text, patterns):
+    highlighter = HighlightUtils()
+    return highlighter.paginate(text, PREVIEW_PAGE_CHARS), highlighter.find_spans(text, patterns)
+
+@st.cache_resource(show_spinner=False)
+def get_analyzer():
+    return CorporateDocumentAnalyzer()
+
 if __name__ == "__main__":
-    analyzer = CorporateDocumentAnalyzer()
+    analyzer = get_analyzer()
     analyzer.run()
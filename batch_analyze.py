@@ -0,0 +1,36 @@
+import argparse
+import logging
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent))
+
+from modules.batch_processor import BatchProcessor
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+ANALYSIS_MODES = ["Summary", "Key Points", "Risk Analysis", "Sentiment", "Full Report"]
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Analyze a folder or glob of PDF and Word documents without the Streamlit UI")
+    parser.add_argument('inputs', nargs='+', help="Directories, files or glob patterns, e.g. 'dumps/**/*.pdf'")
+    parser.add_argument('--output', '-o', default="results.jsonl", help="JSONL file written one record per document; also used as the resume checkpoint")
+    parser.add_argument('--mode', default="Full Report", choices=ANALYSIS_MODES)
+    parser.add_argument('--workers', '-w', type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument('--threads-per-worker', type=int, default=None, help="Inference threads per worker (default: CPU count / workers)")
+    parser.add_argument('--cache-dir', default=None, help="Result cache directory shared by the workers")
+    parser.add_argument('--idf-dir', default=None, help="Keyword IDF index directory (default: CDA_IDF_DIR or models/idf_index)")
+    parser.add_argument('--incremental', action='store_true', help="Treat files already analyzed at the same path as revisions: re-scan only changed paragraphs and add a change report")
+    parser.add_argument('--no-resume', action='store_true', help="Ignore and overwrite an existing output file")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    processor = BatchProcessor(args.output, mode=args.mode, workers=args.workers, cache_dir=args.cache_dir, threads_per_worker=args.threads_per_worker, incremental=args.incremental, idf_dir=args.idf_dir)
+    stats = processor.run(args.inputs, resume=not args.no_resume)
+    print(f"Analyzed {stats['processed']} documents ({stats['ok']} ok, {stats['empty']} empty, {stats['error']} failed, {stats['skipped']} resumed) in {stats['seconds']:.1f}s: {stats['docs_per_second']:.2f} docs/sec")
+    return 1 if stats['error'] else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,63 @@
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.inference_backend import InferenceBackend, BACKENDS
+from sample_data import SAMPLE_PARAGRAPHS
+
+MODELS = {
+    'summarization': "facebook/bart-large-cnn",
+    'sentiment-analysis': "distilbert-base-uncased-finetuned-sst-2-english"
+}
+
+def build_inputs(task: str, count: int):
+    if task == 'summarization':
+        text = " ".join(SAMPLE_PARAGRAPHS)
+        return [text] * count
+    return [SAMPLE_PARAGRAPHS[i % len(SAMPLE_PARAGRAPHS)] for i in range(count)]
+
+def run_task(pipe, task: str, inputs):
+    if task == 'summarization':
+        return pipe(inputs, max_length=80, min_length=20, do_sample=False, truncation=True)
+    return pipe(inputs, truncation=True)
+
+def bench(backend_name: str, task: str, count: int, model_dir: str):
+    start = time.perf_counter()
+    pipe = InferenceBackend(backend_name, model_dir).load_pipeline(task, MODELS[task])
+    load_time = time.perf_counter() - start
+
+    inputs = build_inputs(task, count)
+    run_task(pipe, task, inputs[:1])
+
+    latencies = []
+    for item in inputs:
+        start = time.perf_counter()
+        run_task(pipe, task, [item])
+        latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    run_task(pipe, task, inputs)
+    batch_time = time.perf_counter() - start
+
+    latencies.sort()
+    p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+    print(f"{backend_name:<10} {task:<19} load={load_time:6.1f}s  p50={statistics.median(latencies) * 1000:8.1f}ms  p95={p95 * 1000:8.1f}ms  throughput={count / batch_time:6.2f}/s")
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Latency and throughput per inference backend")
+    parser.add_argument('--backends', nargs='+', default=list(BACKENDS), choices=BACKENDS)
+    parser.add_argument('--tasks', nargs='+', default=list(MODELS), choices=list(MODELS))
+    parser.add_argument('--count', type=int, default=16)
+    parser.add_argument('--model-dir', default=os.environ.get("CDA_MODEL_DIR"))
+    args = parser.parse_args()
+
+    for task in args.tasks:
+        for backend_name in args.backends:
+            try:
+                bench(backend_name, task, args.count, args.model_dir)
+            except Exception as e:
+                print(f"{backend_name:<10} {task:<19} unavailable: {str(e)}")
@@ -0,0 +1,59 @@
+import argparse
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.analysis_context import AnalysisContext
+from modules.text_chunker import TextChunker
+from sample_data import build_document
+
+MODELS = {
+    'summarizer': ("facebook/bart-large-cnn", 1000, 1024),
+    'sentiment': ("distilbert-base-uncased-finetuned-sst-2-english", 500, 512)
+}
+
+def legacy_split(text: str, chunk_size: int):
+    sentences = text.split('.')
+    chunks = []
+    current_chunk = ""
+    for sentence in sentences:
+        if len(current_chunk) + len(sentence) < chunk_size:
+            current_chunk += sentence + "."
+        else:
+            if current_chunk:
+                chunks.append(current_chunk)
+            current_chunk = sentence + "."
+    if current_chunk:
+        chunks.append(current_chunk)
+    return chunks
+
+def load_tokenizer(model_name: str):
+    try:
+        from transformers import AutoTokenizer
+        return AutoTokenizer.from_pretrained(model_name, local_files_only=True)
+    except Exception as e:
+        print(f"Tokenizer for {model_name} not available offline ({e.__class__.__name__}), estimating token counts")
+        return None
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Compare model calls per document for the legacy character splitter and TextChunker")
+    parser.add_argument('--pages', type=int, default=100)
+    parser.add_argument('--overlap', type=int, default=0)
+    args = parser.parse_args()
+
+    text = build_document(args.pages, chars_per_chunk=3000)
+    print(f"Document: {len(text)} chars (~{args.pages} pages)")
+
+    for name, (model_name, legacy_chars, max_tokens) in MODELS.items():
+        start = time.perf_counter()
+        legacy_chunks = legacy_split(text, legacy_chars)
+        legacy_time = time.perf_counter() - start
+
+        chunker = TextChunker(load_tokenizer(model_name), max_tokens=max_tokens, overlap_tokens=args.overlap)
+        start = time.perf_counter()
+        chunks = chunker.chunk(AnalysisContext(text).sentences)
+        chunker_time = time.perf_counter() - start
+
+        print(f"{name:<11} legacy: {len(legacy_chunks):6d} calls ({legacy_time:.3f}s)  token-aware: {len(chunks):6d} calls ({chunker_time:.3f}s)  reduction: {len(legacy_chunks) / max(len(chunks), 1):.1f}x")
@@ -0,0 +1,63 @@
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from docx import Document
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.docx_extractor import DOCXExtractor
+from sample_data import SAMPLE_PARAGRAPHS
+
+def create_contract(path: str, num_pages: int, table_every: int):
+    doc = Document()
+    for page_index in range(num_pages):
+        doc.add_heading(f"Clause {page_index + 1}", level=2)
+        for paragraph in SAMPLE_PARAGRAPHS:
+            doc.add_paragraph(paragraph)
+        doc.add_paragraph(f"Obligation {page_index + 1} survives termination.", style='List Paragraph')
+        if page_index % table_every == 0:
+            table = doc.add_table(rows=6, cols=4)
+            for row_index, row in enumerate(table.rows):
+                for col_index, cell in enumerate(row.cells):
+                    cell.text = f"R{row_index}C{col_index} {1000 + row_index * col_index}"
+        doc.add_page_break()
+    doc.save(path)
+
+def legacy_ingest(path: str):
+    text = "\n".join(p.text for p in Document(path).paragraphs if p.text.strip())
+    metadata = Document(path).core_properties
+    tables = [[[cell.text.strip() for cell in row.cells] for row in table.rows] for table in Document(path).tables]
+    structure = [p.text for p in Document(path).paragraphs if p.style.name.startswith('Heading')]
+    return text, metadata, tables, structure
+
+def measure(func, *args):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = func(*args)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak / (1024 * 1024)
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="python-docx four-load extraction vs single-pass lxml ingest")
+    parser.add_argument('--pages', type=int, default=500)
+    parser.add_argument('--table-every', type=int, default=5)
+    parser.add_argument('--docx', default=None)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = args.docx or os.path.join(temp_dir, "contract.docx")
+        if not args.docx:
+            create_contract(path, args.pages, args.table_every)
+
+        (legacy_text, _, legacy_tables, _), legacy_time, legacy_peak = measure(legacy_ingest, path)
+        result, ingest_time, ingest_peak = measure(DOCXExtractor().ingest, path)
+
+        print(f"python-docx: {legacy_time:6.2f}s  peak={legacy_peak:7.1f}MB  tables={len(legacy_tables)}")
+        print(f"iterparse:   {ingest_time:6.2f}s  peak={ingest_peak:7.1f}MB  tables={len(result['tables'])}  paragraphs={result['metadata']['paragraph_count']}")
+        print(f"text identical: {legacy_text == result['text']}  tables identical: {legacy_tables == result['tables']}")
+        print(f"speedup: {legacy_time / ingest_time:.1f}x")
@@ -0,0 +1,57 @@
+import argparse
+import os
+import re
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.highlight_utils import HighlightUtils
+from sample_data import SAMPLE_PARAGRAPHS
+
+PAGE_CHARS = 3000
+
+def legacy_highlight(text, patterns, colors):
+    highlighted_text = text
+    for category, terms in patterns.items():
+        color = colors.get(category, '#ffffff')
+        for term in terms:
+            pattern = re.compile(re.escape(term), re.IGNORECASE)
+            highlighted_text = pattern.sub(f'<span style="background-color: {color}; padding: 2px; border-radius: 2px;">{term}</span>', highlighted_text)
+    return highlighted_text
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Per-term re.sub highlighting vs single-scan spans with paginated rendering")
+    parser.add_argument('--pages', type=int, default=500)
+    args = parser.parse_args()
+
+    paragraph_block = "\n\n".join(SAMPLE_PARAGRAPHS)
+    text = "\n\n".join([paragraph_block] * (args.pages * PAGE_CHARS // len(paragraph_block) + 1))
+    highlighter = HighlightUtils()
+    results = {
+        'risks': ["pending litigation in two markets", "pressure on margins because of higher input costs"],
+        'action_items': ["reduce overhead and improve coordination"],
+        'decisions': ["the internal control review was completed"],
+        'opportunities': ["expand its digital services business"],
+        'keywords': ["revenue", "costs", "board", "review", "margins", "growth", "offices", "company", "markets", "legal"]
+    }
+    patterns = highlighter.extract_highlight_patterns(results)
+    print(f"text: {len(text) / 1e6:.1f} MB (~{args.pages} pages), {sum(len(terms) for terms in patterns.values())} terms")
+
+    nested_marker = '<span style="background-color: #ffccff; padding: 2px; border-radius: 2px;"><span'
+    start = time.perf_counter()
+    legacy = legacy_highlight(text, patterns, highlighter.highlight_colors)
+    print(f"legacy re.sub:    {time.perf_counter() - start:6.2f}s  html={len(legacy) / 1e6:.1f} MB, nested spans={legacy.count(nested_marker)}")
+
+    start = time.perf_counter()
+    spans = highlighter.find_spans(text, patterns)
+    scan_time = time.perf_counter() - start
+    start = time.perf_counter()
+    full = highlighter.render(text, spans)
+    render_time = time.perf_counter() - start
+    print(f"single scan:      {scan_time:6.2f}s  spans={len(spans)}; full render {render_time:.2f}s html={len(full) / 1e6:.1f} MB")
+
+    pages = highlighter.paginate(text, PAGE_CHARS)
+    start = time.perf_counter()
+    page_html = highlighter.render(text, spans, *pages[len(pages) // 2])
+    print(f"one page render:  {(time.perf_counter() - start) * 1000:6.2f} ms  html={len(page_html) / 1e3:.1f} KB of {len(pages)} pages")
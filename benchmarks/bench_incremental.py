@@ -0,0 +1,60 @@
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.document_analyzer import DocumentAnalyzer
+from modules.execution_engine import ExecutionEngine
+from utils.chunk_memo import ChunkMemo
+from utils.result_cache import ResultCache
+from utils.idf_index import IDFIndex
+from sample_data import SAMPLE_PARAGRAPHS
+
+def build_paragraphs(count: int, seed: int = 5):
+    # DOCX extraction output: one line per paragraph, each a few sentences long
+    rng = random.Random(seed)
+    return [" ".join(rng.sample(SAMPLE_PARAGRAPHS, 4)).replace("markets", f"markets {i}") for i in range(count)]
+
+def make_analyzer(cache_dir: str) -> DocumentAnalyzer:
+    return DocumentAnalyzer(result_cache=ResultCache(cache_dir=os.path.join(cache_dir, "results")), engine=ExecutionEngine(process_workers=0), idf_index=IDFIndex(os.path.join(cache_dir, "idf")), chunk_memo=ChunkMemo(os.path.join(cache_dir, "chunks")))
+
+def timed(function, *args):
+    start = time.perf_counter()
+    function(*args)
+    return time.perf_counter() - start
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Full vs incremental re-analysis of a revised document, per section")
+    parser.add_argument('--paragraphs', type=int, default=2000)
+    parser.add_argument('--changed', type=int, default=2)
+    args = parser.parse_args()
+
+    paragraphs = build_paragraphs(args.paragraphs)
+    original = "\n".join(paragraphs)
+    for index in range(args.changed):
+        position = (index + 1) * len(paragraphs) // (args.changed + 1)
+        paragraphs[position] = "There is a significant risk of delay. The team must review the revised clause before signing."
+    revised = "\n".join(paragraphs)
+    print(f"document: {len(revised) / 1e3:.0f} KB, {args.paragraphs} paragraphs, {args.changed} changed")
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        analyzer = make_analyzer(cache_dir)
+        if analyzer.summarizer.summarizer is None:
+            print("summarizer model unavailable: summary falls back to extractive TextRank, set CDA_MODEL_DIR to time the chunk memo")
+        analyzer.analyze_document(original, "Full Report", document_id="report.docx")
+        context = analyzer.nlp_pipeline.build_context(revised)
+        context.materialize()
+        version = analyzer.incremental.version(ResultCache.hash_text(revised), revised)
+        previous = analyzer.incremental.previous_version("", "report.docx", version['doc_hash'])
+        for section in ('risks', 'key_points', 'summary'):
+            full = timed(analyzer.compute_section, section, revised, context)
+            incremental = timed(analyzer.compute_section, section, revised, context, None, version, previous)
+            print(f"{section:<11} full {full:7.3f}s  incremental {incremental:7.3f}s")
+        start = time.perf_counter()
+        changes = analyzer.incremental.change_report(previous, version, revised)
+        print(f"change report {time.perf_counter() - start:.3f}s: {changes['paragraphs']}")
+        analyzer.engine.shutdown()
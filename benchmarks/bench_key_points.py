@@ -0,0 +1,62 @@
+import argparse
+import os
+import re
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.keyword_extractor import KeywordExtractor
+
+LEGACY_PATTERNS = [
+    r'(?:need to|must|should|will)\s+([^.!?]*(?:implement|complete|finish|submit|review|approve|prepare|send|check|verify)[^.!?]*[.!?])',
+    r'(?:action item|todo|task):?\s*([^.!?]*[.!?])',
+    r'(?:please|kindly)\s+([^.!?]*(?:prepare|send|check|verify)[^.!?]*[.!?])',
+    r'(?:ensure|make sure)\s+([^.!?]*[.!?])',
+    r'(?:required to|expected to)\s+([^.!?]*[.!?])',
+    r'(?:decided|agreed|concluded|resolved)\s+([^.!?]*[.!?])',
+    r'(?:decision|resolution):?\s*([^.!?]*[.!?])',
+    r'(?:it was|we have)\s+(?:decided|agreed)\s+([^.!?]*[.!?])',
+    r'(?:the board|committee|team)\s+(?:approved|rejected)\s+([^.!?]*[.!?])',
+    r'(?:conclusion|agreement)\s+([^.!?]*[.!?])'
+]
+
+# Extracted tables: long runs of cells without sentence punctuation, full of trigger words
+TABLE_ROW = "Task Owner Status will must should decided team review pending "
+
+def legacy_extract(text):
+    found = []
+    for pattern in LEGACY_PATTERNS:
+        found.extend(re.findall(pattern, text, re.IGNORECASE))
+    return [item.strip() for item in found if len(item.strip()) > 10]
+
+def time_call(func, text):
+    start = time.perf_counter()
+    result = func(text)
+    return time.perf_counter() - start, result
+
+def build_text(shape, size):
+    text = (TABLE_ROW * (size * 1024 // len(TABLE_ROW) + 1))[:size * 1024 - 1]
+    # 'tail': one period at the very end makes every trigger's [^.!?]* run to the end of the text;
+    # 'open': no sentence punctuation at all, so every trigger scans to the end and then backtracks
+    return text + "." if shape == 'tail' else text + " "
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Legacy findall patterns vs single-scan KeywordExtractor on punctuation-free table text")
+    parser.add_argument('--max-kilobytes', type=int, default=1024)
+    parser.add_argument('--legacy-max-kilobytes', type=int, default=16)
+    args = parser.parse_args()
+
+    extractor = KeywordExtractor()
+    for shape in ('tail', 'open'):
+        print(f"{shape}: {'size':>8} {'legacy':>10} {'scan':>10} {'scan us/KB':>11}")
+        size = 4
+        while size <= args.max_kilobytes:
+            text = build_text(shape, size)
+            scan_time, matches = time_call(extractor.scan, text)
+            legacy = "skipped"
+            if size <= args.legacy_max_kilobytes:
+                legacy_time, _ = time_call(legacy_extract, text)
+                legacy = f"{legacy_time:9.3f}s"
+            print(f"{'':>5} {size:>6}KB {legacy:>10} {scan_time:9.4f}s {scan_time * 1e6 / size:11.1f}")
+            size *= 4
@@ -0,0 +1,65 @@
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.analysis_context import AnalysisContext
+from modules.keyword_extractor import KeywordExtractor
+from utils.idf_index import IDFIndex
+from sample_data import SAMPLE_PARAGRAPHS
+
+BOILERPLATE = "The company shall provide the information to the company secretary. "
+
+def build_corpus(num_docs: int, seed: int = 7):
+    rng = random.Random(seed)
+    words = " ".join(SAMPLE_PARAGRAPHS).replace(".", "").split()
+    return [BOILERPLATE + " ".join(rng.choice(words) for _ in range(300)) + "." for _ in range(num_docs)]
+
+def build_document(num_words: int) -> str:
+    block = BOILERPLATE + " ".join(SAMPLE_PARAGRAPHS) + " The supply chain review found supply chain delays in two regions. "
+    return " ".join([block] * (num_words // len(block.split()) + 1))
+
+def legacy_keywords(context, top_n=20):
+    stop_words = {'the', 'and', 'for', 'are', 'but', 'not', 'you', 'all', 'any', 'can', 'that', 'with', 'this', 'from', 'have', 'they', 'which', 'their', 'what', 'when', 'where', 'your', 'will', 'would', 'there', 'been', 'were', 'them', 'than', 'then'}
+    word_freq = {}
+    for word in context.tokens:
+        if len(word) >= 4 and word.isascii() and word.isalpha() and word not in stop_words:
+            word_freq[word] = word_freq.get(word, 0) + 1
+    return [word for word, _ in sorted(word_freq.items(), key=lambda x: x[1], reverse=True)[:top_n]]
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Frequency keywords vs IDF-weighted keyphrases on a large document")
+    parser.add_argument('--words', type=int, default=100_000)
+    parser.add_argument('--corpus', type=int, default=200)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as index_dir:
+        index = IDFIndex(index_dir)
+        start = time.perf_counter()
+        for number, document in enumerate(build_corpus(args.corpus)):
+            index.add_document(f"doc{number}", AnalysisContext(document).tokens)
+        ingest_time = time.perf_counter() - start
+        print(f"index: {index.num_docs} documents, {index.num_terms} terms, {ingest_time * 1000 / args.corpus:.2f} ms per document ingested")
+
+        extractor = KeywordExtractor(idf_index=index)
+        context = AnalysisContext(build_document(args.words))
+        context.tokens
+        print(f"document: {len(context.tokens)} words")
+
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            legacy = legacy_keywords(context)
+        legacy_time = (time.perf_counter() - start) / args.repeat
+
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            keyphrases = extractor.extract_keyphrases(context.text, context=context)
+        keyphrase_time = (time.perf_counter() - start) / args.repeat
+
+        print(f"legacy frequency: {legacy_time * 1000:7.1f} ms  {legacy[:8]}")
+        print(f"idf keyphrases:   {keyphrase_time * 1000:7.1f} ms  {[keyphrase['phrase'] for keyphrase in keyphrases[:8]]}")
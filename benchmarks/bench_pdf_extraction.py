@@ -0,0 +1,81 @@
+import argparse
+import multiprocessing
+import os
+import resource
+import sys
+import tempfile
+import time
+import fitz
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.pdf_extractor import PDFExtractor
+from sample_data import SAMPLE_PARAGRAPHS
+
+def create_pdf(path: str, num_pages: int):
+    text = "\n".join(SAMPLE_PARAGRAPHS * 4)
+    doc = fitz.open()
+    for _ in range(num_pages):
+        page = doc.new_page()
+        page.insert_textbox(fitz.Rect(36, 36, 576, 756), text, fontsize=9)
+    doc.save(path)
+    doc.close()
+
+def _peak_rss_growth(path: str, streaming: bool, queue):
+    before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    extractor = PDFExtractor()
+    if streaming:
+        chars = sum(len(page['text']) for page in extractor.iter_pages(path))
+    else:
+        chars = len(extractor.extract_text(path))
+    queue.put(((resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - before) / 1024, chars))
+
+def peak_rss_growth(path: str, streaming: bool):
+    # Fresh process per measurement so ru_maxrss (KB on Linux) starts from an idle interpreter
+    context = multiprocessing.get_context('spawn')
+    queue = context.Queue()
+    process = context.Process(target=_peak_rss_growth, args=(path, streaming, queue))
+    process.start()
+    result = queue.get()
+    process.join()
+    return result
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Pages/sec of sequential vs multi-process PDF extraction")
+    parser.add_argument('--pages', type=int, default=1000)
+    parser.add_argument('--pdf', default=None, help="Existing PDF to benchmark instead of a generated one")
+    parser.add_argument('--max-workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--rss', action='store_true', help="Peak RSS growth of iter_pages vs extract_text at 1/4, 1/2 and all of --pages")
+    args = parser.parse_args()
+
+    if args.rss:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            for num_pages in (args.pages // 4, args.pages // 2, args.pages):
+                path = os.path.join(temp_dir, f"rss_{num_pages}.pdf")
+                create_pdf(path, num_pages)
+                streamed, chars = peak_rss_growth(path, True)
+                joined, _ = peak_rss_growth(path, False)
+                print(f"pages={num_pages:<6} text={chars / 1e6:6.1f} MB  iter_pages peak RSS +{streamed:7.1f} MB  extract_text peak RSS +{joined:7.1f} MB")
+        sys.exit(0)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = args.pdf or os.path.join(temp_dir, "bench.pdf")
+        if not args.pdf:
+            create_pdf(path, args.pages)
+        with fitz.open(path) as doc:
+            page_count = len(doc)
+
+        extractor = PDFExtractor()
+        start = time.perf_counter()
+        baseline = extractor.extract_text(path)
+        elapsed = time.perf_counter() - start
+        print(f"sequential   pages/sec={page_count / elapsed:8.1f}  wall={elapsed:6.2f}s")
+
+        workers = 2
+        while workers <= args.max_workers:
+            start = time.perf_counter()
+            text = extractor.extract_text_parallel(path, workers)
+            elapsed = time.perf_counter() - start
+            assert text == baseline, "parallel extraction changed the text"
+            print(f"workers={workers:<4} pages/sec={page_count / elapsed:8.1f}  wall={elapsed:6.2f}s")
+            workers *= 2
@@ -0,0 +1,70 @@
+import argparse
+import os
+import sys
+import tempfile
+import time
+import fitz
+import pdfplumber
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.pdf_extractor import PDFExtractor
+from sample_data import SAMPLE_PARAGRAPHS
+
+def draw_table(page, top: float, rows: int = 8, cols: int = 4):
+    left, width, row_height = 72, 440, 18
+    for row in range(rows + 1):
+        y = top + row * row_height
+        page.draw_line((left, y), (left + width, y))
+    for col in range(cols + 1):
+        x = left + col * width / cols
+        page.draw_line((x, top), (x, top + rows * row_height))
+    for row in range(rows):
+        for col in range(cols):
+            page.insert_text((left + col * width / cols + 4, top + row * row_height + 13), f"R{row}C{col} {1000 + row * col}", fontsize=8)
+
+def create_report(path: str, num_pages: int, table_every: int):
+    text = "\n".join(SAMPLE_PARAGRAPHS * 3)
+    doc = fitz.open()
+    for page_index in range(num_pages):
+        page = doc.new_page()
+        page.insert_textbox(fitz.Rect(36, 36, 576, 420), text, fontsize=9)
+        if page_index % table_every == 0:
+            draw_table(page, 450)
+    doc.save(path)
+    doc.close()
+
+def legacy_ingest(extractor: PDFExtractor, path: str, image_dir: str):
+    text = "".join(page['text'] for page in extractor.iter_pages(path))
+    metadata = extractor.extract_metadata(path)
+    tables = []
+    with pdfplumber.open(path) as pdf:
+        for page in pdf.pages:
+            tables.extend(table for table in page.extract_tables() if table)
+    images = extractor.extract_images(path, image_dir)
+    return text, metadata, tables, images
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Separate extract_* passes vs single-open ingest")
+    parser.add_argument('--pages', type=int, default=80)
+    parser.add_argument('--table-every', type=int, default=8)
+    parser.add_argument('--pdf', default=None)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = args.pdf or os.path.join(temp_dir, "report.pdf")
+        if not args.pdf:
+            create_report(path, args.pages, args.table_every)
+        extractor = PDFExtractor()
+
+        start = time.perf_counter()
+        _, _, legacy_tables, _ = legacy_ingest(extractor, path, temp_dir)
+        legacy_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        result = extractor.ingest(path, image_dir=temp_dir)
+        ingest_time = time.perf_counter() - start
+
+        print(f"separate passes: {legacy_time:6.2f}s  tables={len(legacy_tables)}")
+        print(f"single ingest:   {ingest_time:6.2f}s  tables={len(result['tables'])}  pages={result['metadata']['page_count']}")
+        print(f"speedup: {legacy_time / ingest_time:.1f}x")
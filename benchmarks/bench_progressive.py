@@ -0,0 +1,40 @@
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.document_analyzer import DocumentAnalyzer
+from modules.execution_engine import ExecutionEngine
+from utils.result_cache import ResultCache
+from sample_data import build_document
+
+def measure(analyzer: DocumentAnalyzer, text: str):
+    start = time.perf_counter()
+    section_times = {}
+    analyzer.analyze_document(text, "Full Report", on_section=lambda section, values: section_times.setdefault(section, time.perf_counter() - start))
+    return section_times, time.perf_counter() - start
+
+def report(name: str, section_times, total: float):
+    order = " > ".join(f"{section} {seconds:.2f}s" for section, seconds in sorted(section_times.items(), key=lambda item: item[1]))
+    print(f"{name:<10} first section={min(section_times.values()):7.2f}s  complete={total:7.2f}s  [{order}]")
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Time-to-first-section vs time-to-complete for Full Report analysis")
+    parser.add_argument('--chunks', type=int, default=16)
+    parser.add_argument('--budget', type=int, default=None, help="Parallelism budget (default: CPU count)")
+    args = parser.parse_args()
+
+    text = build_document(args.chunks)
+    engines = (
+        ("sequential", ExecutionEngine(budget=args.budget, thread_workers=1, process_workers=0)),
+        ("threads", ExecutionEngine(budget=args.budget, process_workers=0)),
+        ("processes", ExecutionEngine(budget=args.budget, min_process_chars=0))
+    )
+    for name, engine in engines:
+        with tempfile.TemporaryDirectory() as cache_dir:
+            analyzer = DocumentAnalyzer(result_cache=ResultCache(cache_dir=cache_dir), engine=engine)
+            report(name, *measure(analyzer, text))
+        engine.shutdown()
@@ -0,0 +1,76 @@
+import argparse
+import os
+import re
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.analysis_context import AnalysisContext
+from modules.risk_detector import RiskDetector, RISK_PATTERNS, OPPORTUNITY_PATTERNS
+from sample_data import SAMPLE_PARAGRAPHS
+
+RISK_TEXT = [
+    "There is a significant risk that supplier delays could disrupt production in the second half.",
+    "Failure to renew the licence may result in penalties from the regulator.",
+    "The expansion into Asia is a major growth opportunity for the services business.",
+    "Competitive advantage in pricing can lead to higher market share."
+]
+
+def build_text(target_bytes: int) -> str:
+    block = " ".join(SAMPLE_PARAGRAPHS + RISK_TEXT)
+    return " ".join([block] * (target_bytes // (len(block) + 1) + 1))[:target_bytes]
+
+def legacy_sentences(sentences, lexicon):
+    found = []
+    for sentence in sentences:
+        sentence_lower = sentence.lower()
+        score = 0
+        for level, keywords in lexicon.items():
+            for keyword in keywords:
+                if keyword in sentence_lower:
+                    score += {'high': 3, 'medium': 2, 'low': 1}[level]
+        if score >= 2 and len(sentence.strip()) > 20:
+            found.append(sentence.strip())
+    return found
+
+def legacy_detect(text, context, patterns, lexicon):
+    found = []
+    for pattern, _ in patterns:
+        found.extend(re.findall(pattern, text, re.IGNORECASE))
+    found.extend(legacy_sentences(context.sentences, lexicon))
+    return set([item.strip() for item in found if len(item.strip()) > 15])
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Per-pattern findall + nested keyword loop vs compiled single-pass RiskDetector")
+    parser.add_argument('--megabytes', type=float, default=10)
+    args = parser.parse_args()
+
+    text = build_text(int(args.megabytes * 1024 * 1024))
+    context = AnalysisContext(text)
+    start = time.perf_counter()
+    context.sentences
+    context.tokens
+    context_time = time.perf_counter() - start
+    detector = RiskDetector()
+
+    start = time.perf_counter()
+    legacy_risks = legacy_detect(text, context, RISK_PATTERNS, detector.risk_keywords)
+    legacy_opportunities = legacy_detect(text, context, OPPORTUNITY_PATTERNS, detector.opportunity_keywords)
+    legacy_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    hits = detector.scan(text, context)
+    scan_time = time.perf_counter() - start
+    found = {category: set(hit['text'].strip() for hit in hits if hit['category'] == category and len(hit['text'].strip()) > 15) for category in ('risk', 'opportunity')}
+
+    start = time.perf_counter()
+    ranked = {category: detector.rank(hits, category) for category in ('risk', 'opportunity')}
+    rank_time = time.perf_counter() - start
+
+    print(f"text: {len(text) / 1e6:.1f} MB, {len(context.sentence_spans)} sentences, {len(context.tokens)} tokens (shared context built in {context_time:.2f}s)")
+    print(f"legacy:   {legacy_time:6.2f}s  risks={len(legacy_risks)} opportunities={len(legacy_opportunities)}")
+    print(f"compiled: {scan_time:6.2f}s  risks={len(found['risk'])} opportunities={len(found['opportunity'])} hits={len(hits)}")
+    print(f"same risks: {found['risk'] == legacy_risks}  same opportunities: {found['opportunity'] == legacy_opportunities}")
+    print(f"speedup: {legacy_time / scan_time:.1f}x")
+    print(f"ranked:   {rank_time:6.2f}s  top {detector.top_k} risks={len(ranked['risk'])} opportunities={len(ranked['opportunity'])}")
@@ -0,0 +1,54 @@
+import argparse
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.analysis_context import AnalysisContext
+from modules.lexicon_sentiment import LexiconSentiment
+from sample_data import SAMPLE_PARAGRAPHS
+
+POSITIVE_WORDS = {'good', 'great', 'excellent', 'positive', 'success', 'profit', 'growth', 'improve', 'benefit', 'opportunity', 'strong', 'better', 'best', 'win', 'advantage', 'achievement', 'progress', 'successful', 'outstanding'}
+NEGATIVE_WORDS = {'bad', 'poor', 'negative', 'loss', 'decline', 'risk', 'problem', 'issue', 'challenge', 'weak', 'worse', 'worst', 'fail', 'disadvantage', 'threat', 'difficult', 'concern', 'weakness', 'failure'}
+
+def build_report(num_words: int) -> str:
+    sections = []
+    words = 0
+    while words < num_words:
+        section = " ".join(SAMPLE_PARAGRAPHS[len(sections) % len(SAMPLE_PARAGRAPHS):] + SAMPLE_PARAGRAPHS[:len(sections) % len(SAMPLE_PARAGRAPHS)])
+        sections.append(section)
+        words += len(section.split())
+    return "\n\n".join(sections)
+
+def legacy_sentiment(text):
+    words = text.lower().split()
+    positive = sum(1 for word in words if word in POSITIVE_WORDS)
+    negative = sum(1 for word in words if word in NEGATIVE_WORDS)
+    return positive / (positive + negative) if positive + negative else 0.5
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Document-level word sets vs vectorised lexicon timeline")
+    parser.add_argument('--words', type=int, default=200_000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    text = build_report(args.words)
+    context = AnalysisContext(text)
+    start = time.perf_counter()
+    context.tokens
+    context.paragraph_spans
+    print(f"report: {len(context.tokens)} tokens, {len(context.sentence_spans)} sentences, {len(context.paragraph_spans)} sections (context built in {time.perf_counter() - start:.2f}s)")
+
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        legacy = legacy_sentiment(text)
+    print(f"legacy word sets: {(time.perf_counter() - start) * 1000 / args.repeat:7.1f} ms  score={legacy:.3f} (document only)")
+
+    start = time.perf_counter()
+    lexicon = LexiconSentiment()
+    print(f"lexicon load:     {(time.perf_counter() - start) * 1000:7.1f} ms  {len(lexicon.vocab)} terms")
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        result = lexicon.analyze(context)
+    print(f"lexicon timeline: {(time.perf_counter() - start) * 1000 / args.repeat:7.1f} ms  score={result['score']:.3f}, {len(result['sentence_scores'])} sentence and {len(result['section_scores'])} section scores")
@@ -0,0 +1,42 @@
+import argparse
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.analysis_context import AnalysisContext
+from modules.summarizer import Summarizer
+from sample_data import build_document
+
+def run_sequential(summarizer: Summarizer, chunks, max_length: int, min_length: int):
+    return [summarizer.summarizer(chunk, max_length=max_length, min_length=min_length, do_sample=False)[0]['summary_text'] for chunk in chunks]
+
+def report(name: str, num_chunks: int, elapsed: float):
+    print(f"{name:<12} chunks={num_chunks:<5} wall={elapsed:8.2f}s  chunks/sec={num_chunks / elapsed:6.2f}")
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Benchmark sequential vs batched chunk summarisation")
+    parser.add_argument('--chunks', type=int, default=32)
+    parser.add_argument('--batch-size', type=int, default=8)
+    parser.add_argument('--threads', type=int, default=None)
+    parser.add_argument('--max-length', type=int, default=150)
+    parser.add_argument('--min-length', type=int, default=30)
+    args = parser.parse_args()
+
+    summarizer = Summarizer(batch_size=args.batch_size, num_threads=args.threads)
+    if summarizer.summarizer is None:
+        print("Summarization model is not available, nothing to benchmark.")
+        sys.exit(1)
+
+    text = build_document(args.chunks)
+    chunks = summarizer._chunk_text(AnalysisContext(text))[:args.chunks]
+    summarizer._configure_threads()
+
+    start = time.perf_counter()
+    run_sequential(summarizer, chunks, args.max_length, args.min_length)
+    report("sequential", len(chunks), time.perf_counter() - start)
+
+    start = time.perf_counter()
+    summarizer._summarize_chunks(chunks, args.max_length, args.min_length)
+    report("batched", len(chunks), time.perf_counter() - start)
@@ -0,0 +1,58 @@
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.analysis_context import AnalysisContext
+from modules.text_rank import TextRank
+from sample_data import SAMPLE_PARAGRAPHS
+
+def build_text(target_bytes: int, seed: int = 11) -> str:
+    # Shuffled words keep sentences distinct, so the vocabulary and the similarity graph are realistic
+    rng = random.Random(seed)
+    words = " ".join(SAMPLE_PARAGRAPHS).replace(".", "").split()
+    sentences = []
+    size = 0
+    while size < target_bytes:
+        sentence = " ".join(rng.choice(words) for _ in range(rng.randint(8, 25))).capitalize() + f" in region {len(sentences) % 997}."
+        sentences.append(sentence)
+        size += len(sentence) + 1
+    return " ".join(sentences)
+
+def legacy_extractive(sentences, num_sentences=3):
+    word_freq = {}
+    for sentence in sentences:
+        for word in sentence.lower().split():
+            if len(word) > 2:
+                word_freq[word] = word_freq.get(word, 0) + 1
+    scores = {}
+    for i, sentence in enumerate(sentences):
+        words = sentence.lower().split()
+        if words:
+            scores[i] = sum(word_freq.get(word, 0) for word in words if len(word) > 2) / len(words)
+    return sorted(sorted(scores.items(), key=lambda x: x[1], reverse=True)[:num_sentences])
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Word-frequency extractive summary vs sparse TextRank")
+    parser.add_argument('--megabytes', type=float, default=10)
+    parser.add_argument('--top-k', type=int, default=3)
+    args = parser.parse_args()
+
+    text = build_text(int(args.megabytes * 1024 * 1024))
+    context = AnalysisContext(text)
+    start = time.perf_counter()
+    context.sentences
+    context.tokens
+    print(f"text: {len(text) / 1e6:.1f} MB, {len(context.sentence_spans)} sentences, {len(context.tokens)} tokens (context built in {time.perf_counter() - start:.2f}s)")
+
+    start = time.perf_counter()
+    legacy = legacy_extractive(context.sentences, args.top_k)
+    print(f"legacy frequency: {time.perf_counter() - start:6.2f}s  sentences={[index for index, _ in legacy]}")
+
+    text_rank = TextRank()
+    start = time.perf_counter()
+    ranked = text_rank.rank_sentences(context, args.top_k)
+    print(f"textrank:         {time.perf_counter() - start:6.2f}s  sentences={[item['index'] for item in ranked]} scores={[round(item['score'] * len(context.sentence_spans), 2) for item in ranked]}")
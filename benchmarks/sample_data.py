@@ -0,0 +1,13 @@
+SAMPLE_PARAGRAPHS = [
+    "The board reviewed the quarterly results and noted that revenue grew by eight percent compared with the prior year.",
+    "Management expects continued pressure on margins because of higher input costs and a volatile currency environment.",
+    "The audit committee confirmed that the internal control review was completed without material findings.",
+    "Several regional offices will be consolidated to reduce overhead and improve coordination between sales teams.",
+    "The company plans to expand its digital services business, which is expected to be the main driver of growth.",
+    "Legal counsel highlighted pending litigation in two markets that could result in additional compliance costs."
+]
+
+def build_document(num_chunks: int, chars_per_chunk: int = 5000) -> str:
+    sample = " ".join(SAMPLE_PARAGRAPHS)
+    repeats = num_chunks * chars_per_chunk // len(sample) + 1
+    return " ".join([sample] * repeats)
@@ -0,0 +1,122 @@
+import re
+from typing import Dict, List, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+SENTENCE_PATTERN = re.compile(r'[^.!?]+[.!?]*')
+# Negated contractions split the way spaCy splits them (didn't -> did + n't, can't -> ca + n't), so the sentiment
+# lexicon sees the same negator from either tokenizer
+TOKEN_PATTERN = re.compile(r"\w+?(?=n['’]t\b)|n['’]t\b|\b\w+\b")
+PARAGRAPH_BREAK = '\n\n'
+
+class AnalysisContext:
+    def __init__(self, text: str, doc=None):
+        self.text = text
+        self.doc = doc
+        self.sentence_spans = self._segment_sentences()
+        self._sentences = None
+        self._paragraph_spans = None
+        self._tokens = None
+        self._token_offsets = None
+        self._entities = None
+        self._content_tokens = None
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['doc'] = None
+        return state
+
+    def materialize(self) -> 'AnalysisContext':
+        self.sentences
+        self.paragraph_spans
+        self.tokens
+        self.content_tokens
+        self.entities
+        return self
+
+    @property
+    def sentences(self) -> List[str]:
+        if self._sentences is None:
+            self._sentences = [self.text[start:end] for start, end in self.sentence_spans]
+        return self._sentences
+
+    @property
+    def paragraph_spans(self) -> List[Tuple[int, int]]:
+        if self._paragraph_spans is None:
+            self._paragraph_spans = self._segment_paragraphs()
+        return self._paragraph_spans
+
+    @property
+    def paragraphs(self) -> List[str]:
+        return [self.text[start:end] for start, end in self.paragraph_spans]
+
+    @property
+    def tokens(self) -> List[str]:
+        if self._tokens is None:
+            self._tokenize()
+        return self._tokens
+
+    @property
+    def token_offsets(self) -> List[int]:
+        if self._token_offsets is None:
+            self._tokenize()
+        return self._token_offsets
+
+    @property
+    def content_tokens(self) -> List[str]:
+        if self._content_tokens is None:
+            if self.doc is not None:
+                self._content_tokens = [token.lemma_.lower() for token in self.doc if not token.is_stop and not token.is_punct and not token.is_space]
+            else:
+                self._content_tokens = list(self.tokens)
+        return self._content_tokens
+
+    @property
+    def entities(self) -> Dict[str, List[str]]:
+        if self._entities is None:
+            self._entities = {}
+            if self.doc is not None:
+                for ent in self.doc.ents:
+                    if ent.label_ not in self._entities:
+                        self._entities[ent.label_] = []
+                    if ent.text not in self._entities[ent.label_]:
+                        self._entities[ent.label_].append(ent.text)
+        return self._entities
+
+    def _segment_sentences(self) -> List[Tuple[int, int]]:
+        if self.doc is not None:
+            raw_spans = ((sent.start_char, sent.end_char) for sent in self.doc.sents)
+        else:
+            raw_spans = (match.span() for match in SENTENCE_PATTERN.finditer(self.text))
+        return [span for span in (self._strip_span(start, end) for start, end in raw_spans) if span]
+
+    def _segment_paragraphs(self) -> List[Tuple[int, int]]:
+        spans = []
+        start = 0
+        while start <= len(self.text):
+            end = self.text.find(PARAGRAPH_BREAK, start)
+            if end == -1:
+                end = len(self.text)
+            span = self._strip_span(start, end)
+            if span:
+                spans.append(span)
+            start = end + len(PARAGRAPH_BREAK)
+        return spans
+
+    def _tokenize(self):
+        if self.doc is not None:
+            words = [token for token in self.doc if not token.is_punct and not token.is_space]
+            self._tokens = [token.lower_ for token in words]
+            self._token_offsets = [token.idx for token in words]
+        else:
+            matches = list(TOKEN_PATTERN.finditer(self.text))
+            self._tokens = [match.group().lower() for match in matches]
+            self._token_offsets = [match.start() for match in matches]
+
+    def _strip_span(self, start: int, end: int):
+        while start < end and self.text[start].isspace():
+            start += 1
+        while end > start and self.text[end - 1].isspace():
+            end -= 1
+        return (start, end) if end > start else None
@@ -0,0 +1,138 @@
+import os
+import getpass
+import glob
+import json
+import time
+import logging
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from typing import Any, Dict, Iterator, List, Optional, Set
+from modules.document_analyzer import DocumentAnalyzer
+from modules.execution_engine import ExecutionEngine
+from utils.idf_index import IDFIndex
+from utils.result_cache import ResultCache
+
+logger = logging.getLogger(__name__)
+
+SUPPORTED_EXTENSIONS = {'.pdf': 'pdf', '.docx': 'docx'}
+
+_worker_analyzer = None
+
+def _init_worker(cache_dir: Optional[str], num_threads: Optional[int], pdf_workers: Optional[int] = 1, idf_dir: Optional[str] = None):
+    global _worker_analyzer
+    # Pool workers are already one process per document, so they spend their share of cores on threads only
+    engine = ExecutionEngine(budget=num_threads, process_workers=0) if num_threads else None
+    _worker_analyzer = DocumentAnalyzer(result_cache=ResultCache(cache_dir=cache_dir), pdf_workers=pdf_workers, engine=engine, idf_index=IDFIndex(idf_dir))
+
+def _analyze_file(file_path: str, mode: str, incremental: bool = False) -> Dict[str, Any]:
+    start = time.perf_counter()
+    record = {'path': file_path, 'file_type': SUPPORTED_EXTENSIONS.get(os.path.splitext(file_path)[1].lower()), 'mode': mode}
+    try:
+        record['doc_hash'] = ResultCache.hash_file(file_path)
+        # Incremental runs treat the path as the document identity across revisions
+        document_id = os.path.abspath(file_path) if incremental else None
+        owner = getpass.getuser() if incremental else ""
+        text = _worker_analyzer.extract_text(file_path, record['file_type'], doc_hash=record['doc_hash'], document_id=document_id, owner=owner)
+        if text:
+            record['status'] = "ok"
+            record['results'] = _worker_analyzer.analyze_document(text, mode, record['doc_hash'], document_id=document_id, owner=owner)
+        else:
+            record['status'] = "empty"
+    except Exception as e:
+        logger.error(f"Batch analysis failed for {file_path}: {str(e)}")
+        record['status'] = "error"
+        record['error'] = str(e)
+    record['seconds'] = round(time.perf_counter() - start, 3)
+    return record
+
+class BatchProcessor:
+    def __init__(self, output_path: str, mode: str = "Full Report", workers: Optional[int] = None, cache_dir: Optional[str] = None, threads_per_worker: Optional[int] = None, log_every: int = 10, incremental: bool = False, idf_dir: Optional[str] = None):
+        self.output_path = output_path
+        self.mode = mode
+        self.workers = workers or os.cpu_count() or 1
+        self.cache_dir = cache_dir
+        self.threads_per_worker = threads_per_worker or max(1, (os.cpu_count() or 1) // self.workers)
+        self.log_every = log_every
+        self.incremental = incremental
+        self.idf_dir = idf_dir
+
+    def discover(self, inputs: List[str]) -> List[str]:
+        files = set()
+        for item in inputs:
+            if os.path.isdir(item):
+                candidates = glob.glob(os.path.join(item, '**', '*'), recursive=True)
+            elif os.path.isfile(item):
+                candidates = [item]
+            else:
+                candidates = glob.glob(item, recursive=True)
+            for candidate in candidates:
+                if os.path.isfile(candidate) and os.path.splitext(candidate)[1].lower() in SUPPORTED_EXTENSIONS:
+                    files.add(os.path.abspath(candidate))
+        return sorted(files)
+
+    def load_checkpoint(self) -> Set[str]:
+        done = set()
+        if not os.path.exists(self.output_path):
+            return done
+        valid_bytes = 0
+        with open(self.output_path, 'rb') as f:
+            for line in f:
+                if not line.endswith(b'\n'):
+                    break
+                try:
+                    record = json.loads(line)
+                    # Failed documents are retried on resume; the retry appends a newer record for the same path
+                    if record.get('status') != "error":
+                        done.add(record['path'])
+                except Exception as e:
+                    logger.warning(f"Skipping unreadable checkpoint line: {str(e)}")
+                valid_bytes += len(line)
+        if valid_bytes < os.path.getsize(self.output_path):
+            logger.warning(f"Truncating partial record at the end of {self.output_path}")
+            with open(self.output_path, 'r+b') as f:
+                f.truncate(valid_bytes)
+        return done
+
+    def run(self, inputs: List[str], resume: bool = True) -> Dict[str, Any]:
+        files = self.discover(inputs)
+        done = self.load_checkpoint() if resume else set()
+        pending = [path for path in files if path not in done]
+        stats = {'total': len(files), 'skipped': len(files) - len(pending), 'processed': 0, 'ok': 0, 'empty': 0, 'error': 0}
+        logger.info(f"Batch: {len(files)} documents found, {stats['skipped']} already in checkpoint, {len(pending)} to analyze with {self.workers} workers")
+
+        start = time.perf_counter()
+        with open(self.output_path, 'a' if resume else 'w', encoding='utf-8') as output:
+            for record in self._iter_records(pending):
+                output.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+                output.flush()
+                stats['processed'] += 1
+                stats[record['status']] += 1
+                if stats['processed'] % self.log_every == 0:
+                    elapsed = time.perf_counter() - start
+                    logger.info(f"Batch progress: {stats['processed']}/{len(pending)} documents, {stats['processed'] / elapsed:.2f} docs/sec")
+
+        stats['seconds'] = round(time.perf_counter() - start, 3)
+        stats['docs_per_second'] = round(stats['processed'] / stats['seconds'], 3) if stats['seconds'] > 0 else 0.0
+        return stats
+
+    def _iter_records(self, files: List[str]) -> Iterator[Dict[str, Any]]:
+        if self.workers <= 1 or len(files) <= 1:
+            _init_worker(self.cache_dir, None, None, self.idf_dir)
+            for file_path in files:
+                yield _analyze_file(file_path, self.mode, self.incremental)
+            return
+
+        max_in_flight = self.workers * 2
+        remaining = iter(files)
+        with ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker, initargs=(self.cache_dir, self.threads_per_worker, 1, self.idf_dir)) as executor:
+            in_flight = set()
+            for file_path in remaining:
+                in_flight.add(executor.submit(_analyze_file, file_path, self.mode, self.incremental))
+                if len(in_flight) >= max_in_flight:
+                    break
+            while in_flight:
+                finished, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    yield future.result()
+                    next_path = next(remaining, None)
+                    if next_path is not None:
+                        in_flight.add(executor.submit(_analyze_file, next_path, self.mode, self.incremental))
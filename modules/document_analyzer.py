@@ -0,0 +1,189 @@
+import time
+import logging
+from concurrent.futures import as_completed
+from typing import Optional
+from modules.pdf_extractor import PDFExtractor
+from modules.docx_extractor import DOCXExtractor
+from modules.nlp_pipeline import NLPPipeline
+from modules.summarizer import Summarizer
+from modules.keyword_extractor import KeywordExtractor
+from modules.sentiment_analyzer import SentimentAnalyzer
+from modules.risk_detector import RiskDetector
+from modules.execution_engine import ExecutionEngine
+from modules.incremental_analyzer import IncrementalAnalyzer
+from utils.result_cache import ResultCache
+from utils.idf_index import IDFIndex
+from utils.chunk_memo import ChunkMemo
+
+logger = logging.getLogger(__name__)
+
+# Ordered cheapest first: sections are scheduled and rendered in this order
+ANALYSIS_SECTIONS = {
+    'statistics': ["Full Report"],
+    'key_points': ["Key Points", "Full Report"],
+    'risks': ["Risk Analysis", "Full Report"],
+    'sentiment': ["Sentiment", "Full Report"],
+    'summary': ["Summary", "Full Report"]
+}
+
+# torch-backed sections release the GIL and share the model thread budget; regex sections can run in processes
+SECTION_EXECUTORS = {
+    'statistics': "thread",
+    'key_points': "process",
+    'risks': "process",
+    'sentiment': "model",
+    'summary': "model"
+}
+
+class DocumentAnalyzer:
+    def __init__(self, result_cache: Optional[ResultCache] = None, pdf_workers: Optional[int] = None, engine: Optional[ExecutionEngine] = None, idf_index: Optional[IDFIndex] = None, chunk_memo: Optional[ChunkMemo] = None):
+        self.result_cache = result_cache or ResultCache()
+        self.chunk_memo = chunk_memo or ChunkMemo()
+        # Serial page extraction unless the caller grants processes (the app sizes this from the engine budget)
+        self.pdf_workers = pdf_workers or 1
+        self.engine = engine or ExecutionEngine()
+        self.nlp_pipeline = NLPPipeline()
+        self.summarizer = Summarizer(chunk_memo=self.chunk_memo)
+        self.keyword_extractor = KeywordExtractor(idf_index=idf_index)
+        self.sentiment_analyzer = SentimentAnalyzer(chunk_memo=self.chunk_memo)
+        self.risk_detector = RiskDetector()
+        self.incremental = IncrementalAnalyzer(self.result_cache, self.keyword_extractor, self.risk_detector)
+
+    def extract_text(self, file_path, file_type, progress=None, doc_hash=None, document_id=None, owner=""):
+        try:
+            if file_type == "pdf":
+                extractor = PDFExtractor(workers=self.pdf_workers)
+                if document_id is None:
+                    text = extractor.extract_text(file_path, progress)
+                else:
+                    # Incremental mode: paragraphs are pattern-scanned page by page while later pages are still read
+                    previous = self.incremental.previous_version(owner, document_id, doc_hash)
+                    text = self.incremental.prescan(doc_hash, extractor.iter_text(file_path, progress), previous)
+            elif file_type == "docx":
+                extractor = DOCXExtractor()
+                text = extractor.extract_text(file_path)
+            else:
+                return None
+            return text if text and text.strip() else None
+        except Exception as e:
+            logger.error(f"Text extraction failed: {str(e)}")
+            return None
+
+    def analyze_document(self, text, mode, doc_hash=None, progress=None, on_section=None, document_id=None, owner="", previous_text=None):
+        doc_hash = doc_hash or ResultCache.hash_text(text)
+        incremental = document_id is not None
+        version = self.incremental.version(doc_hash, text) if incremental else None
+        previous = self.incremental.previous_version(owner, document_id, doc_hash) if incremental else None
+        start = time.perf_counter()
+        timings = {}
+        completed = {}
+
+        def complete(section, section_results):
+            timings[section] = time.perf_counter() - start
+            completed[section] = section_results
+            if on_section:
+                on_section(section, section_results)
+
+        pending = []
+        for section, modes in ANALYSIS_SECTIONS.items():
+            if mode not in modes:
+                continue
+            cache_key = self.result_cache.make_key(doc_hash, section, self.section_config(section, incremental))
+            section_results = self.result_cache.get(cache_key)
+            if section_results is None:
+                pending.append((section, cache_key))
+            else:
+                complete(section, section_results)
+
+        if pending:
+            context = self.nlp_pipeline.build_context(text)
+            if self.engine.use_processes(len(text)) and any(SECTION_EXECUTORS[section] == "process" for section, _ in pending):
+                context.materialize()
+            futures = {self.submit_section(section, text, context, progress, version, previous): (section, cache_key) for section, cache_key in pending}
+            try:
+                for future in as_completed(futures):
+                    section, cache_key = futures[future]
+                    section_results = future.result()
+                    if isinstance(section_results, tuple):
+                        section_results, paragraph_hits = section_results
+                        self.incremental.store_hits(section, version, paragraph_hits)
+                    self.result_cache.put(cache_key, section_results)
+                    complete(section, section_results)
+                    if section == 'key_points':
+                        # Scored first, counted after, so the document never discounts its own terms
+                        self.keyword_extractor.idf_index.add_document(doc_hash, context.tokens)
+            finally:
+                for future in futures:
+                    future.cancel()
+
+        if timings:
+            logger.info(f"Analysis ({mode}): first section after {min(timings.values()):.2f}s, complete after {max(timings.values()):.2f}s " + ", ".join(f"{section}={seconds:.2f}s" for section, seconds in timings.items()))
+        results = {}
+        for section in ANALYSIS_SECTIONS:
+            results.update(completed.get(section, {}))
+        if incremental:
+            if previous:
+                results['changes'] = self.incremental.change_report(previous, version, text, results, previous_text)
+                if on_section:
+                    on_section('changes', {'changes': results['changes']})
+            self.incremental.save_version(owner, document_id, version, results)
+        return results
+
+    def submit_section(self, section, text, context, progress=None, version=None, previous=None):
+        kind = SECTION_EXECUTORS.get(section, "thread")
+        if version is not None and section in IncrementalAnalyzer.SECTIONS:
+            if previous is None and kind == "process" and self.engine.use_processes(len(text)) and not self.incremental.has_hits(section, version):
+                # A first version scans every paragraph; the worker returns the hits for the next revision to reuse
+                return self.engine.submit(self.incremental.scan_section, section, text, context, version, kind=kind, payload_chars=len(text))
+            # A revision only scans changed paragraphs, which is too little work to ship to a process
+            return self.engine.submit(self.compute_section, section, text, context, progress, version, previous, kind="thread")
+        if kind == "process" and self.engine.use_processes(len(text)):
+            # Bound methods of the stateless regex analyzers pickle cheaply; the context travels without its spaCy doc
+            analyzer = self.keyword_extractor.extract_key_points if section == 'key_points' else self.risk_detector.analyze
+            return self.engine.submit(analyzer, text, context, kind=kind, payload_chars=len(text))
+        return self.engine.submit(self.compute_section, section, text, context, progress, version, kind=kind)
+
+    def compute_section(self, section, text, context=None, progress=None, version=None, previous=None):
+        context = context or self.nlp_pipeline.build_context(text)
+        if version is not None and section in IncrementalAnalyzer.SECTIONS:
+            return self.incremental.compute_section(section, text, context, version, previous)
+        if section == 'summary':
+            paragraphs = self.incremental.paragraphs(text, version) if version is not None else None
+            return {'summary': self.summarizer.summarize(text, context=context, progress=progress, paragraphs=paragraphs)}
+        if section == 'key_points':
+            return self.keyword_extractor.extract_key_points(text, context=context)
+        if section == 'risks':
+            return self.risk_detector.analyze(text, context=context)
+        if section == 'sentiment':
+            return {'sentiment': self.sentiment_analyzer.analyze_sentiment(text, context=context)}
+        if section == 'statistics':
+            return {'statistics': self.nlp_pipeline.get_statistics(text, context=context)}
+        raise ValueError(f"Unknown analysis section: {section}")
+
+    def section_config(self, section, incremental=False):
+        config = self._section_config(section)
+        if incremental and section in ('summary',) + IncrementalAnalyzer.SECTIONS:
+            # Incremental sections scan paragraph by paragraph and chunk summaries on paragraph boundaries
+            config['incremental'] = IncrementalAnalyzer.VERSION
+        return config
+
+    def _section_config(self, section):
+        if section == 'summary':
+            return {
+                'version': Summarizer.VERSION,
+                'model': self.summarizer.model_key,
+                'available': self.summarizer.summarizer is not None,
+                'hierarchical': self.summarizer.hierarchical,
+                'max_model_calls': self.summarizer.max_model_calls
+            }
+        if section == 'key_points':
+            return {'version': KeywordExtractor.VERSION, 'idf_generation': self.keyword_extractor.idf_index.generation}
+        if section == 'risks':
+            return {'version': RiskDetector.VERSION}
+        if section == 'sentiment':
+            if self.sentiment_analyzer.engine == "lexicon":
+                return {'version': SentimentAnalyzer.VERSION, 'engine': "lexicon", 'lexicon': self.sentiment_analyzer.lexicon.lexicon_path}
+            return {'version': SentimentAnalyzer.VERSION, 'model': self.sentiment_analyzer.model_key, 'available': self.sentiment_analyzer.analyzer is not None, 'lexicon': self.sentiment_analyzer.lexicon.lexicon_path}
+        if section == 'statistics':
+            return {'version': NLPPipeline.VERSION, 'model': NLPPipeline.MODEL_KEY, 'available': self.nlp_pipeline.nlp is not None}
+        return {}
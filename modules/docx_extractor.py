@@ -1,9 +1,23 @@
-from docx import Document
+import zipfile
 import logging
-from typing import List, Dict, Any
+from datetime import datetime
+from typing import List, Dict, Any, Iterator, Optional
+from lxml import etree
+from docx.styles import BabelFish
 
 logger = logging.getLogger(__name__)
 
+W_NS = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+W = f"{{{W_NS}}}"
+CORE_PROPERTY_TAGS = {
+    '{http://purl.org/dc/elements/1.1/}title': 'title',
+    '{http://purl.org/dc/elements/1.1/}creator': 'author',
+    '{http://purl.org/dc/terms/}created': 'created',
+    '{http://purl.org/dc/terms/}modified': 'modified',
+    '{http://schemas.openxmlformats.org/package/2006/metadata/core-properties}lastModifiedBy': 'last_modified_by',
+    '{http://schemas.openxmlformats.org/package/2006/metadata/core-properties}revision': 'revision'
+}
+
 class DOCXExtractor:
     def __init__(self):
         pass
@@ -11,34 +25,24 @@ class DOCXExtractor:
     def extract_text(self, file_path: str) -> str:
         """Ekstrak semua teks dari dokumen DOCX"""
         try:
-            doc = Document(file_path)
-            text_list = [p.text for p in doc.paragraphs if p.text.strip()]
+            text_list = [block['text'] for block in self.iter_blocks(file_path) if block['type'] != 'table_row' and block['text'].strip()]
             text = "\n".join(text_list)
-            
+
             if not text:
                 logger.warning(f"No extractable text found in {file_path}")
-            
+
             return text
         except Exception as e:
             logger.error(f"DOCX extraction failed for {file_path}: {str(e)}")
-            return ""  
+            return ""
     
     def extract_metadata(self, file_path: str) -> Dict[str, Any]:
         """Ekstrak metadata dokumen DOCX"""
         metadata = {}
         try:
-            doc = Document(file_path)
-            core_props = doc.core_properties
-            
-            metadata = {
-                'title': core_props.title,
-                'author': core_props.author,
-                'created': core_props.created,
-                'modified': core_props.modified,
-                'last_modified_by': core_props.last_modified_by,
-                'revision': core_props.revision,
-                'paragraph_count': len(doc.paragraphs)
-            }
+            with zipfile.ZipFile(file_path) as package:
+                metadata = self._read_core_properties(package)
+            metadata['paragraph_count'] = sum(1 for block in self.iter_blocks(file_path) if block['type'] != 'table_row')
         except Exception as e:
             logger.error(f"DOCX metadata extraction failed for {file_path}: {str(e)}")
         return metadata
@@ -47,13 +51,12 @@ class DOCXExtractor:
         """Ekstrak semua tabel dari dokumen DOCX"""
         tables = []
         try:
-            doc = Document(file_path)
-            for table in doc.tables:
-                table_data = []
-                for row in table.rows:
-                    row_data = [cell.text.strip() for cell in row.cells]
-                    table_data.append(row_data)
-                tables.append(table_data)
+            for block in self.iter_blocks(file_path):
+                if block['type'] != 'table_row':
+                    continue
+                if block['table_index'] >= len(tables):
+                    tables.append([])
+                tables[block['table_index']].append(block['cells'])
         except Exception as e:
             logger.error(f"DOCX table extraction failed for {file_path}: {str(e)}")
         return tables
@@ -62,13 +65,178 @@ class DOCXExtractor:
         """Ekstrak struktur dokumen: headings dan list"""
         structure = {'headings': [], 'lists': []}
         try:
-            doc = Document(file_path)
-            for paragraph in doc.paragraphs:
-                style_name = paragraph.style.name
-                if style_name.startswith('Heading') and paragraph.text.strip():
-                    structure['headings'].append(paragraph.text)
-                elif style_name == 'List Paragraph' and paragraph.text.strip():
-                    structure['lists'].append(paragraph.text)
+            for block in self.iter_blocks(file_path):
+                if block['type'] == 'heading' and block['text'].strip():
+                    structure['headings'].append(block['text'])
+                elif block['type'] == 'list_item' and block['style'] == 'List Paragraph' and block['text'].strip():
+                    structure['lists'].append(block['text'])
         except Exception as e:
             logger.error(f"DOCX structure extraction failed for {file_path}: {str(e)}")
         return structure
+    
+    def ingest(self, file_path: str) -> Dict[str, Any]:
+        """Baca DOCX sekali jalan: teks, paragraf, struktur, tabel, dan metadata"""
+        result = {'text': "", 'paragraphs': [], 'headings': [], 'lists': [], 'tables': [], 'metadata': {}}
+        try:
+            with zipfile.ZipFile(file_path) as package:
+                result['metadata'] = self._read_core_properties(package)
+                paragraph_count = 0
+                for block in self._iter_package_blocks(package):
+                    if block['type'] == 'table_row':
+                        if block['table_index'] >= len(result['tables']):
+                            result['tables'].append([])
+                        result['tables'][block['table_index']].append(block['cells'])
+                        continue
+                    paragraph_count += 1
+                    if not block['text'].strip():
+                        continue
+                    result['paragraphs'].append(block)
+                    if block['type'] == 'heading':
+                        result['headings'].append(block['text'])
+                    elif block['style'] == 'List Paragraph':
+                        result['lists'].append(block['text'])
+            result['metadata']['paragraph_count'] = paragraph_count
+            result['text'] = "\n".join(block['text'] for block in result['paragraphs'])
+        except Exception as e:
+            logger.error(f"DOCX ingestion failed for {file_path}: {str(e)}")
+        return result
+    
+    def iter_blocks(self, file_path: str) -> Iterator[Dict[str, Any]]:
+        """Alirkan paragraf, heading, list, dan baris tabel sesuai urutan dokumen"""
+        with zipfile.ZipFile(file_path) as package:
+            yield from self._iter_package_blocks(package)
+    
+    def _iter_package_blocks(self, package: zipfile.ZipFile) -> Iterator[Dict[str, Any]]:
+        style_names = self._read_style_names(package)
+        body_tag = W + 'body'
+        table_depth = 0
+        table_index = 0
+        row_index = 0
+        paragraph_index = 0
+        cells_above = {}
+
+        with package.open('word/document.xml') as stream:
+            for event, elem in etree.iterparse(stream, events=('start', 'end'), tag=(W + 'p', W + 'tbl', W + 'tr')):
+                if elem.tag == W + 'tbl':
+                    if event == 'start':
+                        table_depth += 1
+                        if table_depth == 1:
+                            row_index = 0
+                            cells_above = {}
+                        continue
+                    table_depth -= 1
+                    if table_depth == 0:
+                        table_index += 1
+                        self._release(elem)
+                elif event == 'start':
+                    continue
+                elif elem.tag == W + 'tr' and table_depth == 1:
+                    yield {'type': 'table_row', 'table_index': table_index, 'row_index': row_index, 'cells': self._row_cells(elem, cells_above)}
+                    row_index += 1
+                    self._release(elem)
+                elif elem.tag == W + 'p' and elem.getparent() is not None and elem.getparent().tag == body_tag:
+                    yield self._paragraph_block(elem, style_names, paragraph_index)
+                    paragraph_index += 1
+                    self._release(elem)
+    
+    def _paragraph_block(self, paragraph, style_names: Dict[str, str], index: int) -> Dict[str, Any]:
+        style_element = paragraph.find(f'{W}pPr/{W}pStyle')
+        style_id = style_element.get(W + 'val') if style_element is not None else None
+        style = style_names.get(style_id, style_names.get(None, 'Normal'))
+
+        if style.startswith('Heading'):
+            block_type = 'heading'
+        elif style == 'List Paragraph' or paragraph.find(f'{W}pPr/{W}numPr') is not None:
+            block_type = 'list_item'
+        else:
+            block_type = 'paragraph'
+        return {'type': block_type, 'text': self._paragraph_text(paragraph), 'style': style, 'index': index}
+    
+    def _paragraph_text(self, paragraph) -> str:
+        parts = []
+        for child in paragraph:
+            if child.tag == W + 'r':
+                runs = (child,)
+            elif child.tag == W + 'hyperlink':
+                runs = child.iterchildren(W + 'r')
+            else:
+                continue
+            for run in runs:
+                for item in run:
+                    tag = item.tag
+                    if tag == W + 't':
+                        parts.append(item.text or "")
+                    elif tag in (W + 'tab', W + 'ptab'):
+                        parts.append("\t")
+                    elif tag == W + 'cr':
+                        parts.append("\n")
+                    elif tag == W + 'br':
+                        parts.append("\n" if item.get(W + 'type', 'textWrapping') == 'textWrapping' else "")
+                    elif tag == W + 'noBreakHyphen':
+                        parts.append("-")
+        return "".join(parts)
+    
+    def _row_cells(self, row, cells_above: Dict[int, str]) -> List[str]:
+        cells = []
+        grid_before = row.find(f'{W}trPr/{W}gridBefore')
+        grid_offset = int(grid_before.get(W + 'val', 0)) if grid_before is not None else 0
+
+        for cell in row.iterchildren(W + 'tc'):
+            span_element = cell.find(f'{W}tcPr/{W}gridSpan')
+            span = int(span_element.get(W + 'val', 1)) if span_element is not None else 1
+            merge_element = cell.find(f'{W}tcPr/{W}vMerge')
+
+            if merge_element is not None and merge_element.get(W + 'val', 'continue') == 'continue':
+                text = cells_above.get(grid_offset, "")
+            else:
+                text = "\n".join(self._paragraph_text(paragraph) for paragraph in cell.iterchildren(W + 'p')).strip()
+
+            for offset in range(grid_offset, grid_offset + span):
+                cells_above[offset] = text
+            cells.extend([text] * span)
+            grid_offset += span
+        return cells
+    
+    def _read_style_names(self, package: zipfile.ZipFile) -> Dict[Optional[str], str]:
+        style_names = {}
+        try:
+            root = etree.fromstring(package.read('word/styles.xml'))
+        except KeyError:
+            return style_names
+        for style in root.iterchildren(W + 'style'):
+            name_element = style.find(W + 'name')
+            if name_element is None:
+                continue
+            name = BabelFish.internal2ui(name_element.get(W + 'val', ''))
+            style_names[style.get(W + 'styleId')] = name
+            if style.get(W + 'type') == 'paragraph' and style.get(W + 'default') in ('1', 'true', 'on'):
+                style_names[None] = name
+        return style_names
+    
+    def _read_core_properties(self, package: zipfile.ZipFile) -> Dict[str, Any]:
+        metadata = {'title': "", 'author': "", 'created': None, 'modified': None, 'last_modified_by': "", 'revision': 0}
+        try:
+            root = etree.fromstring(package.read('docProps/core.xml'))
+        except KeyError:
+            return metadata
+        for element in root:
+            key = CORE_PROPERTY_TAGS.get(element.tag)
+            if key is None or element.text is None:
+                continue
+            value = element.text.strip()
+            if key in ('created', 'modified'):
+                try:
+                    value = datetime.fromisoformat(value.replace('Z', '+00:00'))
+                except ValueError:
+                    pass
+            elif key == 'revision':
+                value = int(value) if value.isdigit() else value
+            metadata[key] = value
+        return metadata
+    
+    def _release(self, elem):
+        elem.clear()
+        parent = elem.getparent()
+        if parent is not None:
+            while elem.getprevious() is not None:
+                del parent[0]
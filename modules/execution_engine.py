@@ -0,0 +1,64 @@
+import os
+import logging
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+EXECUTOR_KINDS = ("thread", "model", "process")
+
+class ExecutionEngine:
+    def __init__(self, budget: Optional[int] = None, process_workers: Optional[int] = None, thread_workers: int = 8, min_process_chars: int = 200_000, concurrent_models: int = 2):
+        self.budget = max(1, budget or int(os.environ.get("CDA_PARALLELISM", 0)) or os.cpu_count() or 1)
+        if process_workers is None:
+            process_workers = min(2, self.budget - 1)
+        self.process_workers = max(0, min(process_workers, self.budget - 1))
+        self.model_threads = max(1, self.budget - self.process_workers)
+        # The torch thread pool is process-wide, so it is sized once here for every model that may run at the same
+        # time (summary and sentiment within a job, times concurrent jobs) instead of being reset per analysis
+        self.inference_threads = max(1, self.model_threads // max(1, concurrent_models))
+        self.thread_workers = thread_workers
+        self.min_process_chars = min_process_chars
+        self._thread_pool = None
+        self._process_pool = None
+        self._lock = threading.Lock()
+        self._configure_inference_threads()
+
+    def use_processes(self, payload_chars: int) -> bool:
+        return self.process_workers > 0 and payload_chars >= self.min_process_chars
+
+    def submit(self, func: Callable, *args, kind: str = "thread", payload_chars: int = 0, **kwargs) -> Future:
+        if kind not in EXECUTOR_KINDS:
+            raise ValueError(f"Unknown executor kind '{kind}', expected one of {', '.join(EXECUTOR_KINDS)}")
+        if kind == "process" and self.use_processes(payload_chars):
+            return self._processes().submit(func, *args, **kwargs)
+        return self._threads().submit(func, *args, **kwargs)
+
+    def _configure_inference_threads(self):
+        try:
+            import torch
+            if torch.get_num_threads() != self.inference_threads:
+                torch.set_num_threads(self.inference_threads)
+        except Exception as e:
+            logger.debug(f"Could not set inference thread count: {str(e)}")
+
+    def shutdown(self, wait: bool = True):
+        with self._lock:
+            pools, self._thread_pool, self._process_pool = (self._thread_pool, self._process_pool), None, None
+        for pool in pools:
+            if pool is not None:
+                pool.shutdown(wait=wait, cancel_futures=True)
+
+    def _threads(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._thread_pool is None:
+                self._thread_pool = ThreadPoolExecutor(max_workers=self.thread_workers, thread_name_prefix="analysis")
+            return self._thread_pool
+
+    def _processes(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._process_pool is None:
+                logger.info(f"Starting {self.process_workers} analysis processes (parallelism budget {self.budget})")
+                self._process_pool = ProcessPoolExecutor(max_workers=self.process_workers)
+            return self._process_pool
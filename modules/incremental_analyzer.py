@@ -0,0 +1,296 @@
+import bisect
+import difflib
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+import logging
+from modules.analysis_context import AnalysisContext
+from modules.keyword_extractor import KeywordExtractor, SENTENCE_END
+from modules.risk_detector import RiskDetector
+from utils.result_cache import ResultCache
+
+logger = logging.getLogger(__name__)
+
+PARAGRAPH_END = '.!?'
+REPORTED_ITEMS = ('risks', 'opportunities', 'action_items', 'decisions')
+
+# Revisions of one document (same owner and file name in the app, same path in batch runs) are diffed paragraph by
+# paragraph. Pattern hits are stored per paragraph with paragraph-relative offsets, so unchanged paragraphs reuse the
+# hits of the previous version and only inserted or edited paragraphs are scanned again. The version record lives in
+# the shared result cache and holds only fingerprints and item hashes, and stored hits keep offsets but no text
+class IncrementalAnalyzer:
+    VERSION = "1.3"
+    SECTIONS = ('key_points', 'risks')
+
+    def __init__(self, result_cache: ResultCache, keyword_extractor: KeywordExtractor, risk_detector: RiskDetector):
+        self.result_cache = result_cache
+        self.keyword_extractor = keyword_extractor
+        self.risk_detector = risk_detector
+
+    def segment(self, text: str) -> List[Tuple[int, int]]:
+        return [(start, end) for start, end, _ in self.iter_paragraphs([text])]
+
+    def iter_paragraphs(self, pieces: Iterable[str]) -> Iterator[Tuple[int, int, str]]:
+        # Extractors emit one line per DOCX paragraph or PDF text line. A paragraph only closes at a line ending a
+        # sentence: every pattern runs up to the next terminator, so a match that would cross a blank line (a heading,
+        # a table row) stays inside one paragraph and scanning paragraphs finds exactly what a whole-text scan finds.
+        # The text may arrive in pieces (PDF pages); each paragraph is yielded as soon as its closing line is read
+        start = end = None
+        lines = []
+        lines_offset = offset = 0
+        partial = ""
+
+        def close():
+            paragraph = "\n".join(lines)[start - lines_offset:end - lines_offset]
+            return start, end, paragraph
+
+        for piece in pieces:
+            piece_lines = piece.split('\n')
+            piece_lines[0] = partial + piece_lines[0]
+            partial = piece_lines.pop()
+            for line in piece_lines:
+                content = line.strip()
+                if content:
+                    if start is None:
+                        start = offset + len(line) - len(line.lstrip())
+                        lines, lines_offset = [], offset
+                    end = offset + len(line.rstrip())
+                if start is not None:
+                    lines.append(line)
+                    if content and content[-1] in PARAGRAPH_END:
+                        yield close()
+                        start = None
+                offset += len(line) + 1
+        if partial.strip():
+            if start is None:
+                start = offset + len(partial) - len(partial.lstrip())
+                lines, lines_offset = [], offset
+            end = offset + len(partial.rstrip())
+            lines.append(partial)
+        if start is not None:
+            yield close()
+
+    def version(self, doc_hash: str, text: str) -> Dict[str, Any]:
+        spans = self.segment(text)
+        return {
+            'doc_hash': doc_hash,
+            'spans': spans,
+            'fingerprints': [self.fingerprint(text[start:end]) for start, end in spans]
+        }
+
+    def fingerprint(self, paragraph: str) -> str:
+        # Raw text, not normalised: reused hits are paragraph-relative offsets, which only fit an identical paragraph
+        return ResultCache.hash_text(paragraph)[:16]
+
+    @staticmethod
+    def normalize(paragraph: str) -> str:
+        return ' '.join(paragraph.split())
+
+    def paragraphs(self, text: str, version: Dict[str, Any]) -> List[str]:
+        return [self.normalize(text[start:end]) for start, end in version['spans']]
+
+    def previous_version(self, owner: str, document_id: str, doc_hash: str) -> Optional[Dict[str, Any]]:
+        record = self.result_cache.get(self._record_key(owner, document_id))
+        if not record:
+            return None
+        if record['current']['doc_hash'] == doc_hash:
+            return record.get('previous')
+        return record['current']
+
+    def save_version(self, owner: str, document_id: str, version: Dict[str, Any], results: Dict[str, Any]):
+        # Keeps the last two versions; item hashes let the next revision say what appeared or went away
+        key = self._record_key(owner, document_id)
+        record = self.result_cache.get(key) or {}
+        current = record.get('current')
+        items = {name: [self._item_hash(item) for item in results[name]] for name in REPORTED_ITEMS if name in results}
+        if current and current['doc_hash'] == version['doc_hash']:
+            if all(current.get('items', {}).get(name) == value for name, value in items.items()):
+                return
+            current['items'] = dict(current.get('items', {}), **items)
+            record = {'current': current, 'previous': record.get('previous')}
+        else:
+            record = {'current': {'doc_hash': version['doc_hash'], 'fingerprints': version['fingerprints'], 'items': items}, 'previous': current}
+        self.result_cache.put(key, record)
+
+    def __getstate__(self):
+        # Shipped to a worker process for first versions; hits are stored by the parent
+        state = self.__dict__.copy()
+        state['result_cache'] = None
+        return state
+
+    def compute_section(self, section: str, text: str, context: AnalysisContext, version: Dict[str, Any], previous: Optional[Dict[str, Any]] = None) -> Dict[str, list]:
+        return self.merge(section, text, context, version, self.paragraph_hits(section, text, version, previous))
+
+    def scan_section(self, section: str, text: str, context: AnalysisContext, version: Dict[str, Any]) -> Tuple[Dict[str, list], List[List[Dict[str, Any]]]]:
+        hits = [self._scan(section, text[start:end]) for start, end in version['spans']]
+        return self.merge(section, text, context, version, hits), hits
+
+    def store_hits(self, section: str, version: Dict[str, Any], hits: List[List[Dict[str, Any]]]):
+        # Offsets, categories and scores only: merge() cuts the matched text back out of the document
+        stored = [[{key: value for key, value in hit.items() if key != 'text'} for hit in paragraph] for paragraph in hits]
+        self.result_cache.put(self._hits_key(version['doc_hash'], section), stored)
+
+    def merge(self, section: str, text: str, context: AnalysisContext, version: Dict[str, Any], paragraph_hits: List[List[Dict[str, Any]]]) -> Dict[str, list]:
+        hits = []
+        for (start, _), hits_in_paragraph in zip(version['spans'], paragraph_hits):
+            hits.extend(dict(hit, start=hit['start'] + start, end=hit['end'] + start, text=text[hit['start'] + start:hit['end'] + start]) for hit in hits_in_paragraph)
+
+        if section == 'risks':
+            spans = context.sentence_spans
+            starts = [start for start, _ in spans]
+            for hit in hits:
+                index = bisect.bisect_right(starts, hit['start']) - 1
+                hit['sentence_index'] = index if index >= 0 and hit['start'] < spans[index][1] else None
+            return self.risk_detector.analyze_hits(hits)
+
+        # Same numbering as a whole-text scan: the sentence is the next terminator at or after the match
+        ends = [match.start() for match in SENTENCE_END.finditer(text)]
+        seen = set()
+        matches = []
+        for hit in hits:
+            if (hit['category'], hit['text']) in seen:
+                continue
+            seen.add((hit['category'], hit['text']))
+            hit['sentence_index'] = bisect.bisect_left(ends, hit['start'])
+            matches.append(hit)
+        return self.keyword_extractor.extract_key_points(text, context=context, matches=matches)
+
+    def paragraph_hits(self, section: str, text: str, version: Dict[str, Any], previous: Optional[Dict[str, Any]] = None) -> List[List[Dict[str, Any]]]:
+        key = self._hits_key(version['doc_hash'], section)
+        hits = self.result_cache.get(key)
+        if hits is not None and len(hits) == len(version['spans']):
+            return hits
+
+        reused = {}
+        if previous:
+            previous_hits = self.result_cache.get(self._hits_key(previous['doc_hash'], section))
+            if previous_hits is not None and len(previous_hits) == len(previous['fingerprints']):
+                for tag, i1, i2, j1, _ in self._opcodes(previous, version):
+                    if tag == 'equal':
+                        reused.update((j1 + k, previous_hits[i1 + k]) for k in range(i2 - i1))
+
+        hits = [reused[i] if i in reused else self._scan(section, text[start:end]) for i, (start, end) in enumerate(version['spans'])]
+        if previous:
+            logger.info(f"Incremental {section}: scanned {len(hits) - len(reused)} of {len(hits)} paragraphs")
+        self.store_hits(section, version, hits)
+        return hits
+
+    def prescan(self, doc_hash: str, pieces: Iterable[str], previous: Optional[Dict[str, Any]] = None) -> str:
+        # Runs while the extractor is still reading pages: paragraphs are scanned as they close, so by the time the
+        # whole text exists the pattern sections only merge stored hits. Paragraphs the previous version already had
+        # keep its hits. Returns the joined text
+        sections = [section for section in self.SECTIONS if self.result_cache.get(self._hits_key(doc_hash, section)) is None]
+        reusable = {section: self._hits_by_fingerprint(section, previous) for section in sections}
+        texts = []
+
+        def read():
+            for piece in pieces:
+                texts.append(piece)
+                yield piece
+
+        version = {'doc_hash': doc_hash, 'spans': [], 'fingerprints': []}
+        hits = {section: [] for section in sections}
+        scanned = 0
+        for start, end, paragraph in self.iter_paragraphs(read()):
+            fingerprint = self.fingerprint(paragraph)
+            version['spans'].append((start, end))
+            version['fingerprints'].append(fingerprint)
+            for section in sections:
+                reused = reusable[section].get(fingerprint)
+                if reused is None:
+                    reused = self._scan(section, paragraph)
+                    scanned += 1
+                hits[section].append(reused)
+        for section in sections:
+            self.store_hits(section, version, hits[section])
+        if sections:
+            logger.info(f"Prescan: scanned {scanned} paragraph sections of {len(version['spans'])} paragraphs while extracting")
+        return "".join(texts)
+
+    def has_hits(self, section: str, version: Dict[str, Any]) -> bool:
+        hits = self.result_cache.get(self._hits_key(version['doc_hash'], section))
+        return hits is not None and len(hits) == len(version['spans'])
+
+    def _hits_by_fingerprint(self, section: str, previous: Optional[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
+        if not previous:
+            return {}
+        previous_hits = self.result_cache.get(self._hits_key(previous['doc_hash'], section))
+        if previous_hits is None or len(previous_hits) != len(previous['fingerprints']):
+            return {}
+        return dict(zip(previous['fingerprints'], previous_hits))
+
+    def change_report(self, previous: Dict[str, Any], version: Dict[str, Any], text: str, results: Optional[Dict[str, Any]] = None, previous_text: Optional[str] = None) -> Dict[str, Any]:
+        # Old paragraph text is only shown when the caller still holds the previous version itself
+        old_paragraphs = []
+        if previous_text is not None:
+            old_version = self.version(previous['doc_hash'], previous_text)
+            if old_version['fingerprints'] == previous['fingerprints']:
+                old_paragraphs = self.paragraphs(previous_text, old_version)
+        new_paragraphs = self.paragraphs(text, version)
+        counts = {'added': 0, 'removed': 0, 'modified': 0, 'unchanged': 0}
+        changes = []
+
+        def change(kind, old_index, new_index):
+            counts[kind] += 1
+            changes.append({
+                'type': kind,
+                'old_index': old_index,
+                'new_index': new_index,
+                'old_text': old_paragraphs[old_index] if old_index is not None and old_index < len(old_paragraphs) else None,
+                'new_text': new_paragraphs[new_index] if new_index is not None else None
+            })
+
+        for tag, i1, i2, j1, j2 in self._opcodes(previous, version):
+            if tag == 'equal':
+                counts['unchanged'] += i2 - i1
+                continue
+            # A replaced block pairs old and new paragraphs in order; any surplus was removed or added
+            paired = min(i2 - i1, j2 - j1)
+            for k in range(paired):
+                change('modified', i1 + k, j1 + k)
+            for k in range(i1 + paired, i2):
+                change('removed', k, None)
+            for k in range(j1 + paired, j2):
+                change('added', None, k)
+
+        report = {'previous_doc_hash': previous['doc_hash'], 'paragraphs': counts, 'changes': changes}
+        previous_items = previous.get('items', {})
+        candidates = self._old_item_texts(old_paragraphs, changes)
+        for name in REPORTED_ITEMS:
+            if results and name in previous_items and name in results:
+                old_hashes = set(previous_items[name])
+                new_hashes = set(self._item_hash(item) for item in results[name])
+                removed = [item_hash for item_hash in previous_items[name] if item_hash not in new_hashes]
+                report[f"{name}_added"] = [item for item in results[name] if self._item_hash(item) not in old_hashes]
+                report[f"{name}_removed_count"] = len(removed)
+                report[f"{name}_removed"] = [candidates[item_hash] for item_hash in removed if item_hash in candidates]
+        return report
+
+    def _old_item_texts(self, old_paragraphs: List[str], changes: List[Dict[str, Any]]) -> Dict[str, str]:
+        # Removed items come from old paragraphs that changed, so rescanning just those recovers their text
+        texts = {}
+        for change in changes:
+            if change['old_text'] is None:
+                continue
+            for section in self.SECTIONS:
+                for hit in self._scan(section, change['old_text']):
+                    item = hit['text'].strip()
+                    texts.setdefault(self._item_hash(item), item)
+        return texts
+
+    def _item_hash(self, item: str) -> str:
+        return ResultCache.hash_text(item)[:16]
+
+    def _scan(self, section: str, paragraph: str) -> List[Dict[str, Any]]:
+        if section == 'risks':
+            return self.risk_detector.scan(paragraph)
+        return self.keyword_extractor.scan(paragraph)
+
+    def _opcodes(self, previous: Dict[str, Any], version: Dict[str, Any]):
+        # autojunk would treat boilerplate paragraphs repeated across the document as noise
+        return difflib.SequenceMatcher(None, previous['fingerprints'], version['fingerprints'], autojunk=False).get_opcodes()
+
+    def _record_key(self, owner: str, document_id: str) -> str:
+        return self.result_cache.make_key(ResultCache.hash_text(f"{owner}\n{document_id}"), "versions", {'version': self.VERSION})
+
+    def _hits_key(self, doc_hash: str, section: str) -> str:
+        analyzer_version = RiskDetector.VERSION if section == 'risks' else KeywordExtractor.VERSION
+        return self.result_cache.make_key(doc_hash, "paragraph_hits", {'section': section, 'version': analyzer_version, 'incremental': self.VERSION})
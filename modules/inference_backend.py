@@ -0,0 +1,66 @@
+import os
+from typing import Optional
+import logging
+from transformers import pipeline, AutoTokenizer
+
+logger = logging.getLogger(__name__)
+
+BACKENDS = ("torch", "quantized", "onnx")
+
+class InferenceBackend:
+    def __init__(self, name: Optional[str] = None, model_dir: Optional[str] = None):
+        self.name = (name or os.environ.get("CDA_INFERENCE_BACKEND", "torch")).lower()
+        if self.name not in BACKENDS:
+            raise ValueError(f"Unknown inference backend '{self.name}', expected one of {', '.join(BACKENDS)}")
+        self.model_dir = model_dir or os.environ.get("CDA_MODEL_DIR")
+
+    @property
+    def offline(self) -> bool:
+        return bool(self.model_dir) or os.environ.get("HF_HUB_OFFLINE") == "1"
+
+    def resolve_model(self, model_name: str) -> str:
+        if not self.model_dir:
+            return model_name
+        for candidate in (model_name.replace('/', '--'), model_name.split('/')[-1]):
+            path = os.path.join(self.model_dir, candidate)
+            if os.path.isdir(path):
+                return path
+        logger.warning(f"{model_name} not found in {self.model_dir}, falling back to the local Hugging Face cache")
+        return model_name
+
+    def load_pipeline(self, task: str, model_name: str):
+        if self.name == "onnx":
+            return self._load_onnx_pipeline(task, model_name)
+
+        model_path = self.resolve_model(model_name)
+        tokenizer = AutoTokenizer.from_pretrained(model_path, local_files_only=self.offline)
+        loaded = pipeline(task, model=model_path, tokenizer=tokenizer, device=-1, model_kwargs={'local_files_only': self.offline})
+        if self.name == "quantized":
+            import torch
+            loaded.model = torch.quantization.quantize_dynamic(loaded.model, {torch.nn.Linear}, dtype=torch.qint8)
+        logger.info(f"Loaded {model_name} with {self.name} backend")
+        return loaded
+
+    def _load_onnx_pipeline(self, task: str, model_name: str):
+        from optimum.onnxruntime import ORTModelForSeq2SeqLM, ORTModelForSequenceClassification
+
+        model_class = ORTModelForSeq2SeqLM if task == "summarization" else ORTModelForSequenceClassification
+        model_path = self.resolve_model(model_name)
+        onnx_path = self._onnx_export_path(model_name)
+
+        if os.path.isdir(onnx_path):
+            model = model_class.from_pretrained(onnx_path, local_files_only=True)
+            tokenizer = AutoTokenizer.from_pretrained(onnx_path, local_files_only=True)
+        else:
+            logger.info(f"Exporting {model_name} to ONNX at {onnx_path}")
+            model = model_class.from_pretrained(model_path, export=True, local_files_only=self.offline)
+            tokenizer = AutoTokenizer.from_pretrained(model_path, local_files_only=self.offline)
+            model.save_pretrained(onnx_path)
+            tokenizer.save_pretrained(onnx_path)
+
+        logger.info(f"Loaded {model_name} with onnx backend")
+        return pipeline(task, model=model, tokenizer=tokenizer)
+
+    def _onnx_export_path(self, model_name: str) -> str:
+        base_dir = self.model_dir or os.path.join(os.path.expanduser("~"), ".cache", "corporate_docs")
+        return os.path.join(base_dir, "onnx", model_name.replace('/', '--'))
@@ -0,0 +1,179 @@
+import os
+import time
+import uuid
+import queue
+import threading
+import logging
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+JOB_STATES = ("queued", "running", "completed", "failed", "cancelled")
+
+class JobCancelled(BaseException):
+    # BaseException so analyzer fallbacks that catch Exception do not swallow a cancellation
+    pass
+
+class QueueFull(Exception):
+    pass
+
+class Job:
+    def __init__(self, func: Callable, args: tuple, kwargs: dict, description: str = ""):
+        self.job_id = uuid.uuid4().hex[:12]
+        self.description = description
+        self.status = "queued"
+        self.progress = OrderedDict()
+        self.sections = OrderedDict()
+        self.section_times = OrderedDict()
+        self.result = None
+        self.error = None
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self._func = func
+        self._args = args
+        self._kwargs = kwargs
+        self._cancel_event = threading.Event()
+        self._lock = threading.Lock()
+
+    @property
+    def cancel_requested(self) -> bool:
+        return self._cancel_event.is_set()
+
+    @property
+    def done(self) -> bool:
+        return self.status in ("completed", "failed", "cancelled")
+
+    @property
+    def elapsed(self) -> float:
+        if self.started_at is None:
+            return 0.0
+        return (self.finished_at or time.time()) - self.started_at
+
+    def cancel(self):
+        self._cancel_event.set()
+
+    def check_cancelled(self):
+        if self._cancel_event.is_set():
+            raise JobCancelled(self.job_id)
+
+    def report(self, stage: str, done: int, total: Optional[int] = None):
+        with self._lock:
+            self.progress[stage] = (done, total)
+        self.check_cancelled()
+
+    def publish(self, section: str, values: Dict[str, Any]):
+        with self._lock:
+            self.sections[section] = values
+            self.section_times[section] = round(self.elapsed, 3)
+        self.check_cancelled()
+
+    def results(self) -> Dict[str, Any]:
+        merged = {}
+        with self._lock:
+            for values in self.sections.values():
+                merged.update(values)
+        return merged
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'job_id': self.job_id,
+                'description': self.description,
+                'status': self.status,
+                'progress': dict(self.progress),
+                'sections': list(self.sections),
+                'section_times': dict(self.section_times),
+                'first_section_seconds': min(self.section_times.values()) if self.section_times else None,
+                'error': self.error,
+                'elapsed': round(self.elapsed, 3)
+            }
+
+    def _run(self):
+        if self.cancel_requested:
+            self._finish("cancelled")
+            return
+        self.status = "running"
+        self.started_at = time.time()
+        try:
+            self.result = self._func(self, *self._args, **self._kwargs)
+            self._finish("completed")
+        except JobCancelled:
+            logger.info(f"Job {self.job_id} cancelled")
+            self._finish("cancelled")
+        except Exception as e:
+            logger.error(f"Job {self.job_id} failed: {str(e)}")
+            self.error = str(e)
+            self._finish("failed")
+
+    def _finish(self, status: str):
+        self.finished_at = time.time()
+        self.status = status
+        if self.section_times:
+            logger.info(f"Job {self.job_id} {status}: first section after {min(self.section_times.values()):.2f}s, complete after {self.elapsed:.2f}s")
+        self._func = self._args = self._kwargs = None
+
+class JobQueue:
+    def __init__(self, workers: Optional[int] = None, max_pending: int = 8, max_finished: int = 64):
+        self.workers = workers or int(os.environ.get("CDA_JOB_WORKERS", 1))
+        self.max_finished = max_finished
+        self._pending = queue.Queue(maxsize=max_pending)
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+        self._threads = []
+        for index in range(self.workers):
+            thread = threading.Thread(target=self._worker, name=f"analysis-worker-{index}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def submit(self, func: Callable, *args, description: str = "", **kwargs) -> str:
+        job = Job(func, args, kwargs, description)
+        try:
+            self._pending.put_nowait(job)
+        except queue.Full:
+            raise QueueFull(f"Analysis queue is full ({self._pending.maxsize} jobs waiting)")
+        with self._lock:
+            self._jobs[job.job_id] = job
+            self._evict_finished()
+        logger.info(f"Job {job.job_id} queued: {description}")
+        return job.job_id
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def cancel(self, job_id: str) -> bool:
+        job = self.get(job_id)
+        if job is None or job.done:
+            return False
+        job.cancel()
+        return True
+
+    def pending_count(self) -> int:
+        return self._pending.qsize()
+
+    def active_jobs(self) -> List[Job]:
+        with self._lock:
+            return [job for job in self._jobs.values() if not job.done]
+
+    def shutdown(self, cancel_pending: bool = True):
+        if cancel_pending:
+            for job in self.active_jobs():
+                job.cancel()
+        for _ in self._threads:
+            self._pending.put(None)
+        for thread in self._threads:
+            thread.join()
+
+    def _worker(self):
+        while True:
+            job = self._pending.get()
+            if job is None:
+                return
+            job._run()
+
+    def _evict_finished(self):
+        finished = [job_id for job_id, job in self._jobs.items() if job.done]
+        for job_id in finished[:max(0, len(finished) - self.max_finished)]:
+            del self._jobs[job_id]
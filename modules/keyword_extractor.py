@@ -1,65 +1,223 @@
 import re
-from typing import List
+from typing import Any, Dict, List, Optional, Tuple
 import logging
+import numpy as np
+from modules.analysis_context import AnalysisContext
+from utils.idf_index import IDFIndex
+from utils.text_utils import lower_preserving_offsets
 
 logger = logging.getLogger(__name__)
 
+ACTION_VERBS = ['implement', 'complete', 'finish', 'submit', 'review', 'approve', 'prepare', 'send', 'check', 'verify']
+REQUEST_VERBS = ['prepare', 'send', 'check', 'verify']
+
+# Only the trigger prefix is a regex; the "[^.!?]*[.!?]" tail of the original patterns is resolved
+# against precomputed punctuation and verb positions so no pattern can backtrack across a sentence
+KEY_POINT_PATTERNS = {
+    'action_item': [
+        (r'(?:need to|must|should|will)\s+', ACTION_VERBS),
+        (r'(?:action item|todo|task):?\s*', None),
+        (r'(?:please|kindly)\s+', REQUEST_VERBS),
+        (r'(?:ensure|make sure)\s+', None),
+        (r'(?:required to|expected to)\s+', None)
+    ],
+    'decision': [
+        (r'(?:decided|agreed|concluded|resolved)\s+', None),
+        (r'(?:decision|resolution):?\s*', None),
+        (r'(?:it was|we have)\s+(?:decided|agreed)\s+', None),
+        (r'(?:the board|committee|team)\s+(?:approved|rejected)\s+', None),
+        (r'(?:conclusion|agreement)\s+', None)
+    ]
+}
+
+TRIGGER_GROUP = re.compile(r'^\(\?:([^)]*)\)')
+SENTENCE_END = re.compile(r'[.!?]')
+PHRASE_BREAK = re.compile(r'[^\w\s]')
+
+STOP_WORDS = frozenset('''
+    about above across after again against also although among another any anyone anything are around
+    because been before being below between both but can cannot could did does doing done down during
+    each either else enough etc even ever every few for from further had has have having her here hers
+    herself him himself his how however into its itself just least less like made make many may might
+    more most much must near neither nevertheless next nor not now off often once one only onto other
+    others otherwise our ours ourselves out over own per perhaps please put quite rather really same
+    see seem seemed seems several shall she should since some something still such than that the their
+    theirs them themselves then there thereby therefore these they this those though through thus too
+    toward towards under unless until upon use used using very via was were what whatever when whenever
+    where whereas whether which while who whom whose why will with within without would yet you your
+    yours yourself yourselves all and get got let new say says said two three first second
+'''.split())
+
 class KeywordExtractor:
-    def __init__(self):
-        pass
+    VERSION = "1.4"
+    MIN_MATCH_LENGTH = 10
+    MAX_PHRASE_WORDS = 3
+    MIN_PHRASE_COUNT = 2
+
+    def __init__(self, idf_index: Optional[IDFIndex] = None):
+        self.idf_index = idf_index or IDFIndex()
+        self.patterns = {}
+        for category, patterns in KEY_POINT_PATTERNS.items():
+            for pattern, verbs in patterns:
+                prefix = re.compile(pattern)
+                verbs = tuple(verbs) if verbs else None
+                for trigger in TRIGGER_GROUP.match(pattern).group(1).split('|'):
+                    self.patterns.setdefault(trigger, []).append((category, prefix, verbs))
+        # Longest first so a trigger that prefixes another never shadows it at the same position
+        triggers = sorted(self.patterns, key=len, reverse=True)
+        self.trigger_pattern = re.compile('|'.join(re.escape(trigger) for trigger in triggers))
+        self.verb_patterns = {verbs: re.compile('(?=(?:' + '|'.join(verbs) + '))') for verbs in (tuple(ACTION_VERBS), tuple(REQUEST_VERBS))}
+    
+    def extract_keywords(self, text: str, top_n: int = 20, context: Optional[AnalysisContext] = None) -> List[str]:
+        return [keyphrase['phrase'] for keyphrase in self.extract_keyphrases(text, top_n, context)]
+    
+    def extract_keyphrases(self, text: str, top_n: int = 20, context: Optional[AnalysisContext] = None) -> List[Dict[str, Any]]:
+        context = context or AnalysisContext(text)
+        return self._score_keyphrases(context, top_n)
     
-    def extract_keywords(self, text: str, top_n: int = 20) -> List[str]:
-        return self._simple_keyword_extraction(text, top_n)
+    def extract_key_points(self, text: str, context: Optional[AnalysisContext] = None, matches: Optional[List[Dict[str, Any]]] = None) -> Dict[str, list]:
+        matches = self.scan(text) if matches is None else matches
+        action_matches = [match for match in matches if match['category'] == 'action_item']
+        decision_matches = [match for match in matches if match['category'] == 'decision']
+        keyphrases = self.extract_keyphrases(text, context=context)
+        return {
+            'keywords': [keyphrase['phrase'] for keyphrase in keyphrases],
+            'keyphrases': keyphrases,
+            'action_items': [match['text'] for match in action_matches],
+            'decisions': [match['text'] for match in decision_matches],
+            'action_item_matches': action_matches,
+            'decision_matches': decision_matches
+        }
     
     def extract_action_items(self, text: str) -> List[str]:
-        action_patterns = [
-            r'(?:need to|must|should|will)\s+([^.!?]*(?:implement|complete|finish|submit|review|approve|prepare|send|check|verify)[^.!?]*[.!?])',
-            r'(?:action item|todo|task):?\s*([^.!?]*[.!?])',
-            r'(?:please|kindly)\s+([^.!?]*(?:prepare|send|check|verify)[^.!?]*[.!?])',
-            r'(?:ensure|make sure)\s+([^.!?]*[.!?])',
-            r'(?:required to|expected to)\s+([^.!?]*[.!?])'
-        ]
-        
-        actions = []
-        for pattern in action_patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            actions.extend(matches)
-        
-        return [action.strip() for action in actions if len(action.strip()) > 10]
+        return [match['text'] for match in self.scan(text, categories=('action_item',))]
     
     def extract_decisions(self, text: str) -> List[str]:
-        decision_patterns = [
-            r'(?:decided|agreed|concluded|resolved)\s+([^.!?]*[.!?])',
-            r'(?:decision|resolution):?\s*([^.!?]*[.!?])',
-            r'(?:it was|we have)\s+(?:decided|agreed)\s+([^.!?]*[.!?])',
-            r'(?:the board|committee|team)\s+(?:approved|rejected)\s+([^.!?]*[.!?])',
-            r'(?:conclusion|agreement)\s+([^.!?]*[.!?])'
-        ]
+        return [match['text'] for match in self.scan(text, categories=('decision',))]
+    
+    def scan(self, text: str, categories: Tuple[str, ...] = ('action_item', 'decision')) -> List[Dict[str, Any]]:
+        lowered = lower_preserving_offsets(text)
+        ends = [match.start() for match in SENTENCE_END.finditer(text)]
+        last_verbs = {verbs: self._last_positions(pattern, lowered, ends) for verbs, pattern in self.verb_patterns.items()}
+        matched = set()
+        seen = set()
+        matches = []
+        sentence = 0
+        position = 0
         
-        decisions = []
-        for pattern in decision_patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            decisions.extend(matches)
+        while True:
+            trigger_match = self.trigger_pattern.search(lowered, position)
+            if not trigger_match:
+                break
+            offset = trigger_match.start()
+            position = offset + 1
+            while sentence < len(ends) and ends[sentence] < offset:
+                sentence += 1
+            if sentence == len(ends):
+                break
+            end = ends[sentence] + 1
+            
+            for category, prefix, verbs in self.patterns[trigger_match.group()]:
+                if category not in categories or (sentence, category) in matched:
+                    continue
+                prefix_match = prefix.match(lowered, offset, end)
+                if not prefix_match:
+                    continue
+                if verbs is not None and last_verbs[verbs][sentence] < prefix_match.end():
+                    continue
+                matched.add((sentence, category))
+                
+                raw = text[prefix_match.end():end]
+                stripped = raw.strip()
+                if len(stripped) <= self.MIN_MATCH_LENGTH or (category, stripped) in seen:
+                    continue
+                seen.add((category, stripped))
+                start = prefix_match.end() + len(raw) - len(raw.lstrip())
+                matches.append({'category': category, 'start': start, 'end': start + len(stripped), 'sentence_index': sentence, 'text': stripped})
+            
+            if all((sentence, category) in matched for category in categories):
+                position = end
         
-        return [decision.strip() for decision in decisions if len(decision.strip()) > 10]
+        return matches
     
-    def _simple_keyword_extraction(self, text: str, top_n: int) -> List[str]:
-        words = re.findall(r'\b[a-zA-Z]{4,}\b', text.lower())
+    def _last_positions(self, pattern, text: str, ends: List[int]) -> List[int]:
+        # Start of the last verb before each sentence end, or -1
+        last = [-1] * len(ends)
+        sentence = 0
+        for match in pattern.finditer(text):
+            offset = match.start()
+            while sentence < len(ends) and ends[sentence] < offset:
+                sentence += 1
+            if sentence == len(ends):
+                break
+            last[sentence] = offset
+        return last
+    
+    def _score_keyphrases(self, context: AnalysisContext, top_n: int) -> List[Dict[str, Any]]:
+        tokens = context.tokens
+        if not tokens:
+            return []
+        local_ids = {}
+        ids = np.fromiter((local_ids.setdefault(token, len(local_ids)) for token in tokens), dtype=np.int64, count=len(tokens))
+        terms = list(local_ids)
+        size = len(terms)
+        content = np.fromiter((self._is_content(term) for term in terms), dtype=bool, count=size)[ids]
+        idf = self.idf_index.idf(terms)
         
-        stop_words = {
-            'the', 'and', 'for', 'are', 'but', 'not', 'you', 'all', 'any', 'can', 
-            'her', 'was', 'one', 'our', 'out', 'who', 'get', 'has', 'had', 'him', 
-            'how', 'man', 'its', 'now', 'old', 'see', 'two', 'way', 'boy', 
-            'did', 'let', 'put', 'say', 'she', 'too', 'use', 'that', 'with',
-            'this', 'from', 'have', 'they', 'which', 'their', 'what', 'when', 'where',
-            'your', 'will', 'would', 'there', 'been', 'were', 'them', 'than', 'then'
-        }
+        # Adjacent tokens only form a phrase when nothing but whitespace separates them
+        offsets = np.asarray(context.token_offsets, dtype=np.int64)
+        ends = offsets + np.fromiter((len(token) for token in tokens), dtype=np.int64, count=len(tokens))
+        breaks = np.fromiter((match.start() for match in PHRASE_BREAK.finditer(context.text)), dtype=np.int64)
+        joined = np.searchsorted(breaks, offsets[1:]) == np.searchsorted(breaks, ends[:-1])
         
-        filtered_words = [word for word in words if word not in stop_words]
+        codes, counts, scores, lengths = [], [], [], []
+        for length in range(1, self.MAX_PHRASE_WORDS + 1):
+            count = len(tokens) - length + 1
+            if count <= 0 or size ** length >= 2 ** 62:
+                break
+            valid = content[:count].copy()
+            code = ids[:count].copy()
+            for k in range(1, length):
+                valid &= content[k:k + count] & joined[k - 1:k - 1 + count]
+                code = code * size + ids[k:k + count]
+            phrase_codes, phrase_counts = np.unique(code[valid], return_counts=True)
+            if length > 1:
+                repeated = phrase_counts >= self.MIN_PHRASE_COUNT
+                phrase_codes, phrase_counts = phrase_codes[repeated], phrase_counts[repeated]
+            phrase_idf = np.zeros(len(phrase_codes))
+            remainder = phrase_codes
+            for _ in range(length):
+                phrase_idf += idf[remainder % size]
+                remainder = remainder // size
+            codes.append(phrase_codes)
+            counts.append(phrase_counts)
+            scores.append(phrase_counts * phrase_idf)
+            lengths.append(np.full(len(phrase_codes), length))
         
-        word_freq = {}
-        for word in filtered_words:
-            word_freq[word] = word_freq.get(word, 0) + 1
+        codes, counts, scores, lengths = (np.concatenate(values) for values in (codes, counts, scores, lengths))
+        candidates = min(len(scores), top_n * 10)
+        if candidates == 0:
+            return []
+        top = np.argpartition(-scores, candidates - 1)[:candidates]
+        top = top[np.lexsort((codes[top], lengths[top], -scores[top]))]
         
-        sorted_words = sorted(word_freq.items(), key=lambda x: x[1], reverse=True)
-        return [word for word, freq in sorted_words[:top_n]]
+        keyphrases = []
+        used = set()
+        for index in top:
+            words = []
+            code = int(codes[index])
+            for _ in range(int(lengths[index])):
+                code, term = divmod(code, size)
+                words.append(terms[term])
+            # Overlapping n-grams of one repeated phrase would otherwise fill the list
+            if used.intersection(words):
+                continue
+            used.update(words)
+            phrase = ' '.join(reversed(words))
+            keyphrases.append({'phrase': phrase, 'score': round(float(scores[index]), 4), 'count': int(counts[index])})
+            if len(keyphrases) == top_n:
+                break
+        return keyphrases
+    
+    def _is_content(self, term: str) -> bool:
+        return len(term) >= 3 and term.isalpha() and term not in STOP_WORDS
@@ -0,0 +1,94 @@
+import os
+from typing import Dict, List, Optional
+import logging
+import numpy as np
+from modules.analysis_context import AnalysisContext
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_LEXICON = os.path.join(os.path.dirname(os.path.abspath(__file__)), "lexicons", "finance_sentiment.tsv")
+NEGATE = "NEGATE"
+
+class LexiconSentiment:
+    NEGATION_WINDOW = 3
+
+    def __init__(self, lexicon_path: Optional[str] = None):
+        self.lexicon_path = lexicon_path or os.environ.get("CDA_SENTIMENT_LEXICON") or DEFAULT_LEXICON
+        # Id 0 is every word outside the lexicon
+        self.vocab = {}
+        weights = [0.0]
+        negators = [False]
+        with open(self.lexicon_path, 'r', encoding='utf-8') as f:
+            for line_number, line in enumerate(f, 1):
+                line = line.strip()
+                if not line or line.startswith('#'):
+                    continue
+                try:
+                    term, value = line.split('\t')[:2]
+                    weight = 0.0 if value == NEGATE else float(value)
+                except ValueError:
+                    logger.warning(f"Skipping malformed lexicon line {line_number} in {self.lexicon_path}")
+                    continue
+                self.vocab[term.lower()] = len(weights)
+                weights.append(weight)
+                negators.append(value == NEGATE)
+        self.weights = np.asarray(weights, dtype=np.float32)
+        self.negators = np.asarray(negators, dtype=bool)
+        logger.info(f"Loaded sentiment lexicon with {len(self.vocab)} terms from {self.lexicon_path}")
+
+    def analyze(self, context: AnalysisContext) -> Dict:
+        tokens = context.tokens
+        sentence_spans = context.sentence_spans
+        paragraph_spans = context.paragraph_spans
+        if not tokens:
+            return self._result(0.0, 0.0, np.zeros(len(sentence_spans)), np.zeros(len(paragraph_spans)))
+
+        local_ids = {}
+        ids = np.fromiter((local_ids.setdefault(token, len(local_ids)) for token in tokens), dtype=np.int64, count=len(tokens))
+        lexicon_ids = np.fromiter((self.vocab.get(token, 0) for token in local_ids), dtype=np.int64, count=len(local_ids))[ids]
+        weights = self.weights[lexicon_ids].astype(np.float64)
+        offsets = np.asarray(context.token_offsets, dtype=np.int64)
+        sentences = self._span_index(sentence_spans, offsets)
+
+        # A sentiment term is flipped when a negator occurs within the preceding window of the same sentence
+        negators = self.negators[lexicon_ids]
+        negated = np.zeros(len(tokens), dtype=bool)
+        for distance in range(1, self.NEGATION_WINDOW + 1):
+            negated[distance:] |= negators[:-distance] & (sentences[:-distance] == sentences[distance:])
+        weights[negated] = -weights[negated]
+
+        positive = np.clip(weights, 0.0, None)
+        negative = np.clip(-weights, 0.0, None)
+        sentence_scores = self._polarity(sentences, positive, negative, len(sentence_spans))
+        section_scores = self._polarity(self._span_index(paragraph_spans, offsets), positive, negative, len(paragraph_spans))
+        return self._result(float(positive.sum()), float(negative.sum()), sentence_scores, section_scores)
+
+    def _span_index(self, spans: List, offsets: np.ndarray) -> np.ndarray:
+        if not spans:
+            return np.full(len(offsets), -1, dtype=np.int64)
+        starts = np.fromiter((start for start, _ in spans), dtype=np.int64, count=len(spans))
+        return np.searchsorted(starts, offsets, side='right') - 1
+
+    def _polarity(self, groups: np.ndarray, positive: np.ndarray, negative: np.ndarray, size: int) -> np.ndarray:
+        # (positive - negative) / (positive + negative) per span, 0 where no lexicon term occurs
+        inside = groups >= 0
+        positive_totals = np.bincount(groups[inside], weights=positive[inside], minlength=size)
+        negative_totals = np.bincount(groups[inside], weights=negative[inside], minlength=size)
+        totals = positive_totals + negative_totals
+        return np.divide(positive_totals - negative_totals, totals, out=np.zeros(size), where=totals > 0)
+
+    def _result(self, positive: float, negative: float, sentence_scores: np.ndarray, section_scores: np.ndarray) -> Dict:
+        total = positive + negative
+        if total == 0:
+            label, score, confidence = 'NEUTRAL', 0.5, 0.0
+        else:
+            score = positive / total
+            confidence = abs(score - 0.5) * 2
+            label = 'POSITIVE' if score > 0.6 else 'NEGATIVE' if score < 0.4 else 'NEUTRAL'
+        return {
+            'label': label,
+            'score': score,
+            'confidence': confidence,
+            'sentence_scores': sentence_scores.round(3).tolist(),
+            'section_scores': section_scores.round(3).tolist()
+        }
@@ -0,0 +1,109 @@
+import threading
+import time
+import logging
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+class ModelRegistry:
+    def __init__(self):
+        self._loaders: Dict[str, Callable[[], Any]] = {}
+        self._models: Dict[str, Any] = {}
+        self._load_seconds: Dict[str, float] = {}
+        self._memory_bytes: Dict[str, int] = {}
+        self._load_locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def register(self, name: str, loader: Callable[[], Any], replace: bool = False):
+        with self._lock:
+            if name in self._loaders and not replace:
+                return
+            self._loaders[name] = loader
+            self._load_locks.setdefault(name, threading.Lock())
+
+    def registered_models(self) -> List[str]:
+        with self._lock:
+            return list(self._loaders)
+
+    def is_loaded(self, name: str) -> bool:
+        return name in self._models
+
+    def is_warm(self, names: Optional[Iterable[str]] = None) -> bool:
+        names = self.registered_models() if names is None else names
+        return all(self.is_loaded(name) for name in names)
+
+    def get(self, name: str) -> Any:
+        if name in self._models:
+            return self._models[name]
+
+        with self._lock:
+            if name not in self._loaders:
+                raise KeyError(f"No loader registered for model '{name}'")
+            loader = self._loaders[name]
+            load_lock = self._load_locks[name]
+
+        with load_lock:
+            if name in self._models:
+                return self._models[name]
+
+            start = time.perf_counter()
+            try:
+                model = loader()
+            except Exception as e:
+                logger.warning(f"Model '{name}' failed to load: {str(e)}")
+                model = None
+            elapsed = time.perf_counter() - start
+
+            self._memory_bytes[name] = self._estimate_memory(model) if model is not None else 0
+            self._load_seconds[name] = elapsed
+            self._models[name] = model
+            logger.info(f"Model '{name}' loaded in {elapsed:.2f}s ({self._memory_bytes[name] / 1e6:.1f} MB)")
+            return model
+
+    def warm_up(self, names: Optional[Iterable[str]] = None) -> Dict[str, float]:
+        names = self.registered_models() if names is None else list(names)
+        for name in names:
+            self.get(name)
+        return {name: self._load_seconds.get(name, 0.0) for name in names}
+
+    def unload(self, name: str):
+        with self._lock:
+            self._models.pop(name, None)
+            self._load_seconds.pop(name, None)
+            self._memory_bytes.pop(name, None)
+
+    def memory_usage(self) -> Dict[str, int]:
+        return {name: self._memory_bytes.get(name, 0) for name in list(self._models)}
+
+    def total_memory_bytes(self) -> int:
+        return sum(self.memory_usage().values())
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        stats = {}
+        for name in self.registered_models():
+            loaded = name in self._models
+            stats[name] = {
+                'loaded': loaded,
+                'available': loaded and self._models[name] is not None,
+                'load_seconds': round(self._load_seconds.get(name, 0.0), 3),
+                'memory_bytes': self._memory_bytes.get(name, 0)
+            }
+        return stats
+
+    def _estimate_memory(self, model: Any) -> int:
+        torch_model = getattr(model, 'model', None)
+        if torch_model is not None and hasattr(torch_model, 'parameters'):
+            try:
+                total = sum(p.numel() * p.element_size() for p in torch_model.parameters())
+                total += sum(b.numel() * b.element_size() for b in torch_model.buffers())
+                return total
+            except Exception as e:
+                logger.debug(f"Parameter size estimate failed: {str(e)}")
+        if hasattr(model, 'to_bytes'):
+            try:
+                return len(model.to_bytes())
+            except Exception as e:
+                logger.debug(f"Serialized size estimate failed: {str(e)}")
+        return 0
+
+model_registry = ModelRegistry()
@@ -1,77 +1,67 @@
 import spacy
 import re
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 import logging
+from modules.model_registry import model_registry
+from modules.analysis_context import AnalysisContext
 
 logger = logging.getLogger(__name__)
 
 class NLPPipeline:
+    VERSION = "1.1"
+    MODEL_KEY = "spacy"
+
     def __init__(self):
-        self.nlp = None
-        self._initialize_nlp()
+        model_registry.register(self.MODEL_KEY, self._initialize_nlp)
+    
+    @property
+    def nlp(self):
+        return model_registry.get(self.MODEL_KEY)
     
-    def _initialize_nlp(self):
+    @staticmethod
+    def _initialize_nlp():
         try:
-            self.nlp = spacy.load("en_core_web_sm")
+            nlp = spacy.load("en_core_web_sm")
             logger.info("spaCy NLP pipeline initialized successfully")
+            return nlp
         except OSError:
             logger.warning("spaCy model not found, using simple text processing")
-            self.nlp = None
+            return None
     
-    def get_statistics(self, text: str) -> Dict[str, Any]:
+    def build_context(self, text: str) -> AnalysisContext:
+        nlp = self.nlp
+        if nlp is None:
+            return AnalysisContext(text)
+        if len(text) > nlp.max_length:
+            logger.warning(f"Text length {len(text)} exceeds spaCy max_length, using simple text processing")
+            return AnalysisContext(text)
+        return AnalysisContext(text, nlp(text))
+    
+    def get_statistics(self, text: str, context: Optional[AnalysisContext] = None) -> Dict[str, Any]:
         if not text.strip():
             return self._get_empty_statistics()
-        return self._get_statistics_with_spacy(text) if self.nlp else self._get_statistics_simple(text)
-    
-    def _get_statistics_with_spacy(self, text: str) -> Dict[str, Any]:
-        doc = self.nlp(text)
-        sentences = list(doc.sents)
-        paragraphs = [p for p in text.split('\n\n') if p.strip()]
-        word_count = len([token for token in doc if not token.is_punct and not token.is_space])
-        sentence_count = len(sentences)
-        paragraph_count = len(paragraphs)
-        reading_time_minutes = word_count / 200
-        entities = {}
-        for ent in doc.ents:
-            if ent.label_ not in entities:
-                entities[ent.label_] = []
-            if ent.text not in entities[ent.label_]:
-                entities[ent.label_].append(ent.text)
-        return {
-            'word_count': word_count,
-            'sentence_count': sentence_count,
-            'paragraph_count': paragraph_count,
-            'reading_time_minutes': round(reading_time_minutes, 1),
-            'entities': entities,
-            'avg_sentence_length': round(word_count / sentence_count, 2) if sentence_count > 0 else 0
-        }
-    
-    def _get_statistics_simple(self, text: str) -> Dict[str, Any]:
-        words = re.findall(r'\b\w+\b', text)
-        sentences = re.split(r'[.!?]+', text)
-        paragraphs = [p for p in text.split('\n\n') if p.strip()]
-        word_count = len(words)
-        sentence_count = len([s for s in sentences if s.strip()])
-        paragraph_count = len(paragraphs)
+        context = context or self.build_context(text)
+        word_count = len(context.tokens)
+        sentence_count = len(context.sentence_spans)
+        paragraph_count = len(context.paragraph_spans)
         reading_time_minutes = word_count / 200
         return {
             'word_count': word_count,
             'sentence_count': sentence_count,
             'paragraph_count': paragraph_count,
             'reading_time_minutes': round(reading_time_minutes, 1),
-            'entities': {},
+            'entities': context.entities,
             'avg_sentence_length': round(word_count / sentence_count, 2) if sentence_count > 0 else 0
         }
     
     def _get_empty_statistics(self) -> Dict[str, Any]:
         return {'word_count': 0, 'sentence_count': 0, 'paragraph_count': 0, 'reading_time_minutes': 0, 'entities': {}, 'avg_sentence_length': 0}
     
-    def preprocess_text(self, text: str) -> str:
-        if not self.nlp:
+    def preprocess_text(self, text: str, context: Optional[AnalysisContext] = None) -> str:
+        context = context or self.build_context(text)
+        if context.doc is None:
             return self._simple_preprocess(text)
-        doc = self.nlp(text)
-        cleaned_tokens = [token.lemma_.lower() for token in doc if not token.is_stop and not token.is_punct and not token.is_space]
-        return " ".join(cleaned_tokens)
+        return " ".join(context.content_tokens)
     
     def _simple_preprocess(self, text: str) -> str:
         words = re.findall(r'\b[a-zA-Z]{3,}\b', text.lower())
@@ -79,21 +69,10 @@ class NLPPipeline:
         filtered_words = [word for word in words if word not in stop_words]
         return " ".join(filtered_words)
     
-    def extract_entities(self, text: str) -> Dict[str, list]:
-        if not self.nlp:
-            return {}
-        doc = self.nlp(text)
-        entities = {}
-        for ent in doc.ents:
-            if ent.label_ not in entities:
-                entities[ent.label_] = []
-            if ent.text not in entities[ent.label_]:
-                entities[ent.label_].append(ent.text)
-        return entities
+    def extract_entities(self, text: str, context: Optional[AnalysisContext] = None) -> Dict[str, list]:
+        context = context or self.build_context(text)
+        return context.entities
     
-    def segment_sentences(self, text: str) -> list:
-        if self.nlp:
-            doc = self.nlp(text)
-            return [sent.text.strip() for sent in doc.sents]
-        sentences = re.split(r'[.!?]+', text)
-        return [s.strip() for s in sentences if s.strip()]
+    def segment_sentences(self, text: str, context: Optional[AnalysisContext] = None) -> list:
+        context = context or self.build_context(text)
+        return context.sentences
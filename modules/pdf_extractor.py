@@ -1,37 +1,81 @@
 import fitz
 import pdfplumber
 import logging
-from typing import List, Dict, Any
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Any, Callable, Iterator, Optional
 
 logger = logging.getLogger(__name__)
 
+def _extract_page_range(file_path: str, start: int, end: int) -> List[str]:
+    with fitz.open(file_path) as doc:
+        return [doc[page_index].get_text() for page_index in range(start, end)]
+
 class PDFExtractor:
-    def __init__(self):
+    TABLE_RULING_LINES = 3
+
+    def __init__(self, workers: int = 1, min_parallel_pages: int = 64):
         self.text_engine = "fitz"
+        self.workers = workers
+        self.min_parallel_pages = min_parallel_pages
     
-    def extract_text(self, file_path: str) -> str:
+    def extract_text(self, file_path: str, progress: Optional[Callable[[str, int, int], None]] = None) -> str:
         try:
-            if self.text_engine == "fitz":
-                return self._extract_with_fitz(file_path)
-            else:
-                return self._extract_with_pdfplumber(file_path)
+            return "".join(self.iter_text(file_path, progress))
         except Exception as e:
             logger.error(f"PDF extraction failed: {str(e)}")
             raise
     
-    def _extract_with_fitz(self, file_path: str) -> str:
-        text = ""
+    def iter_text(self, file_path: str, progress: Optional[Callable[[str, int, int], None]] = None) -> Iterator[str]:
+        # Document text in order as it is read: one piece per page, or per page-range shard with worker processes
+        if self.workers > 1 and self.text_engine == "fitz":
+            yield from self._iter_parallel(file_path, self.workers, progress)
+            return
+        page_count = self.extract_metadata(file_path).get('page_count') if progress else None
+        for page in self.iter_pages(file_path):
+            yield page['text']
+            if progress:
+                progress("pages extracted", page['page_number'], page_count)
+    
+    def extract_text_parallel(self, file_path: str, workers: Optional[int] = None, progress: Optional[Callable[[str, int, int], None]] = None) -> str:
+        return "".join(self._iter_parallel(file_path, workers or self.workers, progress))
+    
+    def _iter_parallel(self, file_path: str, workers: int, progress: Optional[Callable[[str, int, int], None]] = None) -> Iterator[str]:
+        with fitz.open(file_path) as doc:
+            page_count = len(doc)
+        
+        if workers <= 1 or page_count < self.min_parallel_pages:
+            yield from _extract_page_range(file_path, 0, page_count)
+            if progress:
+                progress("pages extracted", page_count, page_count)
+            return
+        
+        shard_size = max(1, -(-page_count // (workers * 4)))
+        starts = list(range(0, page_count, shard_size))
+        ends = [min(start + shard_size, page_count) for start in starts]
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            shards = executor.map(_extract_page_range, [file_path] * len(starts), starts, ends)
+            for end, shard in zip(ends, shards):
+                yield "".join(shard)
+                if progress:
+                    progress("pages extracted", end, page_count)
+    
+    def iter_pages(self, file_path: str) -> Iterator[Dict[str, Any]]:
+        page_texts = self._iter_with_fitz(file_path) if self.text_engine == "fitz" else self._iter_with_pdfplumber(file_path)
+        offset = 0
+        for page_number, text in enumerate(page_texts, 1):
+            yield {'page_number': page_number, 'text': text, 'start': offset, 'end': offset + len(text)}
+            offset += len(text)
+    
+    def _iter_with_fitz(self, file_path: str) -> Iterator[str]:
         with fitz.open(file_path) as doc:
             for page in doc:
-                text += page.get_text()
-        return text
+                yield page.get_text()
     
-    def _extract_with_pdfplumber(self, file_path: str) -> str:
-        text = ""
+    def _iter_with_pdfplumber(self, file_path: str) -> Iterator[str]:
         with pdfplumber.open(file_path) as pdf:
             for page in pdf.pages:
-                text += page.extract_text() or ""
-        return text
+                yield page.extract_text() or ""
+                page.flush_cache()
     
     def extract_metadata(self, file_path: str) -> Dict[str, Any]:
         metadata = {}
@@ -43,36 +87,120 @@ class PDFExtractor:
             logger.error(f"Metadata extraction failed: {str(e)}")
         return metadata
     
+    def ingest(self, file_path: str, image_dir: Optional[str] = None, include_tables: bool = True) -> Dict[str, Any]:
+        result = {'metadata': {}, 'pages': [], 'tables': [], 'images': [], 'text': ""}
+        table_pages = []
+        texts = []
+        offset = 0
+        try:
+            with fitz.open(file_path) as doc:
+                result['metadata'] = dict(doc.metadata or {})
+                result['metadata']['page_count'] = len(doc)
+                
+                for page_index, page in enumerate(doc):
+                    text = page.get_text()
+                    texts.append(text)
+                    page_result = {'page_number': page_index + 1, 'text': text, 'start': offset, 'end': offset + len(text), 'tables': [], 'images': []}
+                    offset += len(text)
+                    
+                    if include_tables and self._likely_has_table(page):
+                        table_pages.append(page_index)
+                    if image_dir:
+                        page_result['images'] = self._save_page_images(doc, page, page_index, image_dir)
+                    result['pages'].append(page_result)
+                
+                for page_index, tables in self._extract_page_tables(file_path, doc, table_pages).items():
+                    result['pages'][page_index]['tables'] = tables
+        except Exception as e:
+            logger.error(f"PDF ingestion failed: {str(e)}")
+            raise
+        
+        result['text'] = "".join(texts)
+        for page_result in result['pages']:
+            result['tables'].extend(table for table in page_result['tables'] if table)
+            result['images'].extend(page_result['images'])
+        return result
+    
     def extract_tables(self, file_path: str) -> List[List[List[str]]]:
         tables = []
         try:
-            with pdfplumber.open(file_path) as pdf:
-                for page in pdf.pages:
-                    page_tables = page.extract_tables()
-                    for table in page_tables:
-                        if table:
-                            tables.append(table)
+            with fitz.open(file_path) as doc:
+                table_pages = [page_index for page_index, page in enumerate(doc) if self._likely_has_table(page)]
+                page_tables = self._extract_page_tables(file_path, doc, table_pages)
+            for tables_on_page in page_tables.values():
+                tables.extend(table for table in tables_on_page if table)
         except Exception as e:
             logger.error(f"Table extraction failed: {str(e)}")
         return tables
     
+    def _extract_page_tables(self, file_path: str, doc, page_indices: List[int]) -> Dict[int, List[List[List[str]]]]:
+        # Shared by ingest and extract_tables so both return the same tables: PyMuPDF's detector, with pdfplumber
+        # only on PyMuPDF builds that lack find_tables
+        page_tables = {}
+        fallback_pages = []
+        for page_index in page_indices:
+            page = doc[page_index]
+            if hasattr(page, 'find_tables'):
+                page_tables[page_index] = [table.extract() for table in page.find_tables().tables]
+            else:
+                fallback_pages.append(page_index)
+        page_tables.update(zip(fallback_pages, self._extract_tables_with_pdfplumber(file_path, fallback_pages)))
+        return dict(sorted(page_tables.items()))
+    
+    def _extract_tables_with_pdfplumber(self, file_path: str, page_indices: List[int]) -> List[List[List[List[str]]]]:
+        if not page_indices:
+            return []
+        page_tables = []
+        with pdfplumber.open(file_path) as pdf:
+            for page_index in page_indices:
+                page = pdf.pages[page_index]
+                page_tables.append(page.extract_tables())
+                page.flush_cache()
+        return page_tables
+    
+    def _likely_has_table(self, page) -> bool:
+        horizontal = 0
+        vertical = 0
+        for drawing in page.get_drawings():
+            for item in drawing['items']:
+                if item[0] == 'l':
+                    start, end = item[1], item[2]
+                    if abs(start.y - end.y) < 1:
+                        horizontal += 1
+                    elif abs(start.x - end.x) < 1:
+                        vertical += 1
+                elif item[0] == 're':
+                    rect = item[1]
+                    if rect.height < 2:
+                        horizontal += 1
+                    elif rect.width < 2:
+                        vertical += 1
+                    else:
+                        horizontal += 2
+                        vertical += 2
+                if horizontal >= self.TABLE_RULING_LINES and vertical >= self.TABLE_RULING_LINES:
+                    return True
+        return False
+    
     def extract_images(self, file_path: str, output_dir: str) -> List[str]:
         image_paths = []
         try:
             with fitz.open(file_path) as doc:
                 for page_index in range(len(doc)):
-                    page = doc[page_index]
-                    image_list = page.get_images()
-                    
-                    for img_index, img in enumerate(image_list):
-                        xref = img[0]
-                        pix = fitz.Pixmap(doc, xref)
-                        
-                        if pix.n - pix.alpha < 4:
-                            img_path = f"{output_dir}/page_{page_index+1}_img_{img_index+1}.png"
-                            pix.save(img_path)
-                            image_paths.append(img_path)
-                        pix = None
+                    image_paths.extend(self._save_page_images(doc, doc[page_index], page_index, output_dir))
         except Exception as e:
             logger.error(f"Image extraction failed: {str(e)}")
-        return image_paths
\ No newline at end of file
+        return image_paths
+    
+    def _save_page_images(self, doc, page, page_index: int, output_dir: str) -> List[str]:
+        image_paths = []
+        for img_index, img in enumerate(page.get_images()):
+            xref = img[0]
+            pix = fitz.Pixmap(doc, xref)
+            
+            if pix.n - pix.alpha < 4:
+                img_path = f"{output_dir}/page_{page_index+1}_img_{img_index+1}.png"
+                pix.save(img_path)
+                image_paths.append(img_path)
+            pix = None
+        return image_paths
@@ -1,104 +1,194 @@
 import re
-from typing import List
+import heapq
+from typing import Any, Dict, List, Optional, Tuple
 import logging
+from modules.analysis_context import AnalysisContext
 
 logger = logging.getLogger(__name__)
 
+SENTENCE_END = re.compile(r'[.!?]')
+
+LEVEL_WEIGHTS = {'high': 3, 'medium': 2, 'low': 1}
+# Pattern and sentence hits compete in one overlap sweep, so both are scored on the keyword level scale
+MAX_SEVERITY = max(LEVEL_WEIGHTS.values())
+
+RISK_PATTERNS = [
+    (r'(?:high|significant|major|serious)\s+(?:risk|threat|danger)[^.!?]*[.!?]', 3),
+    (r'(?:potential|possible)\s+risk[^.!?]*[.!?]', 2),
+    (r'(?:may|could|might)\s+(?:result in|lead to|cause)\s+[^.!?]*[.!?]', 2),
+    (r'(?:challenge|issue|problem)\s+(?:with|in|regarding)[^.!?]*[.!?]', 2),
+    (r'(?:failure to|inability to)[^.!?]*[.!?]', 3),
+    (r'(?:compliance|regulatory|legal)\s+(?:issue|risk|concern)[^.!?]*[.!?]', 3)
+]
+
+OPPORTUNITY_PATTERNS = [
+    (r'(?:opportunity|potential|possibility)\s+(?:for|to|in)[^.!?]*[.!?]', 3),
+    (r'(?:can|could)\s+(?:lead to|result in|create)[^.!?]*[.!?]', 2),
+    (r'(?:benefit|advantage)\s+(?:of|for|in)[^.!?]*[.!?]', 2),
+    (r'(?:growth|expansion|improvement)\s+(?:in|of|for)[^.!?]*[.!?]', 2),
+    (r'(?:competitive advantage|market opportunity)[^.!?]*[.!?]', 3)
+]
+
+TRIGGER_GROUP = re.compile(r'^\(\?:([^)]*)\)')
+
+def _trigger_words(pattern: str) -> List[str]:
+    return sorted(set(alternative.split()[0] for alternative in TRIGGER_GROUP.match(pattern).group(1).split('|')))
+
 class RiskDetector:
-    def __init__(self):
+    VERSION = "1.4"
+    MIN_SENTENCE_SCORE = 2
+    MIN_ITEM_LENGTH = 15
+    
+    def __init__(self, top_k: int = 50):
+        self.top_k = top_k
         self.risk_keywords = {
             'high': ['risk', 'threat', 'danger', 'vulnerability', 'exposure', 'uncertainty', 'volatility'],
             'medium': ['challenge', 'issue', 'concern', 'problem', 'difficulty', 'obstacle'],
             'low': ['consideration', 'factor', 'aspect', 'element']
         }
-        
+
         self.opportunity_keywords = {
             'high': ['opportunity', 'advantage', 'benefit', 'potential', 'growth', 'expansion', 'innovation'],
             'medium': ['improvement', 'enhancement', 'development', 'progress', 'advancement'],
             'low': ['possibility', 'option', 'alternative', 'prospect']
         }
-    
-    def detect_risks(self, text: str) -> List[str]:
-        risk_patterns = [
-            r'(?:high|significant|major|serious)\s+(?:risk|threat|danger)[^.!?]*[.!?]',
-            r'(?:potential|possible)\s+risk[^.!?]*[.!?]',
-            r'(?:may|could|might)\s+(?:result in|lead to|cause)\s+[^.!?]*[.!?]',
-            r'(?:challenge|issue|problem)\s+(?:with|in|regarding)[^.!?]*[.!?]',
-            r'(?:failure to|inability to)[^.!?]*[.!?]',
-            r'(?:compliance|regulatory|legal)\s+(?:issue|risk|concern)[^.!?]*[.!?]'
-        ]
-        
-        risks = []
-        for pattern in risk_patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            risks.extend(matches)
-        
-        sentence_risks = self._extract_risk_sentences(text)
-        risks.extend(sentence_risks)
+
+        self.patterns = {'risk': [], 'opportunity': []}
+        self.triggers = {}
+        for category, patterns in (('risk', RISK_PATTERNS), ('opportunity', OPPORTUNITY_PATTERNS)):
+            for pattern, severity in patterns:
+                self.patterns[category].append((re.compile(pattern), re.compile(pattern, re.IGNORECASE), severity))
+                for word in _trigger_words(pattern):
+                    self.triggers.setdefault(word, []).append((category, len(self.patterns[category]) - 1))
         
-        return list(set([risk.strip() for risk in risks if len(risk.strip()) > 15]))
+        self.keyword_weights = {}
+        for category, lexicon in (('risk', self.risk_keywords), ('opportunity', self.opportunity_keywords)):
+            for level, keywords in lexicon.items():
+                for keyword in keywords:
+                    self.keyword_weights[keyword] = (category, LEVEL_WEIGHTS[level])
+        self._token_index = {}
     
-    def detect_opportunities(self, text: str) -> List[str]:
-        opportunity_patterns = [
-            r'(?:opportunity|potential|possibility)\s+(?:for|to|in)[^.!?]*[.!?]',
-            r'(?:can|could)\s+(?:lead to|result in|create)[^.!?]*[.!?]',
-            r'(?:benefit|advantage)\s+(?:of|for|in)[^.!?]*[.!?]',
-            r'(?:growth|expansion|improvement)\s+(?:in|of|for)[^.!?]*[.!?]',
-            r'(?:competitive advantage|market opportunity)[^.!?]*[.!?]'
-        ]
-        
-        opportunities = []
-        for pattern in opportunity_patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            opportunities.extend(matches)
-        
-        sentence_opportunities = self._extract_opportunity_sentences(text)
-        opportunities.extend(sentence_opportunities)
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_token_index'] = {}
+        return state
+    
+    def analyze(self, text: str, context: Optional[AnalysisContext] = None) -> Dict[str, list]:
+        return self.analyze_hits(self.scan(text, context))
+    
+    def analyze_hits(self, hits: List[Dict[str, Any]]) -> Dict[str, list]:
+        risk_items = self.rank(hits, 'risk')
+        opportunity_items = self.rank(hits, 'opportunity')
+        return {
+            'risks': [item['text'] for item in risk_items],
+            'opportunities': [item['text'] for item in opportunity_items],
+            'risk_items': risk_items,
+            'opportunity_items': opportunity_items
+        }
+    
+    def detect_risks(self, text: str, context: Optional[AnalysisContext] = None) -> List[str]:
+        return [item['text'] for item in self.detect_risk_items(text, context)]
+    
+    def detect_opportunities(self, text: str, context: Optional[AnalysisContext] = None) -> List[str]:
+        return [item['text'] for item in self.detect_opportunity_items(text, context)]
+    
+    def detect_risk_items(self, text: str, context: Optional[AnalysisContext] = None, top_k: Optional[int] = None) -> List[Dict[str, Any]]:
+        return self.rank(self.scan(text, context, categories=('risk',)), 'risk', top_k)
+    
+    def detect_opportunity_items(self, text: str, context: Optional[AnalysisContext] = None, top_k: Optional[int] = None) -> List[Dict[str, Any]]:
+        return self.rank(self.scan(text, context, categories=('opportunity',)), 'opportunity', top_k)
+    
+    def rank(self, hits: List[Dict[str, Any]], category: str, top_k: Optional[int] = None) -> List[Dict[str, Any]]:
+        merged = []
+        cluster_end = -1
+        for hit in hits:
+            # Too-short hits are dropped before they can displace a longer overlapping item
+            if hit['category'] != category or len(hit['text'].strip()) <= self.MIN_ITEM_LENGTH:
+                continue
+            if merged and hit['start'] < cluster_end:
+                if self._item_key(hit) > self._item_key(merged[-1]):
+                    merged[-1] = hit
+                cluster_end = max(cluster_end, hit['end'])
+                continue
+            merged.append(hit)
+            cluster_end = hit['end']
         
-        return list(set([opp.strip() for opp in opportunities if len(opp.strip()) > 15]))
+        best = {}
+        for hit in merged:
+            text = hit['text'].strip()
+            if text not in best or hit['severity'] > best[text]['severity']:
+                start = hit['start'] + len(hit['text']) - len(hit['text'].lstrip())
+                best[text] = {
+                    'text': text,
+                    'category': category,
+                    'severity': hit['severity'],
+                    'sentence_index': hit['sentence_index'],
+                    'start': start,
+                    'end': start + len(text),
+                    'source': hit['source']
+                }
+        return heapq.nlargest(top_k or self.top_k, best.values(), key=lambda item: (item['severity'], -item['start']))
     
-    def _extract_risk_sentences(self, text: str) -> List[str]:
-        sentences = re.split(r'[.!?]+', text)
-        risk_sentences = []
+    def scan(self, text: str, context: Optional[AnalysisContext] = None, categories: Tuple[str, ...] = ('risk', 'opportunity')) -> List[Dict[str, Any]]:
+        context = context or AnalysisContext(text)
+        spans = context.sentence_spans
+        lowered = text.lower()
+        case_folded = len(lowered) == len(text)
+        hits = []
+        pattern_ends = {}
+        sentence_keywords = {}
+        sentence = 0
+        token_index = self._token_index
+        # Every pattern ends at the next sentence terminator, so matches are bounded there and a trigger with no
+        # terminator after it is skipped instead of scanning to the end of the text
+        ends = [match.start() for match in SENTENCE_END.finditer(text)]
+        next_end = 0
         
-        for sentence in sentences:
-            sentence_lower = sentence.lower()
-            risk_score = 0
+        for token, offset in zip(context.tokens, context.token_offsets):
+            entry = token_index.get(token)
+            if entry is None:
+                entry = self._index_token(token)
+            if not entry:
+                continue
+            triggers, keywords = entry
+            while sentence < len(spans) and spans[sentence][1] <= offset:
+                sentence += 1
+            index = sentence if sentence < len(spans) and spans[sentence][0] <= offset else None
             
-            for level, keywords in self.risk_keywords.items():
-                for keyword in keywords:
-                    if keyword in sentence_lower:
-                        if level == 'high':
-                            risk_score += 3
-                        elif level == 'medium':
-                            risk_score += 2
-                        else:
-                            risk_score += 1
+            while next_end < len(ends) and ends[next_end] < offset:
+                next_end += 1
             
-            if risk_score >= 2 and len(sentence.strip()) > 20:
-                risk_sentences.append(sentence.strip())
-        
-        return risk_sentences
-    
-    def _extract_opportunity_sentences(self, text: str) -> List[str]:
-        sentences = re.split(r'[.!?]+', text)
-        opportunity_sentences = []
-        
-        for sentence in sentences:
-            sentence_lower = sentence.lower()
-            opportunity_score = 0
+            for category, pattern_index in triggers:
+                if next_end == len(ends) or category not in categories or offset < pattern_ends.get((category, pattern_index), 0):
+                    continue
+                pattern, pattern_ignore_case, severity = self.patterns[category][pattern_index]
+                bound = ends[next_end] + 1
+                match = pattern.match(lowered, offset, bound) if case_folded else pattern_ignore_case.match(text, offset, bound)
+                if match:
+                    pattern_ends[(category, pattern_index)] = match.end()
+                    hits.append({'category': category, 'source': 'pattern', 'severity': severity, 'start': offset, 'end': match.end(), 'sentence_index': index, 'text': text[offset:match.end()]})
             
-            for level, keywords in self.opportunity_keywords.items():
+            if index is not None:
                 for keyword in keywords:
-                    if keyword in sentence_lower:
-                        if level == 'high':
-                            opportunity_score += 3
-                        elif level == 'medium':
-                            opportunity_score += 2
-                        else:
-                            opportunity_score += 1
-            
-            if opportunity_score >= 2 and len(sentence.strip()) > 20:
-                opportunity_sentences.append(sentence.strip())
+                    category, weight = self.keyword_weights[keyword]
+                    if category in categories:
+                        sentence_keywords.setdefault((index, category), {})[keyword] = weight
+        
+        sentence_hits = []
+        for (index, category), matched in sorted(sentence_keywords.items()):
+            score = sum(matched.values())
+            start, end = spans[index]
+            if score >= self.MIN_SENTENCE_SCORE and end - start > 20:
+                sentence_hits.append({'category': category, 'source': 'sentence', 'severity': min(score, MAX_SEVERITY), 'start': start, 'end': end, 'sentence_index': index, 'text': text[start:end]})
         
-        return opportunity_sentences
\ No newline at end of file
+        return list(heapq.merge(hits, sentence_hits, key=lambda hit: hit['start']))
+    
+    def _index_token(self, token: str) -> tuple:
+        triggers = self.triggers.get(token, [])
+        keywords = [keyword for keyword in self.keyword_weights if keyword in token]
+        entry = (triggers, keywords) if triggers or keywords else ()
+        self._token_index[token] = entry
+        return entry
+    
+    def _item_key(self, hit: Dict[str, Any]) -> Tuple[int, int]:
+        return (hit['severity'], hit['end'] - hit['start'])
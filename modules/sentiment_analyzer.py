@@ -1,99 +1,120 @@
-from transformers import pipeline
-from typing import Dict
+import os
+from functools import partial
+import numpy as np
+from typing import Dict, List, Optional
 import logging
+from modules.model_registry import model_registry
+from modules.analysis_context import AnalysisContext
+from modules.text_chunker import TextChunker
+from modules.inference_backend import InferenceBackend
+from modules.lexicon_sentiment import LexiconSentiment
+from utils.chunk_memo import ChunkMemo
 
 logger = logging.getLogger(__name__)
 
 class SentimentAnalyzer:
-    def __init__(self):
-        self.analyzer = None
-        self._initialize_analyzer()
+    VERSION = "1.5"
+    MODEL_KEY = "sentiment"
+    MODEL_NAME = "distilbert-base-uncased-finetuned-sst-2-english"
+
+    def __init__(self, batch_size: int = 32, max_tokens: int = 512, chunk_overlap: int = 0, backend: Optional[str] = None, model_dir: Optional[str] = None, engine: Optional[str] = None, lexicon_path: Optional[str] = None, chunk_memo: Optional[ChunkMemo] = None):
+        self.engine = (engine or os.environ.get("CDA_SENTIMENT_ENGINE", "model")).lower()
+        self.lexicon = LexiconSentiment(lexicon_path)
+        self.batch_size = batch_size
+        self.max_tokens = max_tokens
+        self.chunk_overlap = chunk_overlap
+        self.inference_backend = InferenceBackend(backend, model_dir)
+        self.model_key = f"{self.MODEL_KEY}:{self.inference_backend.name}"
+        self.memo_model = f"{self.MODEL_NAME}:{self.inference_backend.name}"
+        self.chunk_memo = chunk_memo or ChunkMemo()
+        model_registry.register(self.model_key, partial(self._initialize_analyzer, self.inference_backend))
+    
+    @property
+    def analyzer(self):
+        return model_registry.get(self.model_key)
     
-    def _initialize_analyzer(self):
+    @staticmethod
+    def _initialize_analyzer(inference_backend: InferenceBackend):
         try:
-            self.analyzer = pipeline(
-                "sentiment-analysis",
-                model="distilbert-base-uncased-finetuned-sst-2-english",
-                device=-1
-            )
+            analyzer = inference_backend.load_pipeline("sentiment-analysis", SentimentAnalyzer.MODEL_NAME)
             logger.info("Transformer sentiment analyzer initialized successfully")
+            return analyzer
         except Exception as e:
             logger.warning(f"Transformer sentiment analyzer failed: {str(e)}")
             logger.info("Using rule-based sentiment analysis as fallback")
-            self.analyzer = None
+            return None
     
-    def analyze_sentiment(self, text: str) -> Dict:
+    def analyze_sentiment(self, text: str, context: Optional[AnalysisContext] = None) -> Dict:
         if not text.strip():
             return {'label': 'NEUTRAL', 'score': 0.5, 'confidence': 0.0}
         
+        context = context or AnalysisContext(text)
+        lexicon_result = self.lexicon.analyze(context)
+        if self.engine == "lexicon":
+            return lexicon_result
+        
         try:
             if self.analyzer and len(text) > 10:
-                if len(text) > 512:
-                    chunks = self._split_text(text, 500)
-                    sentiments = [self.analyzer(chunk[:512])[0] for chunk in chunks if len(chunk) > 10]
-                    if not sentiments:
-                        return self._rule_based_sentiment(text)
-                    
-                    positive_count = sum(1 for s in sentiments if s['label'] == 'POSITIVE')
-                    avg_score = sum(s['score'] for s in sentiments) / len(sentiments)
-                    overall_label = 'POSITIVE' if positive_count > len(sentiments) / 2 else 'NEGATIVE'
-                    
-                    return {'label': overall_label, 'score': avg_score, 'confidence': avg_score}
-                else:
-                    result = self.analyzer(text[:512])[0]
-                    return {'label': result['label'], 'score': result['score'], 'confidence': result['score']}
+                chunks = self._chunk_text(context)
+                if not chunks:
+                    return lexicon_result
+                result = self._aggregate_chunk_sentiment(self._classify_chunks(chunks))
+                # The lexicon pass is cheap enough to always supply the per-sentence timeline
+                result['sentence_scores'] = lexicon_result['sentence_scores']
+                result['section_scores'] = lexicon_result['section_scores']
+                return result
             else:
-                return self._rule_based_sentiment(text)
+                return lexicon_result
         except Exception as e:
             logger.error(f"Sentiment analysis failed: {str(e)}")
-            return self._rule_based_sentiment(text)
+            return lexicon_result
     
-    def _rule_based_sentiment(self, text: str) -> Dict:
-        positive_words = {
-            'good', 'great', 'excellent', 'positive', 'success', 'profit', 'growth', 
-            'improve', 'benefit', 'opportunity', 'strong', 'better', 'best', 'win', 
-            'advantage', 'achievement', 'progress', 'successful', 'outstanding'
-        }
-        negative_words = {
-            'bad', 'poor', 'negative', 'loss', 'decline', 'risk', 'problem', 'issue', 
-            'challenge', 'weak', 'worse', 'worst', 'fail', 'disadvantage', 'threat',
-            'difficult', 'concern', 'weakness', 'failure'
-        }
-        
-        words = text.lower().split()
-        positive_count = sum(1 for word in words if word in positive_words)
-        negative_count = sum(1 for word in words if word in negative_words)
-        total = positive_count + negative_count
-        
-        if total == 0:
-            return {'label': 'NEUTRAL', 'score': 0.5, 'confidence': 0.0}
+    def _chunk_text(self, context: AnalysisContext) -> List[str]:
+        chunker = TextChunker(self.analyzer.tokenizer, max_tokens=self.max_tokens, overlap_tokens=self.chunk_overlap)
+        return [chunk for chunk in chunker.chunk(context.sentences) if len(chunk) > 10]
+    
+    def _classify_chunks(self, chunks: List[str]) -> np.ndarray:
+        params = {'max_tokens': self.max_tokens}
+        cached, missing = self.chunk_memo.lookup(chunks, self.memo_model, params)
+        if missing:
+            pending = [chunks[i] for i in missing]
+            computed = self._run_model(pending)
+            self.chunk_memo.store(pending, computed.tolist(), self.memo_model, params)
+            for i, row in zip(missing, computed):
+                cached[i] = row
+        return np.asarray(cached, dtype=np.float32)
+    
+    def _run_model(self, chunks: List[str]) -> np.ndarray:
+        import torch
+        tokenizer = self.analyzer.tokenizer
+        model = self.analyzer.model
         
-        score = positive_count / total
-        confidence = abs(score - 0.5) * 2
+        encodings = tokenizer(chunks, truncation=True, max_length=self.max_tokens)
+        input_ids = encodings['input_ids']
+        order = np.argsort([len(ids) for ids in input_ids], kind='stable')
+        probabilities = np.zeros((len(chunks), model.config.num_labels), dtype=np.float32)
         
-        if score > 0.6:
-            label = 'POSITIVE'
-        elif score < 0.4:
-            label = 'NEGATIVE'
-        else:
-            label = 'NEUTRAL'
+        with torch.no_grad():
+            for start in range(0, len(order), self.batch_size):
+                batch_indices = order[start:start + self.batch_size]
+                batch = tokenizer.pad({key: [encodings[key][i] for i in batch_indices] for key in encodings.keys()}, return_tensors='pt')
+                logits = model(**batch).logits
+                probabilities[batch_indices] = torch.softmax(logits, dim=-1).cpu().numpy()
         
-        return {'label': label, 'score': score, 'confidence': confidence}
+        return probabilities
     
-    def _split_text(self, text: str, chunk_size: int) -> list:
-        sentences = text.split('.')
-        chunks = []
-        current_chunk = ""
+    def _aggregate_chunk_sentiment(self, probabilities: np.ndarray) -> Dict:
+        id2label = self.analyzer.model.config.id2label
+        positive_index = next((i for i, label in id2label.items() if label.upper() == 'POSITIVE'), probabilities.shape[1] - 1)
         
-        for sentence in sentences:
-            if len(current_chunk) + len(sentence) < chunk_size:
-                current_chunk += sentence + "."
-            else:
-                if current_chunk:
-                    chunks.append(current_chunk)
-                current_chunk = sentence + "."
-        
-        if current_chunk:
-            chunks.append(current_chunk)
+        predicted = probabilities.argmax(axis=1)
+        positive_count = int(np.count_nonzero(predicted == positive_index))
+        avg_score = float(probabilities.max(axis=1).mean())
+        overall_label = 'POSITIVE' if positive_count > len(predicted) / 2 else 'NEGATIVE'
         
-        return chunks
+        return {
+            'label': overall_label,
+            'score': avg_score,
+            'confidence': avg_score,
+            'chunk_scores': probabilities[:, positive_index].astype(float).round(4).tolist()
+        }
@@ -1,95 +1,192 @@
-from transformers import pipeline
-from typing import List
+import math
+import zlib
+from functools import partial
+from typing import Callable, List, Optional
 import logging
-import re
+from modules.model_registry import model_registry
+from modules.analysis_context import AnalysisContext
+from modules.text_chunker import TextChunker
+from modules.inference_backend import InferenceBackend
+from modules.text_rank import TextRank
+from utils.chunk_memo import ChunkMemo
 
 logger = logging.getLogger(__name__)
 
 class Summarizer:
-    def __init__(self):
-        self.summarizer = None
-        self._initialize_summarizer()
+    VERSION = "1.4"
+    MODEL_KEY = "summarizer"
+    MODEL_NAME = "facebook/bart-large-cnn"
+
+    def __init__(self, batch_size: int = 8, num_threads: Optional[int] = None, max_chunk_tokens: int = 1024, chunk_overlap: int = 0, hierarchical: bool = True, max_model_calls: int = 32, backend: Optional[str] = None, model_dir: Optional[str] = None, chunk_memo: Optional[ChunkMemo] = None):
+        self.batch_size = batch_size
+        self.num_threads = num_threads
+        self.max_chunk_tokens = max_chunk_tokens
+        self.chunk_overlap = chunk_overlap
+        self.hierarchical = hierarchical
+        self.max_model_calls = max_model_calls
+        self.text_rank = TextRank()
+        self.inference_backend = InferenceBackend(backend, model_dir)
+        self.model_key = f"{self.MODEL_KEY}:{self.inference_backend.name}"
+        self.memo_model = f"{self.MODEL_NAME}:{self.inference_backend.name}"
+        self.chunk_memo = chunk_memo or ChunkMemo()
+        model_registry.register(self.model_key, partial(self._initialize_summarizer, self.inference_backend))
+    
+    @property
+    def summarizer(self):
+        return model_registry.get(self.model_key)
     
-    def _initialize_summarizer(self):
+    @staticmethod
+    def _initialize_summarizer(inference_backend: InferenceBackend):
         try:
-            self.summarizer = pipeline(
-                "summarization",
-                model="facebook/bart-large-cnn",
-                tokenizer="facebook/bart-large-cnn",
-                device=-1
-            )
+            summarizer = inference_backend.load_pipeline("summarization", Summarizer.MODEL_NAME)
             logger.info("Transformer summarizer initialized successfully")
+            return summarizer
         except Exception as e:
             logger.warning(f"Transformer summarizer failed: {str(e)}")
             logger.info("Using extractive summarization as fallback")
-            self.summarizer = None
+            return None
     
-    def summarize(self, text: str, max_length: int = 150, min_length: int = 30) -> str:
+    def summarize(self, text: str, max_length: int = 150, min_length: int = 30, context: Optional[AnalysisContext] = None, progress: Optional[Callable[[str, int, int], None]] = None, paragraphs: Optional[List[str]] = None) -> str:
         if not text.strip():
             return "No text available for summarization."
         
+        context = context or AnalysisContext(text)
+        
         try:
             if self.summarizer and len(text) > 100:
-                if len(text) > 1024:
-                    chunks = self._split_text(text, 1000)
-                    summaries = []
-                    for chunk in chunks:
-                        if len(chunk) > 50:
-                            summary = self.summarizer(chunk, max_length=max_length, min_length=min_length, do_sample=False)
-                            summaries.append(summary[0]['summary_text'])
-                    return " ".join(summaries) if summaries else self._extractive_summarize(text)
-                else:
-                    summary = self.summarizer(text, max_length=max_length, min_length=min_length, do_sample=False)
-                    return summary[0]['summary_text']
+                chunks = self._chunk_paragraphs(paragraphs) if paragraphs else self._chunk_text(context)
+                if self.hierarchical and len(chunks) > 1:
+                    return self._hierarchical_summarize(chunks, max_length, min_length, progress)
+                summaries = self._summarize_chunks(chunks, max_length, min_length, progress)
+                return " ".join(summaries) if summaries else self._extractive_summarize(context)
             else:
-                return self._extractive_summarize(text)
+                return self._extractive_summarize(context)
         except Exception as e:
             logger.error(f"Summarization failed: {str(e)}")
-            return self._extractive_summarize(text)
+            return self._extractive_summarize(context)
     
-    def _extractive_summarize(self, text: str, num_sentences: int = 3) -> str:
-        sentences = re.split(r'[.!?]+', text)
-        sentences = [s.strip() for s in sentences if s.strip()]
-        
-        if len(sentences) <= num_sentences:
-            return ". ".join(sentences) + "."
+    def _chunk_text(self, context: AnalysisContext) -> List[str]:
+        chunker = TextChunker(self.summarizer.tokenizer, max_tokens=self.max_chunk_tokens, overlap_tokens=self.chunk_overlap)
+        return [chunk for chunk in chunker.chunk(context.sentences) if len(chunk) > 50]
+    
+    def _chunk_paragraphs(self, paragraphs: List[str]) -> List[str]:
+        # Chunks close at paragraphs whose checksum hits the stride, so an edit only reshapes the chunks around it
+        # and the untouched ones are chunk memo hits on the next revision
+        chunker = TextChunker(self.summarizer.tokenizer, max_tokens=self.max_chunk_tokens)
+        budget = chunker.token_budget
+        counts = chunker.count_tokens(paragraphs)
+        average = max(1, sum(counts) // max(len(counts), 1))
+        stride = 2 ** int(math.log2(max(budget // (2 * average), 1)))
+        chunks = []
+        group = []
+        group_tokens = 0
+        for paragraph, count in zip(paragraphs, counts):
+            if group and group_tokens + count > budget:
+                chunks.append(" ".join(group))
+                group, group_tokens = [], 0
+            if count > budget:
+                chunks.extend(chunker.chunk(AnalysisContext(paragraph).sentences))
+                continue
+            group.append(paragraph)
+            group_tokens += count
+            if zlib.crc32(paragraph.encode('utf-8')) % stride == 0:
+                chunks.append(" ".join(group))
+                group, group_tokens = [], 0
+        if group:
+            chunks.append(" ".join(group))
+        return [chunk for chunk in chunks if len(chunk) > 50]
+    
+    def _hierarchical_summarize(self, chunks: List[str], max_length: int, min_length: int, progress: Optional[Callable[[str, int, int], None]] = None) -> str:
+        map_budget = self._map_budget(len(chunks), max_length)
+        selected = self._select_chunks(chunks, map_budget)
+        summaries = self._summarize_chunks(selected, max_length, min_length, progress)
+        model_calls = len(selected)
         
-        word_freq = {}
-        for sentence in sentences:
-            words = sentence.lower().split()
-            for word in words:
-                if len(word) > 2:
-                    word_freq[word] = word_freq.get(word, 0) + 1
+        chunker = TextChunker(self.summarizer.tokenizer, max_tokens=self.max_chunk_tokens)
+        while len(summaries) > 1:
+            groups = chunker.chunk(summaries)
+            if len(groups) >= len(summaries):
+                # Summaries too long to pack two per chunk: another model pass would not shrink the list
+                logger.warning(f"Summaries of {len(summaries)} chunks do not fit {self.max_chunk_tokens}-token reduce chunks, reducing extractively")
+                return self._extractive_summarize(AnalysisContext(" ".join(summaries)))
+            if model_calls + len(groups) > self.max_model_calls:
+                logger.info(f"Summary call budget reached after {model_calls} calls, reducing extractively")
+                return self._extractive_summarize(AnalysisContext(" ".join(summaries)))
+            summaries = self._summarize_chunks(groups, max_length, min_length, progress, stage="summaries reduced")
+            model_calls += len(groups)
         
-        sentence_scores = {}
-        for i, sentence in enumerate(sentences):
-            words = sentence.lower().split()
-            if words:
-                score = sum(word_freq.get(word, 0) for word in words if len(word) > 2) / len(words)
-                sentence_scores[i] = score
+        logger.info(f"Hierarchical summary of {len(chunks)} chunks used {model_calls} model calls")
+        return summaries[0] if summaries else ""
+    
+    def _map_budget(self, num_chunks: int, max_length: int) -> int:
+        fan_in = max(2, self.max_chunk_tokens // max(max_length, 1))
+        map_calls = min(num_chunks, self.max_model_calls)
+        while map_calls > 1 and map_calls + self._reduce_calls(map_calls, fan_in) > self.max_model_calls:
+            map_calls -= 1
+        return max(map_calls, 1)
+    
+    def _reduce_calls(self, num_summaries: int, fan_in: int) -> int:
+        calls = 0
+        while num_summaries > 1:
+            num_summaries = -(-num_summaries // fan_in)
+            calls += num_summaries
+        return calls
+    
+    def _select_chunks(self, chunks: List[str], limit: int) -> List[str]:
+        if len(chunks) <= limit:
+            return chunks
+        # Most central chunks go to the model, in document order
+        top_indices = [ranked['index'] for ranked in self.text_rank.rank_texts(chunks, limit)]
+        return [chunks[i] for i in sorted(top_indices)]
+    
+    def _summarize_chunks(self, chunks: List[str], max_length: int, min_length: int, progress: Optional[Callable[[str, int, int], None]] = None, stage: str = "chunks summarised") -> List[str]:
+        if not chunks:
+            return []
+        params = {'max_length': max_length, 'min_length': min_length, 'do_sample': False}
+        summaries, missing = self.chunk_memo.lookup(chunks, self.memo_model, params)
+        if progress:
+            progress(stage, len(chunks) - len(missing), len(chunks))
+        if not missing:
+            return summaries
+        self._configure_threads()
         
-        if not sentence_scores:
-            return ". ".join(sentences[:num_sentences]) + "."
+        pending = [chunks[i] for i in missing]
+        lengths = [len(ids) for ids in self.summarizer.tokenizer(pending, add_special_tokens=False)['input_ids']]
+        order = sorted(range(len(pending)), key=lambda i: lengths[i])
+        generated = [None] * len(pending)
         
-        top_sentences = sorted(sentence_scores.items(), key=lambda x: x[1], reverse=True)[:num_sentences]
-        top_sentences = sorted(top_sentences, key=lambda x: x[0])
+        for start in range(0, len(order), self.batch_size):
+            batch_indices = order[start:start + self.batch_size]
+            batch = [pending[i] for i in batch_indices]
+            outputs = self.summarizer(batch, max_length=max_length, min_length=min_length, do_sample=False, truncation=True, batch_size=len(batch))
+            for i, output in zip(batch_indices, outputs):
+                output = output[0] if isinstance(output, list) else output
+                generated[i] = output['summary_text']
+                summaries[missing[i]] = generated[i]
+            if progress:
+                progress(stage, len(chunks) - len(missing) + min(start + self.batch_size, len(order)), len(chunks))
         
-        return ". ".join(sentences[i] for i, _ in top_sentences) + "."
+        self.chunk_memo.store(pending, generated, self.memo_model, params)
+        return summaries
     
-    def _split_text(self, text: str, chunk_size: int) -> List[str]:
-        sentences = text.split('.')
-        chunks = []
-        current_chunk = ""
-        
-        for sentence in sentences:
-            if len(current_chunk) + len(sentence) < chunk_size:
-                current_chunk += sentence + "."
-            else:
-                if current_chunk:
-                    chunks.append(current_chunk)
-                current_chunk = sentence + "."
+    def _configure_threads(self):
+        if not self.num_threads:
+            return
+        try:
+            import torch
+            if torch.get_num_threads() != self.num_threads:
+                torch.set_num_threads(self.num_threads)
+        except Exception as e:
+            logger.warning(f"Could not set inference thread count: {str(e)}")
+    
+    def _extractive_summarize(self, context: AnalysisContext, num_sentences: int = 3) -> str:
+        sentences = context.sentences
         
-        if current_chunk:
-            chunks.append(current_chunk)
+        if len(sentences) <= num_sentences:
+            return self._join_sentences(sentences)
         
-        return chunks
+        top_sentences = sorted(self.text_rank.rank_sentences(context, num_sentences), key=lambda ranked: ranked['index'])
+        return self._join_sentences([ranked['text'] for ranked in top_sentences])
+    
+    def _join_sentences(self, sentences: List[str]) -> str:
+        return " ".join(s if s[-1] in '.!?' else s + "." for s in sentences)
@@ -0,0 +1,75 @@
+from typing import List, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+class TextChunker:
+    def __init__(self, tokenizer=None, max_tokens: int = 512, overlap_tokens: int = 0, chars_per_token: int = 4):
+        self.tokenizer = tokenizer
+        self.max_tokens = max_tokens
+        self.overlap_tokens = overlap_tokens
+        self.chars_per_token = chars_per_token
+
+    @property
+    def token_budget(self) -> int:
+        budget = self.max_tokens
+        if self.tokenizer is not None:
+            model_max_length = getattr(self.tokenizer, 'model_max_length', None)
+            if isinstance(model_max_length, int) and model_max_length > 0:
+                budget = min(budget, model_max_length)
+            if hasattr(self.tokenizer, 'num_special_tokens_to_add'):
+                budget -= self.tokenizer.num_special_tokens_to_add()
+        return max(budget, 1)
+
+    def count_tokens(self, sentences: List[str]) -> List[int]:
+        if not sentences:
+            return []
+        if self.tokenizer is not None:
+            try:
+                return [len(ids) for ids in self.tokenizer(sentences, add_special_tokens=False)['input_ids']]
+            except Exception as e:
+                logger.warning(f"Tokenizer length count failed, using estimate: {str(e)}")
+        return [max(1, len(sentence) // self.chars_per_token) for sentence in sentences]
+
+    def chunk(self, sentences: List[str], token_counts: Optional[List[int]] = None) -> List[str]:
+        budget = self.token_budget
+        overlap = min(self.overlap_tokens, budget // 2)
+        token_counts = token_counts if token_counts is not None else self.count_tokens(sentences)
+        chunks = []
+        window_start = 0
+        window_tokens = 0
+
+        for i, (sentence, count) in enumerate(zip(sentences, token_counts)):
+            if count > budget:
+                if i > window_start:
+                    chunks.append(" ".join(sentences[window_start:i]))
+                chunks.extend(self._split_long_sentence(sentence, count, budget))
+                window_start = i + 1
+                window_tokens = 0
+                continue
+
+            if window_tokens + count > budget and i > window_start:
+                chunks.append(" ".join(sentences[window_start:i]))
+                new_start = i
+                window_tokens = 0
+                while new_start - 1 > window_start:
+                    previous = token_counts[new_start - 1]
+                    if window_tokens + previous > overlap or window_tokens + previous + count > budget:
+                        break
+                    new_start -= 1
+                    window_tokens += previous
+                window_start = new_start
+
+            window_tokens += count
+
+        if window_start < len(sentences):
+            chunks.append(" ".join(sentences[window_start:]))
+
+        return chunks
+
+    def _split_long_sentence(self, sentence: str, count: int, budget: int) -> List[str]:
+        words = sentence.split()
+        if not words:
+            return []
+        words_per_piece = max(1, len(words) * budget // count)
+        return [" ".join(words[start:start + words_per_piece]) for start in range(0, len(words), words_per_piece)]
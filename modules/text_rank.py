@@ -0,0 +1,84 @@
+from typing import Any, Dict, List, Optional
+import logging
+import numpy as np
+from scipy import sparse
+from modules.analysis_context import AnalysisContext, TOKEN_PATTERN
+from modules.keyword_extractor import STOP_WORDS
+
+logger = logging.getLogger(__name__)
+
+class TextRank:
+    def __init__(self, damping: float = 0.85, tolerance: float = 1e-6, max_iterations: int = 100):
+        self.damping = damping
+        self.tolerance = tolerance
+        self.max_iterations = max_iterations
+
+    def rank_sentences(self, context: AnalysisContext, top_k: Optional[int] = None) -> List[Dict[str, Any]]:
+        spans = context.sentence_spans
+        if not spans:
+            return []
+        starts = np.fromiter((start for start, _ in spans), dtype=np.int64, count=len(spans))
+        rows = np.searchsorted(starts, np.asarray(context.token_offsets, dtype=np.int64), side='right') - 1
+        scores = self.scores(self._sentence_matrix(context.tokens, rows, len(spans)))
+        return [
+            {'index': index, 'start': spans[index][0], 'end': spans[index][1], 'text': context.text[spans[index][0]:spans[index][1]], 'score': float(scores[index])}
+            for index in self._top(scores, top_k)
+        ]
+
+    def rank_texts(self, texts: List[str], top_k: Optional[int] = None) -> List[Dict[str, Any]]:
+        if not texts:
+            return []
+        tokens, rows = [], []
+        for index, text in enumerate(texts):
+            words = TOKEN_PATTERN.findall(text.lower())
+            tokens.extend(words)
+            rows.extend([index] * len(words))
+        scores = self.scores(self._sentence_matrix(tokens, np.asarray(rows, dtype=np.int64), len(texts)))
+        return [{'index': index, 'score': float(scores[index])} for index in self._top(scores, top_k)]
+
+    def scores(self, matrix: sparse.csr_matrix) -> np.ndarray:
+        # PageRank over S = X X^T with a zero diagonal; S is applied as X (X^T v) so it is never materialised
+        size = matrix.shape[0]
+        if size == 0:
+            return np.zeros(0)
+        self_similarity = np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel()
+        transposed = matrix.T.tocsr()
+
+        def similarity_dot(vector):
+            return matrix @ (transposed @ vector) - self_similarity * vector
+
+        out_weight = similarity_dot(np.ones(size))
+        dangling = out_weight <= 1e-9
+        out_weight[dangling] = 1.0
+        rank = np.full(size, 1.0 / size)
+        for iteration in range(self.max_iterations):
+            spread = np.where(dangling, 0.0, rank / out_weight)
+            updated = (1.0 - self.damping) / size + self.damping * (similarity_dot(spread) + rank[dangling].sum() / size)
+            delta = np.abs(updated - rank).sum()
+            rank = updated
+            if delta < self.tolerance:
+                break
+        else:
+            logger.warning(f"TextRank did not converge after {self.max_iterations} iterations (delta {delta:.2e})")
+        return rank
+
+    def _sentence_matrix(self, tokens: List[str], rows: np.ndarray, num_rows: int) -> sparse.csr_matrix:
+        term_ids = {}
+        ids = np.fromiter((term_ids.setdefault(token, len(term_ids)) for token in tokens), dtype=np.int64, count=len(tokens))
+        content = np.fromiter((len(term) >= 3 and term.isalpha() and term not in STOP_WORDS for term in term_ids), dtype=bool, count=len(term_ids))
+        keep = (rows >= 0) & content[ids] if len(ids) else np.zeros(0, dtype=bool)
+
+        counts = sparse.csr_matrix((np.ones(int(keep.sum())), (rows[keep], ids[keep])), shape=(num_rows, len(term_ids)))
+        counts.sum_duplicates()
+        counts.data = 1.0 + np.log(counts.data)
+        document_frequency = np.bincount(counts.indices, minlength=len(term_ids))
+        idf = np.log((1.0 + num_rows) / (1.0 + document_frequency)) + 1.0
+        weighted = counts @ sparse.diags(idf)
+        norms = np.sqrt(np.asarray(weighted.multiply(weighted).sum(axis=1)).ravel())
+        norms[norms == 0] = 1.0
+        return (sparse.diags(1.0 / norms) @ weighted).tocsr()
+
+    def _top(self, scores: np.ndarray, top_k: Optional[int]) -> List[int]:
+        # Highest score first, earlier position first on ties
+        order = np.lexsort((np.arange(len(scores)), -scores))
+        return order[:top_k].tolist() if top_k else order.tolist()
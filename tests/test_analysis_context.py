@@ -0,0 +1,33 @@
+import unittest
+from modules.analysis_context import AnalysisContext
+
+class TestAnalysisContext(unittest.TestCase):
+    def setUp(self):
+        self.text = "Revenue grew strongly. Costs fell!\n\nThe board approved the plan? Yes."
+        self.context = AnalysisContext(self.text)
+
+    def test_sentences_with_offsets(self):
+        self.assertEqual(self.context.sentences, ["Revenue grew strongly.", "Costs fell!", "The board approved the plan?", "Yes."])
+        for sentence, (start, end) in zip(self.context.sentences, self.context.sentence_spans):
+            self.assertEqual(self.text[start:end], sentence)
+
+    def test_paragraphs(self):
+        self.assertEqual(self.context.paragraphs, ["Revenue grew strongly. Costs fell!", "The board approved the plan? Yes."])
+
+    def test_tokens_with_offsets(self):
+        self.assertEqual(self.context.tokens[:3], ["revenue", "grew", "strongly"])
+        self.assertEqual(len(self.context.tokens), len(self.context.token_offsets))
+        self.assertEqual(self.text[self.context.token_offsets[3]:].split()[0], "Costs")
+
+    def test_negated_contractions_split_like_spacy(self):
+        context = AnalysisContext("Sales didn't grow and we can’t wait.")
+
+        self.assertEqual(context.tokens, ["sales", "did", "n't", "grow", "and", "we", "ca", "n’t", "wait"])
+        self.assertEqual(context.token_offsets[2], context.text.index("n't"))
+
+    def test_without_doc_has_no_entities(self):
+        self.assertIsNone(self.context.doc)
+        self.assertEqual(self.context.entities, {})
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,7 +1,16 @@
+import os
+import tempfile
 import unittest
 from app import CorporateDocumentAnalyzer
 
 class TestCorporateDocumentAnalyzer(unittest.TestCase):
+    def setUp(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        previous = os.environ.get("CDA_IDF_DIR")
+        self.addCleanup(lambda: os.environ.pop("CDA_IDF_DIR") if previous is None else os.environ.update(CDA_IDF_DIR=previous))
+        os.environ["CDA_IDF_DIR"] = temp_dir.name
+
     def test_app_initialization(self):
         analyzer = CorporateDocumentAnalyzer()
         
@@ -9,5 +18,15 @@ class TestCorporateDocumentAnalyzer(unittest.TestCase):
         self.assertIsNotNone(analyzer.file_utils)
         self.assertIsNotNone(analyzer.nlp_pipeline)
 
+    def test_pdf_workers_follow_parallelism_budget(self):
+        previous = os.environ.get("CDA_PARALLELISM")
+        self.addCleanup(lambda: os.environ.pop("CDA_PARALLELISM") if previous is None else os.environ.update(CDA_PARALLELISM=previous))
+        os.environ["CDA_PARALLELISM"] = "3"
+        analyzer = CorporateDocumentAnalyzer()
+        self.addCleanup(analyzer.engine.shutdown)
+
+        self.assertEqual(analyzer.engine.budget, 3)
+        self.assertEqual(analyzer.pdf_workers, 3 // analyzer.job_queue.workers)
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,103 @@
+import os
+import json
+import tempfile
+import unittest
+from docx import Document
+from modules.batch_processor import BatchProcessor
+from utils.idf_index import IDFIndex
+
+def create_docx(path: str, text: str):
+    doc = Document()
+    doc.add_paragraph(text)
+    doc.save(path)
+
+class TestBatchProcessor(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.input_dir = os.path.join(self.temp_dir.name, "dump")
+        os.makedirs(os.path.join(self.input_dir, "nested"))
+        for i in range(3):
+            create_docx(os.path.join(self.input_dir, f"memo{i}.docx"), f"The team must review the budget {i}. The board approved the merger.")
+        create_docx(os.path.join(self.input_dir, "nested", "memo3.docx"), "We decided to expand operations.")
+        with open(os.path.join(self.input_dir, "notes.txt"), 'w') as f:
+            f.write("ignored")
+        self.output_path = os.path.join(self.temp_dir.name, "results.jsonl")
+        self.cache_dir = os.path.join(self.temp_dir.name, "cache")
+        # Keep the corpus IDF counts of these runs out of models/idf_index; pool workers inherit the environment
+        self.idf_dir = os.path.join(self.temp_dir.name, "idf")
+        self.addCleanup(self.restore_env, "CDA_IDF_DIR", os.environ.get("CDA_IDF_DIR"))
+        os.environ["CDA_IDF_DIR"] = self.idf_dir
+    
+    def tearDown(self):
+        self.temp_dir.cleanup()
+    
+    def restore_env(self, name, value):
+        if value is None:
+            os.environ.pop(name, None)
+        else:
+            os.environ[name] = value
+
+    def read_records(self):
+        with open(self.output_path, encoding='utf-8') as f:
+            return [json.loads(line) for line in f]
+    
+    def test_discover(self):
+        processor = BatchProcessor(self.output_path)
+        self.assertEqual(len(processor.discover([self.input_dir])), 4)
+        self.assertEqual(len(processor.discover([os.path.join(self.input_dir, "*.docx")])), 3)
+    
+    def test_run_writes_jsonl(self):
+        processor = BatchProcessor(self.output_path, mode="Key Points", workers=1, cache_dir=self.cache_dir)
+        stats = processor.run([self.input_dir])
+        records = self.read_records()
+        
+        self.assertEqual(stats['processed'], 4)
+        self.assertEqual(stats['ok'], 4)
+        self.assertGreater(stats['docs_per_second'], 0)
+        self.assertEqual(len(records), 4)
+        self.assertIn('keywords', records[0]['results'])
+        self.assertEqual(IDFIndex(self.idf_dir).num_docs, 4)
+
+    def test_idf_dir_option(self):
+        idf_dir = os.path.join(self.temp_dir.name, "custom_idf")
+        processor = BatchProcessor(self.output_path, mode="Key Points", workers=1, cache_dir=self.cache_dir, idf_dir=idf_dir)
+        processor.run([self.input_dir])
+
+        self.assertEqual(IDFIndex(idf_dir).num_docs, 4)
+        self.assertEqual(IDFIndex(self.idf_dir).num_docs, 0)
+    
+    def test_resume_from_checkpoint(self):
+        processor = BatchProcessor(self.output_path, mode="Key Points", workers=1, cache_dir=self.cache_dir)
+        processor.run([os.path.join(self.input_dir, "memo0.docx")])
+        with open(self.output_path, 'a', encoding='utf-8') as f:
+            f.write('{"path": "interrupted')
+        
+        stats = processor.run([self.input_dir])
+        records = self.read_records()
+        
+        self.assertEqual(stats['skipped'], 1)
+        self.assertEqual(stats['processed'], 3)
+        self.assertEqual(len({record['path'] for record in records}), 4)
+    
+    def test_resume_retries_failed_documents(self):
+        processor = BatchProcessor(self.output_path, mode="Key Points", workers=1, cache_dir=self.cache_dir)
+        with open(self.output_path, 'w', encoding='utf-8') as f:
+            f.write(json.dumps({'path': os.path.join(self.input_dir, "memo0.docx"), 'status': "error", 'error': "disk busy"}) + "\n")
+            f.write(json.dumps({'path': os.path.join(self.input_dir, "memo1.docx"), 'status': "ok"}) + "\n")
+        
+        stats = processor.run([self.input_dir])
+        statuses = [(record['path'], record['status']) for record in self.read_records()]
+        
+        self.assertEqual(stats['skipped'], 1)
+        self.assertEqual(stats['processed'], 3)
+        self.assertEqual(statuses[-3:].count((os.path.join(self.input_dir, "memo0.docx"), "ok")), 1)
+    
+    def test_process_pool(self):
+        processor = BatchProcessor(self.output_path, mode="Risk Analysis", workers=2, cache_dir=self.cache_dir)
+        stats = processor.run([self.input_dir])
+        
+        self.assertEqual(stats['ok'], 4)
+        self.assertEqual(len(self.read_records()), 4)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+import tempfile
+import unittest
+import numpy as np
+from utils.chunk_memo import ChunkMemo
+from modules.summarizer import Summarizer
+from modules.sentiment_analyzer import SentimentAnalyzer
+
+DISCLAIMER = "This report contains forward-looking statements that involve risks and uncertainties."
+
+class FakeTokenizer:
+    def __call__(self, texts, add_special_tokens=False):
+        return {'input_ids': [text.split() for text in texts]}
+
+class FakeSummarizationPipeline:
+    def __init__(self):
+        self.tokenizer = FakeTokenizer()
+        self.inputs = []
+
+    def __call__(self, batch, **kwargs):
+        self.inputs.extend(batch)
+        return [{'summary_text': f"summary of {text.split()[0]}"} for text in batch]
+
+class CountingSummarizer(Summarizer):
+    pipeline = FakeSummarizationPipeline()
+
+    @property
+    def summarizer(self):
+        return self.pipeline
+
+class CountingSentimentAnalyzer(SentimentAnalyzer):
+    def _run_model(self, chunks):
+        self.inputs = getattr(self, 'inputs', []) + chunks
+        return np.array([[0.25, 0.75]] * len(chunks), dtype=np.float32)
+
+class TestChunkMemo(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.memo = ChunkMemo(self.temp_dir.name)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_key_normalises_whitespace_and_depends_on_model_and_params(self):
+        key = self.memo.key(DISCLAIMER, "bart:torch", {'max_length': 150})
+
+        self.assertEqual(key, self.memo.key("  " + DISCLAIMER.replace(" ", "\n "), "bart:torch", {'max_length': 150}))
+        self.assertNotEqual(key, self.memo.key(DISCLAIMER, "bart:onnx", {'max_length': 150}))
+        self.assertNotEqual(key, self.memo.key(DISCLAIMER, "bart:torch", {'max_length': 100}))
+
+    def test_lookup_counts_hits_and_misses(self):
+        self.memo.store([DISCLAIMER], ["cached"], "bart:torch")
+        values, missing = self.memo.lookup([DISCLAIMER, "Revenue grew in every region."], "bart:torch")
+
+        self.assertEqual(values, ["cached", None])
+        self.assertEqual(missing, [1])
+        self.assertEqual(self.memo.stats(), {'bart:torch': {'hits': 1, 'misses': 1, 'hit_rate': 0.5}})
+        self.assertEqual(ChunkMemo(self.temp_dir.name).lookup([DISCLAIMER], "bart:torch")[0], ["cached"])
+
+    def test_disk_size_bound(self):
+        memo = ChunkMemo(self.temp_dir.name, max_memory_entries=1, max_disk_bytes=300)
+        memo.store([f"chunk {i}" for i in range(20)], ["x" * 40] * 20, "bart:torch")
+
+        self.assertLessEqual(memo.disk_usage(), 300)
+        self.assertEqual(memo.lookup(["chunk 0", "chunk 19"], "bart:torch")[1], [0])
+
+    def test_summarizer_only_infers_new_chunks(self):
+        summarizer = CountingSummarizer(chunk_memo=self.memo)
+        first = summarizer._summarize_chunks([DISCLAIMER, "Alpha revenue grew."], 60, 10)
+        summarizer.pipeline.inputs = []
+        second = summarizer._summarize_chunks(["Beta costs fell.", DISCLAIMER], 60, 10)
+
+        self.assertEqual(first, ["summary of This", "summary of Alpha"])
+        self.assertEqual(second, ["summary of Beta", "summary of This"])
+        self.assertEqual(summarizer.pipeline.inputs, ["Beta costs fell."])
+        self.assertEqual(summarizer._summarize_chunks([DISCLAIMER], 80, 10), ["summary of This"])
+        self.assertEqual(summarizer.pipeline.inputs, ["Beta costs fell.", DISCLAIMER])
+
+    def test_sentiment_only_infers_new_chunks(self):
+        analyzer = CountingSentimentAnalyzer(chunk_memo=self.memo)
+        analyzer._classify_chunks([DISCLAIMER])
+        probabilities = analyzer._classify_chunks(["Margins improved.", DISCLAIMER])
+
+        self.assertEqual(analyzer.inputs, [DISCLAIMER, "Margins improved."])
+        np.testing.assert_allclose(probabilities, [[0.25, 0.75], [0.25, 0.75]])
+        self.assertEqual(self.memo.stats()[analyzer.memo_model]['hits'], 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,104 @@
+import tempfile
+import unittest
+import numpy as np
+from modules.document_analyzer import DocumentAnalyzer, ANALYSIS_SECTIONS
+from modules.execution_engine import ExecutionEngine
+from modules.sentiment_analyzer import SentimentAnalyzer
+from modules.summarizer import Summarizer
+from utils.chunk_memo import ChunkMemo
+from utils.result_cache import ResultCache
+from utils.idf_index import IDFIndex
+
+SAMPLE_TEXT = (
+    "The board approved the merger with Acme Corp. Revenue grew strongly and the outlook is positive. "
+    "However, there is a significant risk of regulatory delay. The team must review the contract before Friday. "
+    "We decided to expand into new markets, which is a major growth opportunity."
+)
+
+class FakeTokenizer:
+    def __call__(self, texts, add_special_tokens=False, **kwargs):
+        return {'input_ids': [text.split() for text in texts]}
+
+class FakeSummarizationPipeline:
+    tokenizer = FakeTokenizer()
+
+    def __call__(self, batch, **kwargs):
+        return [{'summary_text': " ".join(text.split()[:8])} for text in batch]
+
+class FakeSentimentPipeline:
+    tokenizer = FakeTokenizer()
+    model = type("Model", (), {'config': type("Config", (), {'id2label': {0: 'NEGATIVE', 1: 'POSITIVE'}})()})()
+
+# Stand-ins for the hub models, so Full Report runs without downloading or loading BART and DistilBERT
+class FakeSummarizer(Summarizer):
+    @property
+    def summarizer(self):
+        return FakeSummarizationPipeline()
+
+class FakeSentimentAnalyzer(SentimentAnalyzer):
+    @property
+    def analyzer(self):
+        return FakeSentimentPipeline()
+
+    def _run_model(self, chunks):
+        return np.array([[0.25, 0.75]] * len(chunks), dtype=np.float32)
+
+class TestDocumentAnalyzer(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.idf_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.idf_dir.cleanup)
+    
+    def tearDown(self):
+        self.temp_dir.cleanup()
+    
+    def make_analyzer(self, engine):
+        memo_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(memo_dir.cleanup)
+        chunk_memo = ChunkMemo(memo_dir.name)
+        analyzer = DocumentAnalyzer(result_cache=ResultCache(cache_dir=self.temp_dir.name), engine=engine, idf_index=IDFIndex(self.idf_dir.name), chunk_memo=chunk_memo)
+        analyzer.summarizer = FakeSummarizer(chunk_memo=chunk_memo)
+        analyzer.sentiment_analyzer = FakeSentimentAnalyzer(chunk_memo=chunk_memo)
+        self.addCleanup(engine.shutdown)
+        return analyzer
+    
+    def test_pdf_extraction_is_serial_by_default(self):
+        self.assertEqual(self.make_analyzer(ExecutionEngine(process_workers=0)).pdf_workers, 1)
+    
+    def test_sections_ordered_cheapest_first(self):
+        self.assertEqual(list(ANALYSIS_SECTIONS)[0], 'statistics')
+        self.assertEqual(list(ANALYSIS_SECTIONS)[-1], 'summary')
+    
+    def test_concurrent_matches_sequential(self):
+        sequential = self.make_analyzer(ExecutionEngine(thread_workers=1, process_workers=0)).compute_section
+        published = []
+        results = self.make_analyzer(ExecutionEngine(process_workers=0)).analyze_document(SAMPLE_TEXT, "Full Report", on_section=lambda section, values: published.append(section))
+        
+        self.assertEqual(sorted(published), sorted(ANALYSIS_SECTIONS))
+        self.assertEqual(results['risks'], sequential('risks', SAMPLE_TEXT)['risks'])
+        self.assertEqual(results['keywords'], sequential('key_points', SAMPLE_TEXT)['keywords'])
+        self.assertEqual(results['summary'], sequential('summary', SAMPLE_TEXT)['summary'])
+        self.assertEqual(results['summary'], " ".join(SAMPLE_TEXT.split()[:8]))
+        self.assertEqual(results['sentiment']['chunk_scores'], [0.75])
+    
+    def test_process_sections_match_threads(self):
+        threaded = self.make_analyzer(ExecutionEngine(process_workers=0)).analyze_document(SAMPLE_TEXT, "Full Report")
+        ResultCache(cache_dir=self.temp_dir.name).clear()
+        processed = self.make_analyzer(ExecutionEngine(budget=3, process_workers=2, min_process_chars=0)).analyze_document(SAMPLE_TEXT, "Full Report")
+        
+        self.assertEqual(processed['keywords'], threaded['keywords'])
+        self.assertEqual(processed['action_items'], threaded['action_items'])
+        self.assertEqual(processed['risk_items'], threaded['risk_items'])
+        self.assertEqual(processed['opportunities'], threaded['opportunities'])
+    
+    def test_cached_sections_published(self):
+        analyzer = self.make_analyzer(ExecutionEngine())
+        first = analyzer.analyze_document(SAMPLE_TEXT, "Key Points")
+        published = []
+        second = analyzer.analyze_document(SAMPLE_TEXT, "Key Points", on_section=lambda section, values: published.append(section))
+        
+        self.assertEqual(first, second)
+        self.assertEqual(published, ['key_points'])
+
+if __name__ == '__main__':
+    unittest.main()
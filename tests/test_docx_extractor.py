@@ -1,15 +1,77 @@
+import os
+import tempfile
 import unittest
+from docx import Document
 from modules.docx_extractor import DOCXExtractor
 
+def create_sample_docx(path: str):
+    doc = Document()
+    doc.core_properties.title = "Supply Agreement"
+    doc.core_properties.author = "Legal"
+    doc.add_heading("Supply Agreement", level=1)
+    doc.add_paragraph("The supplier shall deliver the goods by 1 March.")
+    doc.add_paragraph("")
+    doc.add_paragraph("Termination for convenience", style='List Paragraph')
+    doc.add_paragraph("Numbered obligation", style='List Number')
+    paragraph = doc.add_paragraph("Line one")
+    paragraph.add_run().add_break()
+    paragraph.add_run("line two\tafter tab")
+
+    table = doc.add_table(rows=3, cols=3)
+    for row_index, row in enumerate(table.rows):
+        for col_index, cell in enumerate(row.cells):
+            cell.text = f"r{row_index}c{col_index}"
+    table.cell(0, 0).merge(table.cell(0, 1))
+    table.cell(1, 2).merge(table.cell(2, 2))
+    table.cell(1, 0).add_table(rows=1, cols=1).cell(0, 0).text = "nested"
+
+    doc.add_heading("Payment Terms", level=2)
+    doc.add_paragraph("Invoices are payable within 30 days.")
+    doc.save(path)
+
 class TestDOCXExtractor(unittest.TestCase):
     def setUp(self):
         self.extractor = DOCXExtractor()
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.docx_path = os.path.join(self.temp_dir.name, "sample.docx")
+        create_sample_docx(self.docx_path)
+    
+    def tearDown(self):
+        self.temp_dir.cleanup()
     
     def test_extractor_initialization(self):
         self.assertIsNotNone(self.extractor)
     
     def test_extract_text_method_exists(self):
         self.assertTrue(hasattr(self.extractor, 'extract_text'))
+    
+    def test_matches_python_docx(self):
+        doc = Document(self.docx_path)
+        expected_text = "\n".join(p.text for p in doc.paragraphs if p.text.strip())
+        expected_tables = [[[cell.text.strip() for cell in row.cells] for row in table.rows] for table in doc.tables]
+        
+        self.assertEqual(self.extractor.extract_text(self.docx_path), expected_text)
+        self.assertEqual(self.extractor.extract_tables(self.docx_path), expected_tables)
+        self.assertEqual(self.extractor.extract_structure(self.docx_path), {'headings': ["Supply Agreement", "Payment Terms"], 'lists': ["Termination for convenience"]})
+        self.assertEqual(self.extractor.extract_metadata(self.docx_path)['paragraph_count'], len(doc.paragraphs))
+    
+    def test_ingest_single_pass(self):
+        result = self.extractor.ingest(self.docx_path)
+        
+        self.assertEqual(result['text'], self.extractor.extract_text(self.docx_path))
+        self.assertEqual(result['tables'], self.extractor.extract_tables(self.docx_path))
+        self.assertEqual(result['headings'], ["Supply Agreement", "Payment Terms"])
+        self.assertEqual(result['metadata']['title'], "Supply Agreement")
+        self.assertEqual(result['metadata']['author'], "Legal")
+        self.assertIn('list_item', [block['type'] for block in result['paragraphs']])
+    
+    def test_invalid_file(self):
+        bad_path = os.path.join(self.temp_dir.name, "broken.docx")
+        with open(bad_path, 'w') as f:
+            f.write("not a docx")
+        
+        self.assertEqual(self.extractor.extract_text(bad_path), "")
+        self.assertEqual(self.extractor.ingest(bad_path)['tables'], [])
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,50 @@
+import os
+import unittest
+from modules.execution_engine import ExecutionEngine
+
+try:
+    import torch
+except ImportError:
+    torch = None
+
+class TestExecutionEngine(unittest.TestCase):
+    def test_budget_split(self):
+        engine = ExecutionEngine(budget=8)
+        
+        self.assertEqual(engine.process_workers, 2)
+        self.assertEqual(engine.model_threads, 6)
+        self.assertEqual(ExecutionEngine(budget=1).process_workers, 0)
+        self.assertEqual(ExecutionEngine(budget=4, process_workers=10).process_workers, 3)
+    
+    def test_inference_threads_split_between_concurrent_models(self):
+        self.assertEqual(ExecutionEngine(budget=8, concurrent_models=3).inference_threads, 2)
+        self.assertEqual(ExecutionEngine(budget=2, concurrent_models=4).inference_threads, 1)
+    
+    @unittest.skipUnless(torch, "torch is not installed")
+    def test_inference_threads_set_once_at_start_up(self):
+        previous = torch.get_num_threads()
+        self.addCleanup(torch.set_num_threads, previous)
+        engine = ExecutionEngine(budget=8, concurrent_models=3)
+        
+        self.assertEqual(engine.inference_threads, 2)
+        self.assertEqual(torch.get_num_threads(), 2)
+        self.assertFalse(hasattr(engine, 'configure_model_threads'))
+    
+    def test_process_threshold(self):
+        engine = ExecutionEngine(budget=4, min_process_chars=1000)
+        
+        self.assertFalse(engine.use_processes(999))
+        self.assertTrue(engine.use_processes(1000))
+        self.assertFalse(ExecutionEngine(budget=4, process_workers=0).use_processes(10 ** 9))
+    
+    def test_submit(self):
+        engine = ExecutionEngine(budget=2, min_process_chars=0)
+        self.addCleanup(engine.shutdown)
+        
+        self.assertEqual(engine.submit(sum, [1, 2, 3]).result(), 6)
+        self.assertNotEqual(engine.submit(os.getpid, kind="process", payload_chars=1).result(), os.getpid())
+        with self.assertRaises(ValueError):
+            engine.submit(sum, [1], kind="gpu")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,46 @@
+import unittest
+from utils.highlight_utils import HighlightUtils
+
+TEXT = "Significant risk of <b>delay</b>. The team must review the risk register & growth plan."
+
+class TestHighlightUtils(unittest.TestCase):
+    def setUp(self):
+        self.highlighter = HighlightUtils()
+    
+    def test_category_priority_on_overlap(self):
+        spans = self.highlighter.find_spans(TEXT, {'keyword': ['risk', 'growth plan'], 'risk': ['risk of <b>delay'], 'action_item': ['review the risk register']})
+        
+        self.assertEqual(spans, [(12, 28, 'risk'), (48, 72, 'action_item'), (75, 86, 'keyword')])
+    
+    def test_markup_is_escaped_and_never_rematched(self):
+        highlighted = self.highlighter.highlight_text(TEXT, {'keyword': ['span', 'style', 'delay'], 'risk': ['significant risk']})
+        
+        self.assertEqual(highlighted.count('<span'), 2)
+        self.assertIn('&lt;b&gt;<span style="background-color: #ffccff; padding: 2px; border-radius: 2px;">delay</span>&lt;/b&gt;', highlighted)
+        self.assertTrue(highlighted.startswith('<span style="background-color: #ffcccc; padding: 2px; border-radius: 2px;">Significant risk</span>'))
+        self.assertIn('&amp; growth plan.', highlighted)
+    
+    def test_case_insensitive_keeps_original_text(self):
+        self.assertEqual(self.highlighter.highlight_text("RISK and Risk", {'risk': ['risk']}).count('>RISK</span>'), 1)
+        self.assertEqual(self.highlighter.find_spans("RISK and Risk", {'risk': ['risk']}), [(0, 4, 'risk'), (9, 13, 'risk')])
+        self.assertEqual(self.highlighter.highlight_text("a < b", {}), "a &lt; b")
+    
+    def test_render_window_clips_spans(self):
+        spans = self.highlighter.find_spans(TEXT, {'risk': ['significant risk of']})
+        
+        self.assertEqual(self.highlighter.render(TEXT, spans, 12, 22), '<span style="background-color: #ffcccc; padding: 2px; border-radius: 2px;">risk of</span> &lt;b')
+        self.assertEqual(self.highlighter.render(TEXT, spans, 38, 42), 'team')
+    
+    def test_paginate_covers_text_on_boundaries(self):
+        text = "First paragraph here.\n\nSecond paragraph is a bit longer.\nThird line." * 20
+        pages = self.highlighter.paginate(text, page_chars=100)
+        
+        self.assertEqual(pages[0][0], 0)
+        self.assertEqual(pages[-1][1], len(text))
+        self.assertTrue(all(previous[1] == following[0] for previous, following in zip(pages, pages[1:])))
+        self.assertTrue(all(end - start <= 100 for start, end in pages))
+        self.assertTrue(all(text[end - 1] in '\n ' for _, end in pages[:-1]))
+        self.assertEqual(self.highlighter.paginate(""), [])
+
+if __name__ == '__main__':
+    unittest.main()
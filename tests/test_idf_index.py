@@ -0,0 +1,56 @@
+import os
+import pickle
+import tempfile
+import unittest
+from utils.idf_index import IDFIndex
+
+class TestIDFIndex(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.index = IDFIndex(self.temp_dir.name)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_empty_index_is_neutral(self):
+        self.assertEqual(self.index.num_docs, 0)
+        self.assertEqual(self.index.idf(["revenue", "growth"]).tolist(), [1.0, 1.0])
+
+    def test_add_document_counts_each_term_once(self):
+        self.assertTrue(self.index.add_document("a", ["revenue", "revenue", "growth", "of", "q3"]))
+        self.assertTrue(self.index.add_document("b", ["revenue", "margin"]))
+        self.assertFalse(self.index.add_document("a", ["revenue"]))
+
+        self.assertEqual(self.index.num_docs, 2)
+        self.assertEqual(self.index.num_terms, 3)
+        common, rare, unseen = self.index.idf(["revenue", "growth", "unseen"])
+        self.assertLess(common, rare)
+        self.assertLess(rare, unseen)
+
+    def test_persists_across_instances(self):
+        self.index.add_document("a", ["revenue", "growth"])
+        reopened = IDFIndex(self.temp_dir.name)
+        reopened.add_document("b", ["revenue"])
+
+        self.assertEqual(reopened.num_docs, 2)
+        self.assertEqual(self.index.num_docs, 2)
+        self.assertEqual(self.index.idf(["revenue"]).tolist(), reopened.idf(["revenue"]).tolist())
+
+    def test_uncommitted_tail_is_discarded(self):
+        self.index.add_document("a", ["revenue", "growth"])
+        with open(os.path.join(self.temp_dir.name, "vocab.txt"), 'a', encoding='utf-8') as f:
+            f.write("partial\n")
+        self.index.add_document("b", ["margin"])
+
+        reopened = IDFIndex(self.temp_dir.name)
+        self.assertEqual(reopened.num_terms, 3)
+        self.assertLess(reopened.idf(["margin"])[0], reopened.idf(["partial"])[0])
+
+    def test_pickle_reloads_from_disk(self):
+        self.index.add_document("a", ["revenue"])
+        restored = pickle.loads(pickle.dumps(self.index))
+
+        self.assertEqual(restored.num_docs, 1)
+
+if __name__ == '__main__':
+    unittest.main()
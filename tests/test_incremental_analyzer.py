@@ -0,0 +1,217 @@
+import os
+import tempfile
+import unittest
+import fitz
+import numpy as np
+from modules.document_analyzer import DocumentAnalyzer
+from modules.execution_engine import ExecutionEngine
+from modules.incremental_analyzer import IncrementalAnalyzer
+from modules.sentiment_analyzer import SentimentAnalyzer
+from modules.summarizer import Summarizer
+from utils.chunk_memo import ChunkMemo
+from utils.result_cache import ResultCache
+from utils.idf_index import IDFIndex
+
+TEMPLATES = [
+    "Section {i} notes that revenue in region {i} grew by {i} percent during the year.",
+    "There is a significant risk of regulatory delay for project {i}.",
+    "The team must review contract {i} before the next board meeting.",
+    "The board decided to expand product line {i} into two new markets.",
+    "Failure to renew licence {i} could disrupt operations in that market.",
+    "This represents an opportunity for margin improvement in unit {i}."
+]
+
+def make_document(count=36):
+    return "\n".join(TEMPLATES[i % len(TEMPLATES)].format(i=i) for i in range(count))
+
+def revise(text):
+    lines = text.split("\n")
+    lines[7] = "There is a major threat of litigation affecting project 7."
+    lines.insert(20, "Management must review the hedging policy by March.")
+    del lines[30]
+    return "\n".join(lines)
+
+class CountingIncrementalAnalyzer(IncrementalAnalyzer):
+    scanned = 0
+
+    def _scan(self, section, paragraph):
+        self.scanned += 1
+        return super()._scan(section, paragraph)
+
+class FakeTokenizer:
+    def __call__(self, texts, add_special_tokens=False, **kwargs):
+        return {'input_ids': [text.split() for text in texts]}
+
+class FakeSummarizationPipeline:
+    tokenizer = FakeTokenizer()
+
+    def __call__(self, batch, **kwargs):
+        return [{'summary_text': " ".join(text.split()[:8]) + "."} for text in batch]
+
+class FakeSentimentPipeline:
+    tokenizer = FakeTokenizer()
+    model = type("Model", (), {'config': type("Config", (), {'id2label': {0: 'NEGATIVE', 1: 'POSITIVE'}})()})()
+
+class FakeSummarizer(Summarizer):
+    @property
+    def summarizer(self):
+        return FakeSummarizationPipeline()
+
+class FakeSentimentAnalyzer(SentimentAnalyzer):
+    @property
+    def analyzer(self):
+        return FakeSentimentPipeline()
+
+    def _run_model(self, chunks):
+        return np.array([[0.25, 0.75]] * len(chunks), dtype=np.float32)
+
+class TestIncrementalAnalyzer(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+
+    def make_analyzer(self, engine=None):
+        cache_dir = tempfile.TemporaryDirectory()
+        idf_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(cache_dir.cleanup)
+        self.addCleanup(idf_dir.cleanup)
+        engine = engine or ExecutionEngine(process_workers=0)
+        self.addCleanup(engine.shutdown)
+        chunk_memo = ChunkMemo(self.temp_dir.name)
+        analyzer = DocumentAnalyzer(result_cache=ResultCache(cache_dir=cache_dir.name), engine=engine, idf_index=IDFIndex(idf_dir.name), chunk_memo=chunk_memo)
+        # Hub models stay out of the test: Full Report runs the fake pipelines, so the summary comparison is meaningful
+        analyzer.summarizer = FakeSummarizer(max_chunk_tokens=60, chunk_memo=chunk_memo)
+        analyzer.sentiment_analyzer = FakeSentimentAnalyzer(chunk_memo=chunk_memo)
+        analyzer.incremental = CountingIncrementalAnalyzer(analyzer.result_cache, analyzer.keyword_extractor, analyzer.risk_detector)
+        return analyzer
+
+    def test_segment_follows_extractor_lines(self):
+        segmenter = IncrementalAnalyzer(None, None, None)
+        text = "Risk Factors\n  Our results depend on\nsupplier pricing.\n\nTable of contents\n\nOne. Two.  \nTail"
+
+        self.assertEqual([text[start:end] for start, end in segmenter.segment(text)], ["Risk Factors\n  Our results depend on\nsupplier pricing.", "Table of contents\n\nOne. Two.", "Tail"])
+
+    def test_revision_matches_fresh_analysis_and_rescans_changed_paragraphs(self):
+        original, revised = make_document(), revise(make_document())
+        analyzer = self.make_analyzer()
+        analyzer.analyze_document(original, "Full Report", document_id="report.docx")
+        analyzer.incremental.scanned = 0
+        incremental = analyzer.analyze_document(revised, "Full Report", document_id="report.docx")
+        fresh = self.make_analyzer().analyze_document(revised, "Full Report", document_id="report.docx")
+
+        # Two changed paragraphs for each of the two scanned sections
+        self.assertEqual(analyzer.incremental.scanned, 4)
+        for key in ('risk_items', 'opportunity_items', 'action_item_matches', 'decision_matches', 'summary'):
+            self.assertEqual(incremental[key], fresh[key], key)
+        self.assertNotIn('changes', fresh)
+        # The summary came from the (fake) model, with unchanged paragraph chunks served from the chunk memo
+        self.assertGreater(analyzer.chunk_memo.stats()[analyzer.summarizer.memo_model]['hits'], 0)
+        self.assertIn('chunk_scores', incremental['sentiment'])
+
+    def test_matches_spanning_a_blank_line_survive_a_revision(self):
+        heading = "Failure to renew key licences\n\nThe company must notify regulators soon."
+        original = make_document(12) + "\n" + heading + "\n" + make_document(6)
+        revised = original.replace("revenue in region 0 grew", "revenue in region 0 fell", 1)
+        analyzer = self.make_analyzer()
+        analyzer.analyze_document(original, "Risk Analysis", document_id="report.docx")
+        incremental = analyzer.analyze_document(revised, "Risk Analysis", document_id="report.docx")
+        fresh = self.make_analyzer().analyze_document(revised, "Risk Analysis")
+
+        self.assertIn("Failure to renew key licences\n\nThe company must notify regulators soon.", fresh['risks'])
+        self.assertEqual(incremental['risk_items'], fresh['risk_items'])
+        self.assertEqual(incremental['changes']['paragraphs']['modified'], 1)
+
+    def test_iter_paragraphs_matches_segment_for_any_split(self):
+        segmenter = IncrementalAnalyzer(None, None, None)
+        text = "Heading\n\n" + make_document(8) + "\n\nTail without end"
+        expected = segmenter.segment(text)
+        for size in (1, 7, 50, len(text)):
+            pieces = [text[i:i + size] for i in range(0, len(text), size)]
+            paragraphs = list(segmenter.iter_paragraphs(pieces))
+
+            self.assertEqual([(start, end) for start, end, _ in paragraphs], expected)
+            self.assertEqual([paragraph for _, _, paragraph in paragraphs], [text[start:end] for start, end in expected])
+
+    def test_pdf_pages_are_scanned_during_extraction(self):
+        path = os.path.join(self.temp_dir.name, "report.pdf")
+        lines = make_document(60).split("\n")
+        doc = fitz.open()
+        for start in range(0, len(lines), 6):
+            doc.new_page().insert_textbox(fitz.Rect(36, 36, 576, 756), "\n".join(lines[start:start + 6]), fontsize=9)
+        doc.save(path)
+        doc.close()
+
+        analyzer = self.make_analyzer()
+        text = analyzer.extract_text(path, "pdf", doc_hash="pdf-hash", document_id="report.pdf")
+        prescanned = analyzer.incremental.scanned
+        results = analyzer.analyze_document(text, "Key Points", "pdf-hash", document_id="report.pdf")
+        fresh = self.make_analyzer().analyze_document(text, "Key Points")
+
+        self.assertEqual(text, analyzer.extract_text(path, "pdf"))
+        self.assertEqual(prescanned, 2 * len(analyzer.incremental.segment(text)))
+        self.assertEqual(analyzer.incremental.scanned, prescanned)
+        self.assertEqual(results['action_item_matches'], fresh['action_item_matches'])
+
+    def test_first_version_runs_on_processes_and_seeds_the_next_revision(self):
+        original, revised = make_document(), revise(make_document())
+        analyzer = self.make_analyzer(ExecutionEngine(budget=3, process_workers=2, min_process_chars=0))
+        first = analyzer.analyze_document(original, "Full Report", document_id="report.docx")
+        fresh = self.make_analyzer().analyze_document(original, "Full Report")
+
+        # The worker process does the scanning, so the parent's counter is untouched
+        self.assertEqual(analyzer.incremental.scanned, 0)
+        for key in ('risk_items', 'opportunity_items', 'action_item_matches', 'decision_matches'):
+            self.assertEqual(first[key], fresh[key], key)
+
+        analyzer.analyze_document(revised, "Full Report", document_id="report.docx")
+        self.assertEqual(analyzer.incremental.scanned, 4)
+
+    def test_change_report(self):
+        original, revised = make_document(), revise(make_document())
+        analyzer = self.make_analyzer()
+        analyzer.analyze_document(original, "Full Report", document_id="report.docx", owner="alice")
+        changes = analyzer.analyze_document(revised, "Full Report", document_id="report.docx", owner="alice", previous_text=original)['changes']
+
+        self.assertEqual(changes['paragraphs'], {'added': 1, 'removed': 1, 'modified': 1, 'unchanged': 34})
+        self.assertEqual([(change['type'], change['old_index'], change['new_index']) for change in changes['changes']], [('modified', 7, 7), ('added', None, 20), ('removed', 29, None)])
+        self.assertEqual(changes['changes'][0]['new_text'], "There is a major threat of litigation affecting project 7.")
+        self.assertEqual(changes['changes'][0]['old_text'], "There is a significant risk of regulatory delay for project 7.")
+        self.assertIn("There is a major threat of litigation affecting project 7.", changes['risks_added'])
+        self.assertEqual(changes['action_items_added'], ["review the hedging policy by March."])
+        self.assertEqual(changes['risks_removed'], ["There is a significant risk of regulatory delay for project 7."])
+        self.assertEqual(changes['opportunities_removed'], ["This represents an opportunity for margin improvement in unit 29."])
+
+        again = analyzer.analyze_document(revised, "Key Points", document_id="report.docx", owner="alice")
+        self.assertEqual(again['changes']['paragraphs'], changes['paragraphs'])
+        self.assertIsNone(again['changes']['changes'][0]['old_text'])
+        self.assertEqual(again['changes']['action_items_removed'], [])
+        self.assertEqual(again['changes']['action_items_removed_count'], 0)
+
+    def test_versions_are_scoped_to_owner_and_hold_no_text(self):
+        original, revised = make_document(), revise(make_document())
+        analyzer = self.make_analyzer()
+        analyzer.analyze_document(original, "Risk Analysis", document_id="report.docx", owner="alice")
+        other = analyzer.analyze_document(revised, "Risk Analysis", document_id="report.docx", owner="bob")
+
+        self.assertNotIn('changes', other)
+        record = analyzer.result_cache.get(analyzer.incremental._record_key("alice", "report.docx"))
+        self.assertNotIn("project", str(record))
+        self.assertEqual(set(record['current']), {'doc_hash', 'fingerprints', 'items'})
+        for section in IncrementalAnalyzer.SECTIONS:
+            stored = analyzer.result_cache.get(analyzer.incremental._hits_key(record['current']['doc_hash'], section))
+            self.assertNotIn("project", str(stored))
+
+    def test_paragraph_chunks_stay_stable_around_an_edit(self):
+        summarizer = FakeSummarizer(max_chunk_tokens=60, chunk_memo=ChunkMemo(self.temp_dir.name))
+        segmenter = IncrementalAnalyzer(None, None, None)
+        original, revised = make_document(120), revise(make_document(120))
+        before = summarizer._chunk_paragraphs(segmenter.paragraphs(original, segmenter.version("a", original)))
+        after = summarizer._chunk_paragraphs(segmenter.paragraphs(revised, segmenter.version("b", revised)))
+
+        self.assertTrue(all(len(chunk.split()) <= 60 for chunk in after))
+        # At most the chunks on either side of each of the three edits change
+        self.assertLessEqual(len(set(after) - set(before)), 6)
+        self.assertGreater(len(after), 10)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+import os
+import tempfile
+import unittest
+from modules.inference_backend import InferenceBackend
+from utils.text_metrics import TextMetrics
+
+MODEL_DIR = os.environ.get("CDA_MODEL_DIR")
+
+SUMMARY_TEXTS = [
+    "The board reviewed the quarterly results and noted that revenue grew by eight percent compared with the prior year. "
+    "Management expects continued pressure on margins because of higher input costs and a volatile currency environment. "
+    "The company plans to expand its digital services business, which is expected to be the main driver of growth next year.",
+    "Legal counsel highlighted pending litigation in two markets that could result in additional compliance costs. "
+    "The audit committee confirmed that the internal control review was completed without material findings. "
+    "Several regional offices will be consolidated to reduce overhead and improve coordination between sales teams."
+]
+
+SENTIMENT_TEXTS = [
+    "Revenue grew strongly and the outlook for next year is excellent.",
+    "The company reported a significant loss and expects further decline.",
+    "Customer satisfaction improved across every region.",
+    "The project failed to meet its deadlines and costs increased sharply.",
+    "We are pleased with the successful launch of the new platform.",
+    "Regulators opened an investigation into accounting irregularities."
+]
+
+class TestInferenceBackend(unittest.TestCase):
+    def test_default_backend(self):
+        backend = InferenceBackend(model_dir="")
+        self.assertIn(backend.name, ("torch", "quantized", "onnx"))
+
+    def test_unknown_backend(self):
+        with self.assertRaises(ValueError):
+            InferenceBackend("tensorrt")
+
+    def test_resolve_model_from_local_directory(self):
+        with tempfile.TemporaryDirectory() as model_dir:
+            os.makedirs(os.path.join(model_dir, "bart-large-cnn"))
+            backend = InferenceBackend("torch", model_dir)
+
+            self.assertTrue(backend.offline)
+            self.assertEqual(backend.resolve_model("facebook/bart-large-cnn"), os.path.join(model_dir, "bart-large-cnn"))
+
+@unittest.skipUnless(MODEL_DIR, "CDA_MODEL_DIR is not set, skipping backend parity tests")
+class TestBackendParity(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.metrics = TextMetrics()
+        cls.reference = {
+            'summarization': InferenceBackend("torch", MODEL_DIR).load_pipeline("summarization", "facebook/bart-large-cnn"),
+            'sentiment-analysis': InferenceBackend("torch", MODEL_DIR).load_pipeline("sentiment-analysis", "distilbert-base-uncased-finetuned-sst-2-english")
+        }
+
+    def _check_parity(self, backend_name):
+        backend = InferenceBackend(backend_name, MODEL_DIR)
+
+        summarizer = backend.load_pipeline("summarization", "facebook/bart-large-cnn")
+        for text in SUMMARY_TEXTS:
+            expected = self.reference['summarization'](text, max_length=60, min_length=10, do_sample=False)[0]['summary_text']
+            actual = summarizer(text, max_length=60, min_length=10, do_sample=False)[0]['summary_text']
+            self.assertGreaterEqual(self.metrics.rouge_l(expected, actual), 0.6)
+
+        analyzer = backend.load_pipeline("sentiment-analysis", "distilbert-base-uncased-finetuned-sst-2-english")
+        expected_labels = [result['label'] for result in self.reference['sentiment-analysis'](SENTIMENT_TEXTS)]
+        actual_labels = [result['label'] for result in analyzer(SENTIMENT_TEXTS)]
+        self.assertGreaterEqual(self.metrics.label_agreement(expected_labels, actual_labels), 0.95)
+
+    def test_quantized_parity(self):
+        self._check_parity("quantized")
+
+    def test_onnx_parity(self):
+        self._check_parity("onnx")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+import time
+import threading
+import unittest
+from modules.job_queue import JobQueue, QueueFull
+
+def wait_for(job, timeout=5.0):
+    deadline = time.time() + timeout
+    while not job.done and time.time() < deadline:
+        time.sleep(0.01)
+    return job
+
+def counting_job(job, steps):
+    for step in range(1, steps + 1):
+        job.report("chunks summarised", step, steps)
+        job.publish(f"section{step}", {f"value{step}": step})
+    return steps
+
+def blocking_job(job, started, release):
+    started.set()
+    while not release.wait(0.01):
+        job.report("waiting", 0)
+    return "released"
+
+class TestJobQueue(unittest.TestCase):
+    def setUp(self):
+        self.queue = JobQueue(workers=1, max_pending=2)
+    
+    def tearDown(self):
+        self.queue.shutdown()
+    
+    def test_job_completes_with_progress(self):
+        job = wait_for(self.queue.get(self.queue.submit(counting_job, 3)))
+        
+        self.assertEqual(job.status, "completed")
+        self.assertEqual(job.result, 3)
+        self.assertEqual(job.progress["chunks summarised"], (3, 3))
+        self.assertEqual(job.results(), {'value1': 1, 'value2': 2, 'value3': 3})
+    
+    def test_cancel_running_job(self):
+        started, release = threading.Event(), threading.Event()
+        job_id = self.queue.submit(blocking_job, started, release)
+        started.wait(5)
+        
+        self.assertTrue(self.queue.cancel(job_id))
+        self.assertEqual(wait_for(self.queue.get(job_id)).status, "cancelled")
+        self.assertFalse(self.queue.cancel(job_id))
+    
+    def test_bounded_queue(self):
+        started, release = threading.Event(), threading.Event()
+        running_id = self.queue.submit(blocking_job, started, release)
+        started.wait(5)
+        queued_ids = [self.queue.submit(counting_job, 1) for _ in range(2)]
+        
+        with self.assertRaises(QueueFull):
+            self.queue.submit(counting_job, 1)
+        self.queue.cancel(queued_ids[0])
+        release.set()
+        
+        self.assertEqual(wait_for(self.queue.get(running_id)).status, "completed")
+        self.assertEqual(wait_for(self.queue.get(queued_ids[0])).status, "cancelled")
+        self.assertEqual(wait_for(self.queue.get(queued_ids[1])).status, "completed")
+    
+    def test_failed_job(self):
+        job = wait_for(self.queue.get(self.queue.submit(lambda job: 1 / 0)))
+        
+        self.assertEqual(job.status, "failed")
+        self.assertIn("division", job.error)
+
+if __name__ == '__main__':
+    unittest.main()
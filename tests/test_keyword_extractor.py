@@ -0,0 +1,85 @@
+import time
+import tempfile
+import unittest
+from modules.analysis_context import AnalysisContext
+from modules.keyword_extractor import KeywordExtractor
+from utils.idf_index import IDFIndex
+
+SAMPLE_TEXT = (
+    "The team will review the budget before Friday. "
+    "Action item: prepare the vendor shortlist. "
+    "It was decided to close the Leeds office next year. "
+    "Revenue was flat. "
+    "The board approved the revised hiring plan!"
+)
+
+class TestKeywordExtractor(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.extractor = KeywordExtractor(idf_index=IDFIndex(self.temp_dir.name))
+    
+    def test_action_items_and_decisions(self):
+        self.assertEqual(self.extractor.extract_action_items(SAMPLE_TEXT), ["review the budget before Friday.", "prepare the vendor shortlist."])
+        self.assertEqual(self.extractor.extract_decisions(SAMPLE_TEXT), ["to close the Leeds office next year.", "the revised hiring plan!"])
+    
+    def test_matches_have_offsets_and_category(self):
+        matches = self.extractor.scan(SAMPLE_TEXT)
+        
+        self.assertEqual([match['category'] for match in matches], ['action_item', 'action_item', 'decision', 'decision'])
+        self.assertEqual([match['sentence_index'] for match in matches], [0, 1, 2, 4])
+        for match in matches:
+            self.assertEqual(SAMPLE_TEXT[match['start']:match['end']], match['text'])
+    
+    def test_one_match_per_sentence_and_category(self):
+        text = "We must ensure the auditors review the ledger. Please ensure the auditors review the ledger."
+        
+        self.assertEqual(self.extractor.extract_action_items(text), ["ensure the auditors review the ledger.", "the auditors review the ledger."])
+        self.assertEqual(self.extractor.extract_action_items("Ensure the report is complete. Ensure the report is complete."), ["the report is complete."])
+    
+    def test_verb_required_after_trigger(self):
+        self.assertEqual(self.extractor.extract_action_items("Prices will rise sharply in the spring."), [])
+        self.assertEqual(self.extractor.extract_action_items("Submit it, the team will rise sharply."), [])
+        self.assertEqual(self.extractor.extract_action_items("THE TEAM WILL SUBMIT THE REPORT TOMORROW."), ["SUBMIT THE REPORT TOMORROW."])
+    
+    def test_unterminated_text_is_linear(self):
+        text = "Task Owner will must should decided team review pending " * 4000
+        
+        start = time.perf_counter()
+        matches = self.extractor.scan(text)
+        
+        self.assertEqual(matches, [])
+        self.assertLess(time.perf_counter() - start, 1.0)
+    
+    def test_key_points_include_matches(self):
+        key_points = self.extractor.extract_key_points(SAMPLE_TEXT)
+        
+        self.assertEqual(key_points['action_items'], [match['text'] for match in key_points['action_item_matches']])
+        self.assertEqual(key_points['decisions'], [match['text'] for match in key_points['decision_matches']])
+        self.assertIn('budget', key_points['keywords'])
+        self.assertEqual(key_points['keywords'], [keyphrase['phrase'] for keyphrase in key_points['keyphrases']])
+    
+    def test_repeated_phrases_and_stop_words(self):
+        text = "The supply chain review shall start. Supply chain delays shall end. The review is also due."
+        keyphrases = self.extractor.extract_keyphrases(text)
+        
+        self.assertEqual(keyphrases[0], {'phrase': 'supply chain', 'score': 4.0, 'count': 2})
+        self.assertNotIn('shall', [keyphrase['phrase'] for keyphrase in keyphrases])
+        self.assertNotIn('chain review', [keyphrase['phrase'] for keyphrase in keyphrases])
+    
+    def test_phrases_do_not_cross_punctuation(self):
+        keywords = self.extractor.extract_keywords("Revenue, growth. Revenue, growth. Revenue growth!")
+        
+        self.assertEqual(keywords, ['revenue', 'growth'])
+    
+    def test_corpus_idf_demotes_common_terms(self):
+        for number in range(8):
+            self.extractor.idf_index.add_document(f"doc{number}", AnalysisContext(f"The company reported results for region {number}.").tokens)
+        
+        keywords = self.extractor.extract_keywords("The company expects litigation. The company faces litigation costs. The company grew.")
+        
+        self.assertEqual(keywords[0], 'litigation')
+        self.assertEqual(keywords.index('company'), len(keywords) - 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,109 @@
+import os
+import tempfile
+import unittest
+from modules.analysis_context import AnalysisContext
+from modules.lexicon_sentiment import LexiconSentiment
+from modules.sentiment_analyzer import SentimentAnalyzer
+
+class FakeToken:
+    def __init__(self, text, idx):
+        self.text = text
+        self.idx = idx
+        self.lower_ = text.lower()
+        self.lemma_ = self.lower_
+        self.is_punct = not any(char.isalnum() for char in text)
+        self.is_space = text.isspace()
+        self.is_stop = False
+
+class FakeSpan:
+    def __init__(self, start_char, end_char):
+        self.start_char = start_char
+        self.end_char = end_char
+
+class FakeDoc:
+    # Tokens as spaCy's English tokenizer splits them, e.g. didn't -> did + n't
+    def __init__(self, text, words):
+        self.tokens = []
+        offset = 0
+        for word in words:
+            offset = text.index(word, offset)
+            self.tokens.append(FakeToken(word, offset))
+            offset += len(word)
+        self.sents = [FakeSpan(0, len(text))]
+        self.ents = []
+
+    def __iter__(self):
+        return iter(self.tokens)
+
+class TestLexiconSentiment(unittest.TestCase):
+    def setUp(self):
+        self.lexicon = LexiconSentiment()
+    
+    def test_punctuation_attached_words_match(self):
+        result = self.lexicon.analyze(AnalysisContext("We reported a loss, a decline; and litigation."))
+        
+        self.assertEqual(result['label'], 'NEGATIVE')
+        self.assertEqual(result['sentence_scores'], [-1.0])
+    
+    def test_negation_flips_within_sentence(self):
+        result = self.lexicon.analyze(AnalysisContext("There was no significant loss. Margins are weak. Growth did not improve."))
+        
+        self.assertEqual(result['sentence_scores'], [1.0, -1.0, 0.0])
+    
+    def test_contractions_negate_like_full_forms(self):
+        expected = self.lexicon.analyze(AnalysisContext("Margins did not improve."))['sentence_scores']
+        spacy_docs = {
+            "Margins did not improve.": ["Margins", "did", "not", "improve", "."],
+            "Margins didn't improve.": ["Margins", "did", "n't", "improve", "."],
+            "Margins didn’t improve.": ["Margins", "did", "n’t", "improve", "."],
+            "Margins can't improve.": ["Margins", "ca", "n't", "improve", "."],
+            "Margins cannot improve.": ["Margins", "can", "not", "improve", "."],
+            "Margins won't improve.": ["Margins", "wo", "n't", "improve", "."]
+        }
+
+        self.assertEqual(expected, [-1.0])
+        for text, words in spacy_docs.items():
+            self.assertEqual(self.lexicon.analyze(AnalysisContext(text, FakeDoc(text, words)))['sentence_scores'], expected, text)
+            self.assertEqual(self.lexicon.analyze(AnalysisContext(text))['sentence_scores'], expected, text)
+
+    def test_tokenizer_fragments_do_not_negate(self):
+        self.assertEqual(self.lexicon.analyze(AnalysisContext("AT&T profit improved."))['sentence_scores'], [1.0])
+        self.assertEqual(self.lexicon.analyze(AnalysisContext("We don t expect it, profit improved."))['sentence_scores'], [1.0])
+        self.assertNotIn("t", self.lexicon.vocab)
+    
+    def test_negation_does_not_cross_sentences(self):
+        result = self.lexicon.analyze(AnalysisContext("We did not. Growth was strong."))
+        
+        self.assertEqual(result['sentence_scores'], [0.0, 1.0])
+    
+    def test_sections_follow_paragraphs(self):
+        text = "Revenue grew strongly. Profitability improved.\n\nThe restructuring caused delays and losses."
+        result = self.lexicon.analyze(AnalysisContext(text))
+        
+        self.assertEqual(result['section_scores'], [1.0, -1.0])
+        self.assertEqual(len(result['sentence_scores']), 3)
+        self.assertAlmostEqual(result['score'], 4 / 7)
+    
+    def test_neutral_without_lexicon_terms(self):
+        result = self.lexicon.analyze(AnalysisContext("The meeting is on Tuesday."))
+        
+        self.assertEqual((result['label'], result['score'], result['confidence']), ('NEUTRAL', 0.5, 0.0))
+    
+    def test_custom_lexicon_file(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "lexicon.tsv")
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write("# custom\nsynergy\t2\nheadwind\t-1\nbroken line\nnot\tNEGATE\n")
+            lexicon = LexiconSentiment(path)
+        
+        self.assertEqual(len(lexicon.vocab), 3)
+        self.assertEqual(lexicon.analyze(AnalysisContext("Synergy, not headwind."))['sentence_scores'], [1.0])
+    
+    def test_lexicon_engine_skips_model(self):
+        result = SentimentAnalyzer(engine="lexicon").analyze_sentiment("Growth was strong but litigation risk remains.")
+        
+        self.assertEqual(result['sentence_scores'], [0.0])
+        self.assertNotIn('chunk_scores', result)
+
+if __name__ == '__main__':
+    unittest.main()
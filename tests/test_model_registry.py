@@ -0,0 +1,61 @@
+import unittest
+from modules.model_registry import ModelRegistry
+
+class TestModelRegistry(unittest.TestCase):
+    def setUp(self):
+        self.registry = ModelRegistry()
+        self.load_calls = 0
+
+    def _loader(self):
+        self.load_calls += 1
+        return {'name': 'fake-model'}
+
+    def test_lazy_loading(self):
+        self.registry.register("fake", self._loader)
+
+        self.assertFalse(self.registry.is_loaded("fake"))
+        self.assertEqual(self.load_calls, 0)
+
+        model = self.registry.get("fake")
+        self.assertEqual(model, {'name': 'fake-model'})
+        self.assertTrue(self.registry.is_loaded("fake"))
+
+    def test_model_loaded_once(self):
+        self.registry.register("fake", self._loader)
+        self.registry.register("fake", lambda: None)
+
+        first = self.registry.get("fake")
+        second = self.registry.get("fake")
+
+        self.assertIs(first, second)
+        self.assertEqual(self.load_calls, 1)
+
+    def test_failed_load_is_cached(self):
+        def failing_loader():
+            self.load_calls += 1
+            raise OSError("model missing")
+
+        self.registry.register("broken", failing_loader)
+
+        self.assertIsNone(self.registry.get("broken"))
+        self.assertIsNone(self.registry.get("broken"))
+        self.assertEqual(self.load_calls, 1)
+        self.assertFalse(self.registry.stats()["broken"]['available'])
+
+    def test_warm_up_and_stats(self):
+        self.registry.register("fake", self._loader)
+        self.registry.register("other", lambda: "other-model")
+
+        self.assertFalse(self.registry.is_warm())
+        load_times = self.registry.warm_up()
+
+        self.assertEqual(set(load_times), {"fake", "other"})
+        self.assertTrue(self.registry.is_warm())
+        self.assertIn('memory_bytes', self.registry.stats()["fake"])
+
+    def test_unknown_model(self):
+        with self.assertRaises(KeyError):
+            self.registry.get("missing")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,6 +1,25 @@
+import os
+import tempfile
 import unittest
+import fitz
 from modules.pdf_extractor import PDFExtractor
 
+def create_sample_pdf(path, num_pages, table_pages=()):
+    doc = fitz.open()
+    for i in range(num_pages):
+        page = doc.new_page()
+        page.insert_text((72, 72), f"Page {i + 1} revenue grew and risks were reviewed.")
+        if i in table_pages:
+            for row in range(4):
+                page.draw_line((72, 100 + row * 20), (372, 100 + row * 20))
+            for col in range(4):
+                page.draw_line((72 + col * 100, 100), (72 + col * 100, 160))
+            for row in range(3):
+                for col in range(3):
+                    page.insert_text((76 + col * 100, 115 + row * 20), f"r{row}c{col}")
+    doc.save(path)
+    doc.close()
+
 class TestPDFExtractor(unittest.TestCase):
     def setUp(self):
         self.extractor = PDFExtractor()
@@ -14,6 +33,58 @@ class TestPDFExtractor(unittest.TestCase):
         self.assertTrue(hasattr(self.extractor, 'extract_metadata'))
         self.assertTrue(hasattr(self.extractor, 'extract_tables'))
         self.assertTrue(hasattr(self.extractor, 'extract_images'))
+    
+    def test_iter_pages_offsets(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "sample.pdf")
+            create_sample_pdf(path, 3)
+            
+            pages = list(self.extractor.iter_pages(path))
+            text = self.extractor.extract_text(path)
+            
+            self.assertEqual([page['page_number'] for page in pages], [1, 2, 3])
+            for page in pages:
+                self.assertEqual(text[page['start']:page['end']], page['text'])
+            self.assertIn("Page 3 revenue", pages[2]['text'])
+    
+    def test_ingest_and_extract_tables_agree(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "tables.pdf")
+            create_sample_pdf(path, 4, table_pages=(0, 2))
+            
+            tables = self.extractor.extract_tables(path)
+            
+            self.assertEqual(len(tables), 2)
+            self.assertEqual(tables, self.extractor.ingest(path)['tables'])
+            self.assertEqual(tables[0][1], ["r1c0", "r1c1", "r1c2"])
+    
+    def test_parallel_extraction_matches_serial(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "long.pdf")
+            create_sample_pdf(path, 80)
+            progress = []
+            
+            serial = self.extractor.extract_text(path)
+            parallel = PDFExtractor(workers=2).extract_text(path, lambda stage, done, total: progress.append(done))
+            
+            self.assertEqual(parallel, serial)
+            self.assertEqual(PDFExtractor().extract_text_parallel(path, 3), serial)
+            self.assertGreater(len(progress), 1)
+            self.assertEqual(progress[-1], 80)
+    
+    def test_ingest_single_pass(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "report.pdf")
+            create_sample_pdf(path, 3, table_pages=(1,))
+            
+            result = self.extractor.ingest(path)
+            
+            self.assertEqual(result['metadata']['page_count'], 3)
+            self.assertEqual(result['text'], self.extractor.extract_text(path))
+            self.assertEqual(len(result['tables']), 1)
+            self.assertEqual(result['pages'][0]['tables'], [])
+            self.assertEqual(len(result['pages'][1]['tables']), 1)
+            self.assertEqual(len(self.extractor.extract_tables(path)), 1)
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,83 @@
+import os
+import tempfile
+import unittest
+from utils.result_cache import ResultCache
+
+class TestResultCache(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.cache = ResultCache(cache_dir=self.temp_dir.name, max_memory_entries=2)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_put_and_get(self):
+        key = self.cache.make_key("abc", "summary", {'version': "1.0"})
+        self.cache.put(key, {'summary': "Short summary."})
+
+        self.assertEqual(self.cache.get(key), {'summary': "Short summary."})
+        self.assertIsNone(self.cache.get("missing"))
+
+    def test_key_depends_on_config(self):
+        key_a = self.cache.make_key("abc", "summary", {'max_length': 150})
+        key_b = self.cache.make_key("abc", "summary", {'max_length': 100})
+        key_c = self.cache.make_key("abc", "keywords", {'max_length': 150})
+
+        self.assertEqual(len({key_a, key_b, key_c}), 3)
+        self.assertEqual(key_a, self.cache.make_key("abc", "summary", {'max_length': 150}))
+
+    def test_disk_tier_survives_memory_eviction(self):
+        for i in range(5):
+            self.cache.put(f"key{i}", {'value': i})
+
+        reloaded = ResultCache(cache_dir=self.temp_dir.name)
+        self.assertEqual(self.cache.get("key0"), {'value': 0})
+        self.assertEqual(reloaded.get("key4"), {'value': 4})
+
+    def test_disk_size_bound(self):
+        cache = ResultCache(cache_dir=self.temp_dir.name, max_memory_entries=1, max_disk_bytes=200)
+        for i in range(10):
+            cache.put(f"key{i}", {'value': "x" * 50})
+
+        self.assertLessEqual(cache.disk_usage(), 200)
+        self.assertIsNone(cache.get("key0"))
+        self.assertIsNotNone(cache.get("key9"))
+        self.assertLess(len(os.listdir(self.temp_dir.name)), 10)
+
+    def test_instances_share_one_directory(self):
+        other = ResultCache(cache_dir=self.temp_dir.name)
+        self.cache.put("shared", {'value': 1})
+
+        self.assertEqual(other.get("shared"), {'value': 1})
+        self.assertIn("shared", other._disk_index)
+        os.remove(os.path.join(self.temp_dir.name, "shared.json"))
+        self.assertIsNone(ResultCache(cache_dir=self.temp_dir.name).get("shared"))
+
+    def test_disk_size_bound_holds_across_instances(self):
+        first = ResultCache(cache_dir=self.temp_dir.name, max_memory_entries=1, max_disk_bytes=300)
+        second = ResultCache(cache_dir=self.temp_dir.name, max_memory_entries=1, max_disk_bytes=300)
+        first.RESCAN_WRITES = second.RESCAN_WRITES = 1
+        for i in range(10):
+            first.put(f"first{i}", {'value': "x" * 50})
+            second.put(f"second{i}", {'value': "x" * 50})
+
+        on_disk = sum(os.path.getsize(os.path.join(self.temp_dir.name, name)) for name in os.listdir(self.temp_dir.name))
+        self.assertLessEqual(on_disk, 300)
+        self.assertIsNotNone(first.get("second9"))
+
+    def test_returned_values_are_copies(self):
+        self.cache.put("key", {'items': [1, 2]})
+        self.cache.get("key")['items'].append(3)
+        value = {'items': [1, 2]}
+        self.cache.put("other", value)
+        value['items'].append(3)
+
+        self.assertEqual(self.cache.get("key"), {'items': [1, 2]})
+        self.assertEqual(self.cache.get("other"), {'items': [1, 2]})
+
+    def test_hash_bytes(self):
+        self.assertEqual(ResultCache.hash_bytes(b"doc"), ResultCache.hash_text("doc"))
+        self.assertEqual(len(ResultCache.hash_bytes(b"doc")), 64)
+
+if __name__ == '__main__':
+    unittest.main()
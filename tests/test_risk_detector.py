@@ -0,0 +1,109 @@
+import pickle
+import time
+import unittest
+from modules.analysis_context import AnalysisContext
+from modules.risk_detector import RiskDetector
+
+SAMPLE_TEXT = (
+    "There is a significant risk that supplier delays disrupt production. "
+    "Failure to renew the licence may result in penalties. "
+    "Revenue was flat. "
+    "The expansion into Asia is a major growth opportunity for the services business."
+)
+
+class TestRiskDetector(unittest.TestCase):
+    def setUp(self):
+        self.detector = RiskDetector()
+    
+    def test_scan_hits_have_offsets(self):
+        hits = self.detector.scan(SAMPLE_TEXT)
+        
+        self.assertTrue(hits)
+        for hit in hits:
+            self.assertEqual(SAMPLE_TEXT[hit['start']:hit['end']], hit['text'])
+            self.assertIn(hit['category'], ('risk', 'opportunity'))
+            self.assertGreater(hit['severity'], 0)
+        self.assertIn(('pattern', 3), [(hit['source'], hit['severity']) for hit in hits if hit['text'].startswith("significant risk")])
+        self.assertNotIn(2, [hit['sentence_index'] for hit in hits])
+    
+    def test_detect_risks_and_opportunities(self):
+        risks = self.detector.detect_risks(SAMPLE_TEXT)
+        opportunities = self.detector.detect_opportunities(SAMPLE_TEXT)
+        
+        self.assertEqual(risks, ["There is a significant risk that supplier delays disrupt production.", "Failure to renew the licence may result in penalties."])
+        self.assertEqual(opportunities, ["The expansion into Asia is a major growth opportunity for the services business."])
+        analysis = self.detector.analyze(SAMPLE_TEXT)
+        self.assertEqual(analysis['risks'], risks)
+        self.assertEqual(analysis['opportunities'], opportunities)
+    
+    def test_case_insensitive_and_substring_keywords(self):
+        text = "RISKY VOLATILITY in the markets is expected this year."
+        hits = self.detector.scan(text, AnalysisContext(text), categories=('risk',))
+        
+        # Keyword weights sum to 6, capped to the pattern severity scale
+        self.assertEqual([(hit['source'], hit['severity']) for hit in hits], [('sentence', 3)])
+    
+    def test_pickle_drops_token_index(self):
+        self.detector.scan(SAMPLE_TEXT)
+        restored = pickle.loads(pickle.dumps(self.detector))
+        
+        self.assertEqual(restored._token_index, {})
+        self.assertEqual(restored.detect_risks(SAMPLE_TEXT), self.detector.detect_risks(SAMPLE_TEXT))
+    
+    def test_ranked_items_are_severity_ordered_with_offsets(self):
+        items = self.detector.analyze(SAMPLE_TEXT)['risk_items']
+        
+        self.assertEqual([item['text'] for item in items], self.detector.detect_risks(SAMPLE_TEXT))
+        self.assertEqual(items, sorted(items, key=lambda item: (-item['severity'], item['start'])))
+        for item in items:
+            self.assertEqual(SAMPLE_TEXT[item['start']:item['end']], item['text'])
+            self.assertEqual(item['category'], 'risk')
+    
+    def test_overlapping_hits_keep_strongest(self):
+        hits = [
+            {'category': 'risk', 'source': 'sentence', 'severity': 2, 'start': 0, 'end': 60, 'sentence_index': 0, 'text': "a" * 60},
+            {'category': 'risk', 'source': 'pattern', 'severity': 3, 'start': 10, 'end': 40, 'sentence_index': 0, 'text': "b" * 30},
+            {'category': 'risk', 'source': 'pattern', 'severity': 2, 'start': 50, 'end': 80, 'sentence_index': 1, 'text': "c" * 30},
+            {'category': 'risk', 'source': 'pattern', 'severity': 2, 'start': 90, 'end': 120, 'sentence_index': 2, 'text': "a" * 60},
+            {'category': 'opportunity', 'source': 'pattern', 'severity': 3, 'start': 95, 'end': 125, 'sentence_index': 2, 'text': "d" * 30}
+        ]
+        
+        items = self.detector.rank(hits, 'risk')
+        
+        self.assertEqual([(item['text'][0], item['start']) for item in items], [('b', 10), ('a', 90)])
+    
+    def test_short_hits_do_not_displace_longer_items(self):
+        hits = [
+            {'category': 'risk', 'source': 'pattern', 'severity': 2, 'start': 0, 'end': 60, 'sentence_index': 0, 'text': "a" * 60},
+            {'category': 'risk', 'source': 'pattern', 'severity': 3, 'start': 20, 'end': 30, 'sentence_index': 0, 'text': "b" * 10}
+        ]
+        
+        self.assertEqual([item['text'] for item in self.detector.rank(hits, 'risk')], ["a" * 60])
+    
+    def test_sentence_and_pattern_severities_share_a_scale(self):
+        text = "Currency volatility and exposure create uncertainty and risk for the group. Failure to refinance would hurt us."
+        hits = self.detector.scan(text, categories=('risk',))
+        
+        self.assertTrue(all(1 <= hit['severity'] <= 3 for hit in hits))
+        self.assertEqual([item['severity'] for item in self.detector.detect_risk_items(text)], [3, 3])
+    
+    def test_punctuation_free_text_scans_in_linear_time(self):
+        text = "high risk " * 20000
+        start = time.perf_counter()
+        hits = self.detector.scan(text, categories=('risk',))
+        
+        self.assertEqual([hit for hit in hits if hit['source'] == 'pattern'], [])
+        self.assertLess(time.perf_counter() - start, 5.0)
+        terminated = self.detector.scan("high risk " * 50 + "ahead.", categories=('risk',))
+        self.assertEqual([hit['end'] for hit in terminated if hit['source'] == 'pattern'], [len("high risk " * 50 + "ahead.")])
+    
+    def test_top_k_is_stable(self):
+        hits = [{'category': 'risk', 'source': 'pattern', 'severity': 2, 'start': index * 50, 'end': index * 50 + 20, 'sentence_index': index, 'text': f"risk item number {index:03d}"} for index in range(10)]
+        
+        items = self.detector.rank(hits, 'risk', top_k=3)
+        
+        self.assertEqual([item['start'] for item in items], [0, 50, 100])
+        self.assertEqual(len(RiskDetector(top_k=4).rank(hits, 'risk')), 4)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+import tempfile
+import unittest
+from modules.summarizer import Summarizer
+from utils.chunk_memo import ChunkMemo
+
+class FakeTokenizer:
+    def __call__(self, texts, add_special_tokens=False):
+        return {'input_ids': [text.split() for text in texts]}
+
+class CountingPipeline:
+    def __init__(self, summary_words=5):
+        self.tokenizer = FakeTokenizer()
+        self.summary_words = summary_words
+        self.calls = 0
+
+    def __call__(self, batch, **kwargs):
+        self.calls += len(batch)
+        return [{'summary_text': " ".join([f"Summary{self.calls}{i}"] * self.summary_words) + "."} for i, _ in enumerate(batch)]
+
+class CountingSummarizer(Summarizer):
+    @property
+    def summarizer(self):
+        return self.pipeline
+
+def make_chunks(count):
+    return [f"Chunk {i} says revenue in region {i} grew while costs in unit {i} fell sharply this year." for i in range(count)]
+
+class TestSummarizer(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+
+    def make_summarizer(self, max_model_calls, summary_words=5, max_chunk_tokens=60):
+        summarizer = CountingSummarizer(max_chunk_tokens=max_chunk_tokens, max_model_calls=max_model_calls, chunk_memo=ChunkMemo(tempfile.mkdtemp(dir=self.temp_dir.name)))
+        summarizer.pipeline = CountingPipeline(summary_words)
+        return summarizer
+
+    def test_model_calls_stay_within_budget(self):
+        for max_model_calls in (1, 3, 5, 10, 32):
+            for num_chunks in (2, 7, 40, 200):
+                summarizer = self.make_summarizer(max_model_calls)
+                summary = summarizer._hierarchical_summarize(make_chunks(num_chunks), 10, 2)
+
+                self.assertTrue(summary)
+                self.assertLessEqual(summarizer.pipeline.calls, max_model_calls, (max_model_calls, num_chunks))
+
+    def test_reduce_stage_runs_within_budget(self):
+        summarizer = self.make_summarizer(32)
+        summary = summarizer._hierarchical_summarize(make_chunks(20), 10, 2)
+
+        # Twenty map calls plus the reduce passes, ending in a single model summary
+        self.assertGreater(summarizer.pipeline.calls, 20)
+        self.assertLessEqual(summarizer.pipeline.calls, 32)
+        self.assertTrue(summary.startswith("Summary"))
+
+    def test_summaries_too_long_to_reduce_fall_back_with_warning(self):
+        summarizer = self.make_summarizer(32, summary_words=40)
+        with self.assertLogs('modules.summarizer', level='WARNING') as logs:
+            summary = summarizer._hierarchical_summarize(make_chunks(4), 10, 2)
+
+        self.assertEqual(summarizer.pipeline.calls, 4)
+        self.assertIn("reducing extractively", logs.output[0])
+        self.assertTrue(summary)
+
+if __name__ == '__main__':
+    unittest.main()
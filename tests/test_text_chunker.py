@@ -0,0 +1,45 @@
+import unittest
+from modules.text_chunker import TextChunker
+
+class WhitespaceTokenizer:
+    model_max_length = 512
+
+    def __call__(self, texts, add_special_tokens=False):
+        return {'input_ids': [text.split() for text in texts]}
+
+    def num_special_tokens_to_add(self):
+        return 2
+
+class TestTextChunker(unittest.TestCase):
+    def setUp(self):
+        self.sentences = ["one two three four.", "five six seven.", "eight nine.", "ten eleven twelve thirteen."]
+
+    def test_chunks_respect_token_budget(self):
+        chunker = TextChunker(WhitespaceTokenizer(), max_tokens=9)
+        chunks = chunker.chunk(self.sentences)
+
+        self.assertEqual(chunks, ["one two three four. five six seven.", "eight nine. ten eleven twelve thirteen."])
+        for chunk in chunks:
+            self.assertLessEqual(len(chunk.split()), chunker.token_budget)
+
+    def test_overlap_repeats_trailing_sentence(self):
+        chunker = TextChunker(WhitespaceTokenizer(), max_tokens=10, overlap_tokens=3)
+        chunks = chunker.chunk(self.sentences)
+
+        self.assertEqual(chunks[0], "one two three four. five six seven.")
+        self.assertTrue(chunks[1].startswith("five six seven."))
+
+    def test_long_sentence_is_split(self):
+        chunker = TextChunker(WhitespaceTokenizer(), max_tokens=6)
+        chunks = chunker.chunk(["a b c d e f g h i j"])
+
+        self.assertEqual(chunks, ["a b c d", "e f g h", "i j"])
+
+    def test_estimate_without_tokenizer(self):
+        chunker = TextChunker(max_tokens=10)
+
+        self.assertEqual(chunker.count_tokens(["x" * 40]), [10])
+        self.assertEqual(len(chunker.chunk(["x" * 20, "y" * 20, "z" * 20])), 2)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,55 @@
+import unittest
+import numpy as np
+from scipy import sparse
+from modules.analysis_context import AnalysisContext
+from modules.summarizer import Summarizer
+from modules.text_rank import TextRank
+
+SAMPLE_TEXT = (
+    "The board approved the merger with Acme. "
+    "Revenue grew strongly and the merger outlook is positive. "
+    "The weather was pleasant. "
+    "Acme revenue grew after the merger. "
+    "Lunch was served."
+)
+
+class TestTextRank(unittest.TestCase):
+    def setUp(self):
+        self.text_rank = TextRank()
+    
+    def test_central_sentences_rank_first(self):
+        ranked = self.text_rank.rank_sentences(AnalysisContext(SAMPLE_TEXT))
+        
+        self.assertEqual([item['index'] for item in ranked[:3]], [3, 1, 0])
+        self.assertAlmostEqual(sum(item['score'] for item in ranked), 1.0)
+        for item in ranked:
+            self.assertEqual(SAMPLE_TEXT[item['start']:item['end']], item['text'])
+    
+    def test_matches_dense_pagerank(self):
+        context = AnalysisContext(SAMPLE_TEXT)
+        matrix = self.text_rank._sentence_matrix(context.tokens, np.searchsorted([start for start, _ in context.sentence_spans], context.token_offsets, side='right') - 1, len(context.sentence_spans))
+        similarity = (matrix @ matrix.T).toarray()
+        np.fill_diagonal(similarity, 0.0)
+        size = len(similarity)
+        out_weight = similarity.sum(axis=1)
+        transition = np.where(out_weight[:, None] > 0, similarity / np.where(out_weight > 0, out_weight, 1.0)[:, None], 1.0 / size)
+        rank = np.full(size, 1.0 / size)
+        for _ in range(200):
+            rank = 0.15 / size + 0.85 * transition.T @ rank
+        
+        np.testing.assert_allclose(self.text_rank.scores(matrix), rank, atol=1e-6)
+    
+    def test_top_k_and_empty_rows(self):
+        ranked = self.text_rank.rank_texts(["merger revenue growth", "revenue growth strong", "the and of", "weather"], top_k=2)
+        
+        self.assertEqual([item['index'] for item in ranked], [0, 1])
+        self.assertEqual(self.text_rank.rank_texts([]), [])
+        self.assertEqual(self.text_rank.scores(sparse.csr_matrix((0, 0))).tolist(), [])
+    
+    def test_extractive_fallback_keeps_document_order(self):
+        summary = Summarizer()._extractive_summarize(AnalysisContext(SAMPLE_TEXT))
+        
+        self.assertEqual(summary, "The board approved the merger with Acme. Revenue grew strongly and the merger outlook is positive. Acme revenue grew after the merger.")
+
+if __name__ == '__main__':
+    unittest.main()
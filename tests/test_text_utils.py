@@ -0,0 +1,16 @@
+import unittest
+from utils.text_utils import lower_preserving_offsets
+
+class TestTextUtils(unittest.TestCase):
+    def test_lowercases_text(self):
+        self.assertEqual(lower_preserving_offsets("Board APPROVED"), "board approved")
+
+    def test_offsets_stay_aligned(self):
+        text = "İstanbul Risk review"
+        lowered = lower_preserving_offsets(text)
+
+        self.assertEqual(len(lowered), len(text))
+        self.assertEqual(lowered.index("risk"), text.index("Risk"))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+import os
+import tempfile
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+import logging
+from utils.result_cache import ResultCache
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MEMO_DIR = os.path.join(tempfile.gettempdir(), "corporate_docs_chunk_memo")
+
+# Model outputs per chunk, shared across documents: boilerplate (disclaimers, standard clauses) is inferred once.
+# Keys are the whitespace-normalised chunk hash plus the model id and generation parameters; the disk tier is
+# the size-bounded LRU of ResultCache, so batch workers pointing at one directory share hits and one byte bound
+class ChunkMemo:
+    def __init__(self, memo_dir: Optional[str] = None, max_memory_entries: int = 2048, max_disk_bytes: Optional[int] = None, cache: Optional[ResultCache] = None):
+        if cache is None:
+            memo_dir = memo_dir or os.environ.get("CDA_CHUNK_MEMO_DIR") or DEFAULT_MEMO_DIR
+            max_disk_bytes = max_disk_bytes or int(os.environ.get("CDA_CHUNK_MEMO_MB", "256")) * 1024 * 1024
+            cache = ResultCache(cache_dir=memo_dir, max_memory_entries=max_memory_entries, max_disk_bytes=max_disk_bytes)
+        self.cache = cache
+        self._counts = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def normalize(chunk: str) -> str:
+        return ' '.join(chunk.split())
+
+    def key(self, chunk: str, model: str, params: Optional[Dict[str, Any]] = None) -> str:
+        return self.cache.make_key(ResultCache.hash_text(self.normalize(chunk)), "chunk", {'model': model, 'params': params or {}})
+
+    def lookup(self, chunks: List[str], model: str, params: Optional[Dict[str, Any]] = None) -> Tuple[List[Any], List[int]]:
+        values = [self.cache.get(self.key(chunk, model, params)) for chunk in chunks]
+        missing = [i for i, value in enumerate(values) if value is None]
+        with self._lock:
+            counts = self._counts.setdefault(model, [0, 0])
+            counts[0] += len(chunks) - len(missing)
+            counts[1] += len(missing)
+        if chunks:
+            logger.info(f"Chunk memo {model}: {len(chunks) - len(missing)}/{len(chunks)} chunks reused")
+        return values, missing
+
+    def store(self, chunks: List[str], values: List[Any], model: str, params: Optional[Dict[str, Any]] = None):
+        for chunk, value in zip(chunks, values):
+            if value is not None:
+                self.cache.put(self.key(chunk, model, params), value)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return {
+                model: {'hits': hits, 'misses': misses, 'hit_rate': hits / (hits + misses) if hits + misses else 0.0}
+                for model, (hits, misses) in self._counts.items()
+            }
+
+    def disk_usage(self) -> int:
+        return self.cache.disk_usage()
+
+    def clear(self):
+        self.cache.clear()
+        with self._lock:
+            self._counts.clear()
@@ -1,5 +1,8 @@
 import re
-from typing import List, Dict
+import html
+import bisect
+from typing import List, Dict, Optional, Tuple
+from utils.text_utils import lower_preserving_offsets
 
 class HighlightUtils:
     def __init__(self):
@@ -10,20 +13,74 @@ class HighlightUtils:
             'opportunity': '#ccffff',
             'keyword': '#ffccff'
         }
+        # Earlier categories win when highlights overlap
+        self.category_priority = ['risk', 'decision', 'action_item', 'opportunity', 'keyword']
     
     def highlight_text(self, text: str, patterns: Dict[str, List[str]]) -> str:
-        highlighted_text = text
+        return self.render(text, self.find_spans(text, patterns))
+    
+    def find_spans(self, text: str, patterns: Dict[str, List[str]]) -> List[Tuple[int, int, str]]:
+        terms = {}
+        for category, items in patterns.items():
+            rank = self.category_priority.index(category) if category in self.category_priority else len(self.category_priority)
+            for item in items:
+                term = item.strip().lower()
+                if term and (term not in terms or rank < terms[term][0]):
+                    terms[term] = (rank, category)
+        if not terms:
+            return []
         
-        for category, terms in patterns.items():
+        # One alternation over every term, longest first; the lookahead reports a candidate at every start position.
+        # This is a single backtracking regex pass, not an Aho-Corasick automaton: each start position tries the
+        # alternation, so the cost grows with the term list, but it stays in the C regex engine
+        matcher = re.compile('(?=(' + '|'.join(re.escape(term) for term in sorted(terms, key=len, reverse=True)) + '))')
+        spans = []
+        ranks = []
+        for match in matcher.finditer(lower_preserving_offsets(text)):
+            start = match.start()
+            end = start + len(match.group(1))
+            rank, category = terms[match.group(1)]
+            if spans and start < spans[-1][1]:
+                previous_start, previous_end, _ = spans[-1]
+                if (rank, previous_end - previous_start) < (ranks[-1], end - start):
+                    spans[-1] = (start, end, category)
+                    ranks[-1] = rank
+                continue
+            spans.append((start, end, category))
+            ranks.append(rank)
+        return spans
+    
+    def render(self, text: str, spans: List[Tuple[int, int, str]], start: int = 0, end: Optional[int] = None) -> str:
+        end = len(text) if end is None else end
+        span_ends = [span_end for _, span_end, _ in spans]
+        parts = []
+        position = start
+        for span_start, span_end, category in spans[bisect.bisect_right(span_ends, start):]:
+            if span_start >= end:
+                break
+            span_start, span_end = max(span_start, start), min(span_end, end)
             color = self.highlight_colors.get(category, '#ffffff')
-            for term in terms:
-                pattern = re.compile(re.escape(term), re.IGNORECASE)
-                highlighted_text = pattern.sub(
-                    f'<span style="background-color: {color}; padding: 2px; border-radius: 2px;">{term}</span>',
-                    highlighted_text
-                )
-        
-        return highlighted_text
+            parts.append(html.escape(text[position:span_start]))
+            parts.append(f'<span style="background-color: {color}; padding: 2px; border-radius: 2px;">{html.escape(text[span_start:span_end])}</span>')
+            position = span_end
+        parts.append(html.escape(text[position:end]))
+        return ''.join(parts)
+    
+    def paginate(self, text: str, page_chars: int = 5000) -> List[Tuple[int, int]]:
+        pages = []
+        start = 0
+        while start < len(text):
+            end = min(start + page_chars, len(text))
+            if end < len(text):
+                # Prefer a paragraph, then a line, then a word boundary in the second half of the page
+                for separator in ('\n\n', '\n', ' '):
+                    cut = text.rfind(separator, start + page_chars // 2, end)
+                    if cut != -1:
+                        end = cut + len(separator)
+                        break
+            pages.append((start, end))
+            start = end
+        return pages
     
     def extract_highlight_patterns(self, results: Dict) -> Dict[str, List[str]]:
         patterns = {}
@@ -50,4 +107,4 @@ class HighlightUtils:
         for item in items[:5]:
             words = item.split()[:5]
             phrases.append(' '.join(words))
-        return phrases
\ No newline at end of file
+        return phrases
@@ -0,0 +1,189 @@
+import os
+import json
+import math
+import time
+import tempfile
+import threading
+from typing import Iterable, List, Optional
+import logging
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_INDEX_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "models", "idf_index")
+
+# vocab.txt holds one term per line (line number = term id), df.int32 the document frequency per id,
+# documents.txt the hashes already counted; meta.json records how much of each file is committed
+class IDFIndex:
+    MIN_TERM_LENGTH = 3
+    MAX_TERM_LENGTH = 40
+    LOCK_TIMEOUT = 10.0
+    STALE_LOCK_SECONDS = 120.0
+
+    def __init__(self, index_dir: Optional[str] = None):
+        self.index_dir = index_dir or os.environ.get("CDA_IDF_DIR") or DEFAULT_INDEX_DIR
+        self._lock = threading.Lock()
+        self._reset()
+
+    def __getstate__(self):
+        return {'index_dir': self.index_dir}
+
+    def __setstate__(self, state):
+        self.index_dir = state['index_dir']
+        self._lock = threading.Lock()
+        self._reset()
+
+    @property
+    def num_docs(self) -> int:
+        self.refresh()
+        return self._num_docs
+
+    @property
+    def num_terms(self) -> int:
+        self.refresh()
+        return len(self._terms)
+
+    @property
+    def generation(self) -> int:
+        # Changes each time the corpus doubles, so cached keyphrases are recomputed as the IDF table matures
+        return int(math.log2(max(self.num_docs, 1)))
+
+    def idf(self, terms: List[str]) -> np.ndarray:
+        self.refresh()
+        ids = np.fromiter((self._vocab.get(term, -1) for term in terms), dtype=np.int64, count=len(terms))
+        df = np.zeros(len(terms), dtype=np.float64)
+        known = ids >= 0
+        if known.any():
+            df[known] = self._df[ids[known]]
+        return np.log((1.0 + self._num_docs) / (1.0 + df)) + 1.0
+
+    def add_document(self, doc_hash: str, tokens: Iterable[str]) -> bool:
+        terms = set(token for token in tokens if self.MIN_TERM_LENGTH <= len(token) <= self.MAX_TERM_LENGTH and token.isalpha())
+        with self._lock:
+            try:
+                os.makedirs(self.index_dir, exist_ok=True)
+                if not self._acquire_file_lock():
+                    logger.warning(f"IDF index busy, skipping document {doc_hash[:12]}")
+                    return False
+                try:
+                    self._load()
+                    if doc_hash in self._documents:
+                        return False
+                    self._append_document(doc_hash, terms)
+                finally:
+                    self._release_file_lock()
+                self._load()
+                return True
+            except Exception as e:
+                logger.error(f"IDF index update failed: {str(e)}")
+                return False
+
+    def refresh(self):
+        stamp = self._stamp()
+        if stamp != self._loaded_stamp:
+            with self._lock:
+                if stamp != self._loaded_stamp:
+                    self._load()
+
+    def _reset(self):
+        self._vocab = {}
+        self._terms = []
+        self._df = np.zeros(0, dtype=np.int32)
+        self._num_docs = 0
+        self._documents = set()
+        self._meta = {'num_docs': 0, 'num_terms': 0, 'vocab_bytes': 0, 'documents_bytes': 0}
+        self._loaded_stamp = None
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.index_dir, name)
+
+    def _stamp(self):
+        try:
+            stat = os.stat(self._path("meta.json"))
+            return (stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            return None
+
+    def _load(self):
+        stamp = self._stamp()
+        if stamp is None:
+            self._reset()
+            return
+        try:
+            with open(self._path("meta.json"), 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            num_terms = meta['num_terms']
+            with open(self._path("vocab.txt"), 'rb') as f:
+                terms = f.read(meta['vocab_bytes']).decode('utf-8').split('\n')[:num_terms]
+            with open(self._path("documents.txt"), 'rb') as f:
+                documents = set(f.read(meta['documents_bytes']).decode('ascii').split())
+            df = np.fromfile(self._path("df.int32"), dtype=np.int32, count=num_terms) if num_terms else np.zeros(0, dtype=np.int32)
+        except Exception as e:
+            logger.error(f"IDF index load failed: {str(e)}")
+            self._reset()
+            return
+        self._terms = terms
+        self._vocab = {term: index for index, term in enumerate(terms)}
+        self._df = df
+        self._num_docs = meta['num_docs']
+        self._documents = documents
+        self._meta = meta
+        self._loaded_stamp = stamp
+
+    def _append_document(self, doc_hash: str, terms: set):
+        # Files are only appended to or updated in place; meta.json is replaced last and is what readers trust,
+        # so anything a crashed writer left past the committed sizes is cut off before appending
+        num_terms = len(self._terms)
+        new_terms = sorted(term for term in terms if term not in self._vocab)
+        vocab_bytes = self._append(self._path("vocab.txt"), self._meta['vocab_bytes'], ''.join(term + '\n' for term in new_terms).encode('utf-8'))
+        total_terms = num_terms + len(new_terms)
+        df_path = self._path("df.int32")
+        with open(df_path, 'ab') as f:
+            f.truncate(num_terms * 4)
+            f.write(bytes(len(new_terms) * 4))
+        if total_terms:
+            ids = np.fromiter((self._vocab.get(term, -1) for term in terms), dtype=np.int64, count=len(terms))
+            ids[ids < 0] = np.arange(num_terms, total_terms)
+            df = np.memmap(df_path, dtype=np.int32, mode='r+', shape=(total_terms,))
+            df[ids] += 1
+            df.flush()
+            del df
+        documents_bytes = self._append(self._path("documents.txt"), self._meta['documents_bytes'], (doc_hash + '\n').encode('ascii'))
+        self._write_meta({'num_docs': self._num_docs + 1, 'num_terms': total_terms, 'vocab_bytes': vocab_bytes, 'documents_bytes': documents_bytes})
+
+    def _append(self, path: str, committed_bytes: int, data: bytes) -> int:
+        with open(path, 'ab') as f:
+            f.truncate(committed_bytes)
+            f.write(data)
+        return committed_bytes + len(data)
+
+    def _write_meta(self, meta: dict):
+        fd, tmp_path = tempfile.mkstemp(dir=self.index_dir, suffix='.tmp')
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(meta, f)
+        os.replace(tmp_path, self._path("meta.json"))
+
+    def _acquire_file_lock(self) -> bool:
+        # Batch workers are separate processes sharing one index directory
+        lock_path = self._path(".lock")
+        deadline = time.time() + self.LOCK_TIMEOUT
+        while True:
+            try:
+                os.close(os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+                return True
+            except FileExistsError:
+                try:
+                    if time.time() - os.path.getmtime(lock_path) > self.STALE_LOCK_SECONDS:
+                        os.remove(lock_path)
+                        continue
+                except OSError:
+                    continue
+                if time.time() > deadline:
+                    return False
+                time.sleep(0.05)
+
+    def _release_file_lock(self):
+        try:
+            os.remove(self._path(".lock"))
+        except OSError as e:
+            logger.error(f"IDF index unlock failed: {str(e)}")
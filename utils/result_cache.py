@@ -0,0 +1,173 @@
+import os
+import copy
+import json
+import hashlib
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Several processes may share one cache directory (batch workers, app restarts). Files are the source of truth: an
+# index miss still checks the directory, and the index is rebuilt from the directory before evicting and every
+# RESCAN_WRITES writes, so the byte bound holds for the directory rather than per process
+class ResultCache:
+    RESCAN_WRITES = 64
+
+    def __init__(self, cache_dir: Optional[str] = None, max_memory_entries: int = 256, max_disk_bytes: int = 512 * 1024 * 1024):
+        self.cache_dir = cache_dir or os.path.join(tempfile.gettempdir(), "corporate_docs_cache")
+        self.max_memory_entries = max_memory_entries
+        self.max_disk_bytes = max_disk_bytes
+        self._memory = OrderedDict()
+        self._disk_index = OrderedDict()
+        self._disk_bytes = 0
+        self._writes = 0
+        self._lock = threading.Lock()
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self._load_disk_index()
+
+    @staticmethod
+    def hash_bytes(data: bytes) -> str:
+        return hashlib.sha256(data).hexdigest()
+
+    @staticmethod
+    def hash_file(file_path: str, block_size: int = 1024 * 1024) -> str:
+        digest = hashlib.sha256()
+        with open(file_path, 'rb') as f:
+            for block in iter(lambda: f.read(block_size), b''):
+                digest.update(block)
+        return digest.hexdigest()
+
+    @staticmethod
+    def hash_text(text: str) -> str:
+        return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+    def make_key(self, doc_hash: str, section: str, config: Optional[Dict[str, Any]] = None) -> str:
+        config_json = json.dumps(config or {}, sort_keys=True, default=str)
+        config_hash = hashlib.sha256(config_json.encode('utf-8')).hexdigest()[:16]
+        return f"{doc_hash}_{section}_{config_hash}"
+
+    def get(self, key: str) -> Optional[Any]:
+        # Callers get their own copy, so mutating a result never changes what the next reader sees
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                return copy.deepcopy(self._memory[key])
+
+        value = self._read_disk(key)
+        if value is None:
+            return None
+        with self._lock:
+            self._remember(key, copy.deepcopy(value))
+        return value
+
+    def put(self, key: str, value: Any):
+        with self._lock:
+            self._remember(key, copy.deepcopy(value))
+        self._write_disk(key, value)
+
+    def clear(self):
+        on_disk = self._scan_disk()
+        with self._lock:
+            self._memory.clear()
+            keys = set(self._disk_index) | set(on_disk)
+            self._disk_index.clear()
+            self._disk_bytes = 0
+        for key in keys:
+            self._remove_file(self._path(key))
+
+    def disk_usage(self) -> int:
+        return self._disk_bytes
+
+    def _remember(self, key: str, value: Any):
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def _load_disk_index(self):
+        index = self._scan_disk()
+        with self._lock:
+            self._disk_index = index
+            self._disk_bytes = sum(index.values())
+
+    def _scan_disk(self) -> 'OrderedDict[str, int]':
+        # Least recently used first: reads touch the file, so mtime orders entries across processes
+        entries = []
+        try:
+            for entry in os.scandir(self.cache_dir):
+                if entry.name.endswith('.json'):
+                    try:
+                        stat = entry.stat()
+                    except FileNotFoundError:
+                        continue
+                    entries.append((stat.st_mtime, entry.name[:-5], stat.st_size))
+        except Exception as e:
+            logger.error(f"Cache index load failed: {str(e)}")
+        return OrderedDict((key, size) for _, key, size in sorted(entries))
+
+    def _read_disk(self, key: str) -> Optional[Any]:
+        path = self._path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                value = json.load(f)
+            os.utime(path)
+            size = os.path.getsize(path)
+            with self._lock:
+                # Files written by another process are adopted into this index
+                self._disk_bytes += size - self._disk_index.pop(key, 0)
+                self._disk_index[key] = size
+            return value
+        except FileNotFoundError:
+            with self._lock:
+                self._disk_bytes -= self._disk_index.pop(key, 0)
+            return None
+        except Exception as e:
+            logger.warning(f"Cache read failed for {key}: {str(e)}")
+            with self._lock:
+                self._disk_bytes -= self._disk_index.pop(key, 0)
+            return None
+
+    def _write_disk(self, key: str, value: Any):
+        path = self._path(key)
+        try:
+            data = json.dumps(value, ensure_ascii=False, default=str).encode('utf-8')
+            if len(data) > self.max_disk_bytes:
+                return
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            logger.error(f"Cache write failed for {key}: {str(e)}")
+            return
+
+        with self._lock:
+            self._disk_bytes -= self._disk_index.pop(key, 0)
+            self._disk_index[key] = len(data)
+            self._disk_bytes += len(data)
+            self._writes += 1
+            rescan = self._disk_bytes > self.max_disk_bytes or self._writes % self.RESCAN_WRITES == 0
+        if rescan:
+            self._load_disk_index()
+
+        evicted = []
+        with self._lock:
+            while self._disk_bytes > self.max_disk_bytes and self._disk_index:
+                old_key, size = self._disk_index.popitem(last=False)
+                self._disk_bytes -= size
+                evicted.append(old_key)
+        for old_key in evicted:
+            self._remove_file(self._path(old_key))
+
+    def _remove_file(self, path: str):
+        try:
+            if os.path.exists(path):
+                os.remove(path)
+        except Exception as e:
+            logger.error(f"Cache eviction failed for {path}: {str(e)}")
@@ -0,0 +1,37 @@
+import re
+from typing import List
+
+class TextMetrics:
+    def __init__(self):
+        pass
+
+    def rouge_l(self, reference: str, candidate: str) -> float:
+        reference_tokens = self._tokenize(reference)
+        candidate_tokens = self._tokenize(candidate)
+        if not reference_tokens or not candidate_tokens:
+            return 0.0
+
+        lcs = self._lcs_length(reference_tokens, candidate_tokens)
+        if lcs == 0:
+            return 0.0
+        precision = lcs / len(candidate_tokens)
+        recall = lcs / len(reference_tokens)
+        return 2 * precision * recall / (precision + recall)
+
+    def label_agreement(self, reference_labels: List[str], candidate_labels: List[str]) -> float:
+        if not reference_labels:
+            return 0.0
+        matches = sum(1 for reference, candidate in zip(reference_labels, candidate_labels) if reference == candidate)
+        return matches / len(reference_labels)
+
+    def _tokenize(self, text: str) -> List[str]:
+        return re.findall(r'\w+', text.lower())
+
+    def _lcs_length(self, a: List[str], b: List[str]) -> int:
+        previous = [0] * (len(b) + 1)
+        for token_a in a:
+            current = [0]
+            for j, token_b in enumerate(b):
+                current.append(previous[j] + 1 if token_a == token_b else max(previous[j + 1], current[j]))
+            previous = current
+        return previous[-1]
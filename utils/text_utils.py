@@ -0,0 +1,6 @@
+def lower_preserving_offsets(text: str) -> str:
+    lowered = text.lower()
+    if len(lowered) == len(text):
+        return lowered
+    # Keep offsets aligned when a character lowercases to several code points
+    return ''.join(char.lower() if len(char.lower()) == 1 else char for char in text)